@@ -4,4 +4,52 @@
 # Part 3: Broken Examples (ADK Limitations)
 # Part 4: Multi-Agent Pipelines
 # Part 5: Advanced Tools and Complex Multi-Agent Systems
+# Part 6: Advanced Multi-Agent Systems with MCP
+#
+# Agent trees are built lazily: importing this package does not import google.adk or
+# any agent module. Use get() to build (once) and return an agent tree by name:
+#
+#     from scripts import agents
+#     root_agent = agents.get("part5.networking_agent")
 
+import importlib
+from .env import load_environment
+
+# Registry name -> module (relative to this package) that defines `root_agent`
+AGENT_MODULES = {
+    "part1.basic_radiology_assistant": ".part1.basic_radiology_assistant.agent",
+    "part2.web_search_agent": ".part2.web_search_agent.agent",
+    "part3.biography_agent_broken": ".part3.biography_agent_broken.agent",
+    "part4.biography_agent": ".part4.biography_agent.agent",
+    "part5.networking_agent": ".part5.networking_agent.agent",
+    "part5.networking_agent.speculative": ".part5.networking_agent.speculative",
+    "part6.radiology_researcher": ".part6.radiology_researcher.agent",
+}
+
+_agents = {}
+
+
+def available() -> list:
+    """Names of all registered agent trees."""
+    return list(AGENT_MODULES)
+
+
+def get(name: str):
+    """Return the root agent of a registered agent tree, building it on first access.
+    
+    The environment (.env files, API key check) is loaded once before the first tree
+    is built.
+    
+    Args:
+        name: Registry name, e.g. "part5.networking_agent"
+    
+    Returns:
+        The tree's root agent
+    """
+    if name not in _agents:
+        if name not in AGENT_MODULES:
+            raise KeyError(f"Unknown agent '{name}'. Available agents: {', '.join(AGENT_MODULES)}")
+        load_environment()
+        module = importlib.import_module(AGENT_MODULES[name], __name__)
+        _agents[name] = module.root_agent
+    return _agents[name]
@@ -0,0 +1,44 @@
+"""Environment loading shared by every agent tree.
+
+`.env` files are loaded once per process (the first time an agent tree is requested
+from the registry, or when a script calls `load_environment()`), instead of at import
+time in every agent module. When the agents are started with the ADK CLI (`adk run`,
+`adk web`), ADK loads the `.env` file next to the agent itself.
+"""
+
+import os
+from pathlib import Path
+from dotenv import load_dotenv
+
+AGENTS_DIR = Path(__file__).parent
+
+# .env locations, in priority order (earlier files win, existing variables are never overridden)
+ENV_FILES = [
+    Path.cwd() / ".env",
+    AGENTS_DIR / ".env",
+    AGENTS_DIR.parent / ".env",
+    AGENTS_DIR.parent.parent / ".env",
+]
+
+_loaded = False
+
+
+def load_environment(require_api_key: bool = True):
+    """Load .env files (once) and check that a Google API key is set.
+    
+    Args:
+        require_api_key: Raise if neither GOOGLE_API_KEY nor GOOGLE_GENAI_API_KEY is set
+    """
+    global _loaded
+    if not _loaded:
+        for env_path in dict.fromkeys(path.resolve() for path in ENV_FILES):
+            if env_path.is_file():
+                load_dotenv(env_path)
+        _loaded = True
+    
+    # Ensure API key is loaded
+    api_key = os.getenv("GOOGLE_API_KEY") or os.getenv("GOOGLE_GENAI_API_KEY")
+    if require_api_key and not api_key:
+        raise ValueError(
+            "Please set GOOGLE_API_KEY or GOOGLE_GENAI_API_KEY in your .env file"
+        )
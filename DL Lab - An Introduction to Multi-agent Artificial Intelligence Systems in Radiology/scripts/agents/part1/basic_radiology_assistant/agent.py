@@ -4,21 +4,8 @@ A single agent that answers questions about radiology and avoids answering
 miscellaneous questions. No tools, no subagents.
 """
 
-import os
-from dotenv import load_dotenv
 from google.adk.agents import Agent
 
-# Load environment variables from .env file
-env_path = "../../.env"
-load_dotenv(env_path)
-
-# Ensure API key is loaded
-api_key = os.getenv("GOOGLE_API_KEY") or os.getenv("GOOGLE_GENAI_API_KEY")
-if not api_key:
-    raise ValueError(
-        "Please set GOOGLE_API_KEY or GOOGLE_GENAI_API_KEY in your .env file"
-    )
-
 # Define the basic radiology assistant agent
 root_agent = Agent(
     name="basic_radiology_assistant",
@@ -4,22 +4,9 @@ An agent that answers radiology questions by performing web searches using
 Google Search. It avoids answering questions unrelated to radiology.
 """
 
-import os
-from dotenv import load_dotenv
 from google.adk.agents import Agent
 from google.adk.tools import google_search
 
-# Load environment variables from .env file
-env_path = "../../.env"
-load_dotenv(env_path)
-
-# Ensure API key is loaded
-api_key = os.getenv("GOOGLE_API_KEY") or os.getenv("GOOGLE_GENAI_API_KEY")
-if not api_key:
-    raise ValueError(
-        "Please set GOOGLE_API_KEY or GOOGLE_GENAI_API_KEY in your .env file"
-    )
-
 # Define the web search agent specialized in radiology
 root_agent = Agent(
     name="web_search_agent",
@@ -7,23 +7,10 @@ The agent receives a person's name, searches the internet, and writes a biograph
 in a markdown file - all in one agent (which is the broken pattern).
 """
 
-import os
-from dotenv import load_dotenv
 from google.adk.agents import Agent
 from google.adk.tools import google_search
 from . import tools
 
-# Load environment variables from .env file
-env_path = "../../.env"
-load_dotenv(env_path)
-
-# Ensure API key is loaded
-api_key = os.getenv("GOOGLE_API_KEY") or os.getenv("GOOGLE_GENAI_API_KEY")
-if not api_key:
-    raise ValueError(
-        "Please set GOOGLE_API_KEY or GOOGLE_GENAI_API_KEY in your .env file"
-    )
-
 # Define the biography agent - BROKEN: mixing Google Search with custom function tool
 root_agent = Agent(
     name="biography_agent_broken",
@@ -1,21 +1,8 @@
 """Writing Agent - Writes biographies to markdown files."""
 
-import os
-from dotenv import load_dotenv
 from google.adk.agents import LlmAgent
 from .. import tools
 
-# Load environment variables from .env file
-env_path = "../../../.env"
-load_dotenv(env_path)
-
-# Ensure API key is loaded
-api_key = os.getenv("GOOGLE_API_KEY") or os.getenv("GOOGLE_GENAI_API_KEY")
-if not api_key:
-    raise ValueError(
-        "Please set GOOGLE_API_KEY or GOOGLE_GENAI_API_KEY in your .env file"
-    )
-
 # Define the writing agent - Step 2: Write biography to markdown file
 writing_agent = LlmAgent(
     name="biography_writing_agent",
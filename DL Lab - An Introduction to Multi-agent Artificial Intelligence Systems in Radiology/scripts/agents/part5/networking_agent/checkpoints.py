@@ -0,0 +1,47 @@
+"""Checkpoint callbacks - Let a rerun skip pipeline stages that already finished.
+
+Every stage of the networking pipeline writes its final output to session state
+under its own `output_key`. With a persistent session service (see the `--resume`
+flag of run_networking_agent.py) that state survives between runs, and the
+`restore_checkpoint` callback replays a finished stage's output instead of running
+the stage again. A rerun therefore resumes at the first stage that did not finish.
+"""
+
+import json
+from typing import Optional
+from google.adk.agents.callback_context import CallbackContext
+from google.genai import types
+
+# Session state key written by each stage (agent name -> output_key)
+STAGE_OUTPUT_KEYS = {
+    "radiologist_verification_agent": "verification_result",
+    "url_finder_agent": "online_presence_findings",
+    "semantic_scholar_agent": "publication_findings",
+    "profile_formatter_agent": "networking_profile",
+}
+
+
+def restore_checkpoint(callback_context: CallbackContext) -> Optional[types.Content]:
+    """Skip an agent whose output is already stored in session state.
+    
+    Used as `before_agent_callback`. Returning content makes ADK skip the agent and
+    emit that content as the agent's response, so later stages see the same input
+    they would have seen on the original run.
+    
+    Args:
+        callback_context: The callback context of the agent about to run
+    
+    Returns:
+        The checkpointed output as model content, or None to run the agent normally
+    """
+    output_key = STAGE_OUTPUT_KEYS.get(callback_context.agent_name)
+    if output_key is None:
+        return None
+    
+    checkpoint = callback_context.state.get(output_key)
+    if checkpoint is None:
+        return None
+    
+    # Structured outputs (e.g. the formatter's NetworkingProfile) are stored as dicts
+    text = checkpoint if isinstance(checkpoint, str) else json.dumps(checkpoint)
+    return types.Content(role="model", parts=[types.Part(text=text)])
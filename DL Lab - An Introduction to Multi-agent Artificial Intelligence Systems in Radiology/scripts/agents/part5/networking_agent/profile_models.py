@@ -0,0 +1,37 @@
+"""Pydantic models for the networking profile (structured output of the formatter agent).
+
+Kept separate from the agent definitions so that runners can parse and render profiles
+without importing google.adk or building the agent tree.
+"""
+
+from pydantic import BaseModel
+from typing import Optional, List
+
+
+class Paper(BaseModel):
+    title: str
+    journal: str
+    year: int
+    url: str
+    citations: int
+    authors: str
+
+
+class PublicationSection(BaseModel):
+    most_recent_papers: List[Paper]
+    most_cited_papers: List[Paper]
+
+
+class URLInfo(BaseModel):
+    category: str
+    url: str
+    description: str
+    platform: str
+
+
+class NetworkingProfile(BaseModel):
+    person_name: str
+    background: str
+    online_presence: List[URLInfo]
+    recent_publications: PublicationSection
+    contact_information: Optional[str] = None
@@ -0,0 +1,135 @@
+"""Speculative Networking Agent - Starts the research while verification is still running.
+
+In the standard pipeline (agent.py) the URL finder and Semantic Scholar agents wait for
+the verification agent, although for most names verification only confirms what we
+expected. This variant runs all three in one ParallelAgent:
+
+1. Speculative Research Agent (parallel):
+   - Verification Agent: same as before, but ends with a machine-readable verdict line
+   - URL Finder Agent and Semantic Scholar Agent: start immediately from the name alone
+2. Formatter Agent: compiles everything, or is skipped for non-radiologists
+
+When verification reports "NOT A RADIOLOGIST", research branches that are still running
+stop at their next model or tool call (a call already in flight cannot be cancelled),
+and the formatter returns a minimal profile built from the verification result instead
+of formatting research that would be thrown away. If the verdict line is missing, the
+pipeline behaves like the standard one.
+
+The agents are clones of the standard ones (same names, output keys and checkpoints),
+so the profile parsing, caching, tracing and --resume all work unchanged:
+    python -m scripts.run_networking_agent --speculative "Jane Doe"
+"""
+
+import re
+from typing import Optional
+from google.adk.agents import ParallelAgent, SequentialAgent
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.models import LlmResponse
+from google.genai import types
+from .checkpoints import STAGE_OUTPUT_KEYS, restore_checkpoint
+from .stage_results import prepare_formatter_inputs
+from .profile_models import NetworkingProfile, PublicationSection
+from .sub_agents import verification_agent, formatter_agent
+from .sub_agents.parallel_research import url_finder_agent, article_agent
+
+VERDICT_CONFIRMED = "CONFIRMED"
+VERDICT_REJECTED = "NOT A RADIOLOGIST"
+VERDICT_PATTERN = re.compile(rf"VERIFICATION:\s*({VERDICT_CONFIRMED}|{VERDICT_REJECTED})", re.IGNORECASE)
+
+VERDICT_INSTRUCTION = (
+    "\n\nFINAL LINE: End your summary with exactly one of these lines, on its own:\n"
+    f"VERIFICATION: {VERDICT_CONFIRMED}\n"
+    f"VERIFICATION: {VERDICT_REJECTED}\n"
+    "Other agents are researching the person at the same time and stop as soon as they see "
+    f"\"{VERDICT_REJECTED}\"."
+)
+
+SKIPPED_RESEARCH = "Research skipped: the verification agent found that this person is not a radiologist."
+
+
+def verification_verdict(state) -> Optional[bool]:
+    """Read the verdict from the verification agent's output in session state.
+
+    Returns:
+        True if confirmed, False if not a radiologist, None if verification has not
+        finished yet or did not include a verdict line
+    """
+    result = state.get(STAGE_OUTPUT_KEYS["radiologist_verification_agent"])
+    if not isinstance(result, str):
+        return None
+    verdicts = VERDICT_PATTERN.findall(result)
+    if not verdicts:
+        return None
+    # The last verdict wins (the instruction asks for it on the final line)
+    return verdicts[-1].upper() == VERDICT_CONFIRMED
+
+
+def stop_if_rejected(callback_context: CallbackContext, llm_request) -> Optional[LlmResponse]:
+    """before_model_callback: end a research branch once verification has rejected the person."""
+    if verification_verdict(callback_context.state) is False:
+        return LlmResponse(content=types.Content(role="model", parts=[types.Part(text=SKIPPED_RESEARCH)]))
+    return None
+
+
+def skip_tool_if_rejected(tool, args: dict, tool_context) -> Optional[dict]:
+    """before_tool_callback: skip tool calls (e.g. Semantic Scholar) for rejected people."""
+    if verification_verdict(tool_context.state) is False:
+        return {"skipped": SKIPPED_RESEARCH}
+    return None
+
+
+def skip_formatting_if_rejected(callback_context: CallbackContext) -> Optional[types.Content]:
+    """before_agent_callback: return a minimal profile instead of formatting discarded research."""
+    if verification_verdict(callback_context.state) is not False:
+        return None
+
+    user_content = callback_context.user_content
+    request = user_content.parts[0].text if user_content and user_content.parts else ""
+    person_name = request.replace("Create a networking profile for", "").strip() or "Unknown"
+    background = VERDICT_PATTERN.sub("", callback_context.state[STAGE_OUTPUT_KEYS["radiologist_verification_agent"]])
+
+    profile = NetworkingProfile(
+        person_name=person_name,
+        background=background.strip(),
+        online_presence=[],
+        recent_publications=PublicationSection(most_recent_papers=[], most_cited_papers=[]),
+    )
+    # Stored like the formatter's own output, so --resume treats the stage as finished
+    callback_context.state[STAGE_OUTPUT_KEYS["profile_formatter_agent"]] = profile.model_dump()
+    return types.Content(role="model", parts=[types.Part(text=profile.model_dump_json())])
+
+
+speculative_verification_agent = verification_agent.clone(update={
+    "instruction": verification_agent.instruction + VERDICT_INSTRUCTION,
+})
+
+speculative_url_finder_agent = url_finder_agent.clone(update={
+    "before_model_callback": stop_if_rejected,
+})
+
+speculative_article_agent = article_agent.clone(update={
+    "before_model_callback": stop_if_rejected,
+    "before_tool_callback": skip_tool_if_rejected,
+})
+
+speculative_formatter_agent = formatter_agent.clone(update={
+    # Checkpoints first, so a resumed run replays the stored profile
+    "before_agent_callback": [restore_checkpoint, skip_formatting_if_rejected, prepare_formatter_inputs],
+})
+
+# Verification and research start together: Verify + Research -> Format
+root_agent = SequentialAgent(
+    name="speculative_networking_agent",
+    description=(
+        "Creates networking profiles for radiologists, researching URLs and articles while the "
+        "radiologist verification is still running, and skipping the profile for non-radiologists."
+    ),
+    sub_agents=[
+        ParallelAgent(
+            name="speculative_research_agent",
+            description="Verifies the radiologist while finding URLs and articles in parallel.",
+            sub_agents=[speculative_verification_agent, speculative_url_finder_agent, speculative_article_agent],
+        ),
+        speculative_formatter_agent,
+    ],
+)
@@ -0,0 +1,192 @@
+"""Stage results - The distilled, size-bounded inputs of the formatter agent.
+
+The formatter used to receive the whole conversation: the verification agent's
+reasoning, the URL finder's grounded text and the article agent's tool calls, so its
+prompt grew with every upstream call. Now each research stage also writes a compact
+result to session state when it finishes (`store_stage_result`, an
+after_agent_callback):
+
+- verification_brief: the background text, without grounding redirect links
+- online_presence_brief: a JSON list of URLInfo records, without redirect URLs and
+  with duplicates removed (falls back to the text if the stage did not return JSON)
+- publication_brief: the article agent's compact JSON (papers dropped from the end
+  of the lists when over budget)
+
+Each result is capped at a byte budget, set per stage with the environment variables
+VERIFICATION_RESULT_BYTES, ONLINE_PRESENCE_FINDINGS_BYTES and PUBLICATION_FINDINGS_BYTES.
+The formatter reads them through `{...}` placeholders in its instruction and gets only
+the user's request as conversation (`use_stage_results`). The raw and distilled size of
+each stage is kept in state as well (see `stage_result_sizes`).
+"""
+
+import json
+import os
+import re
+from typing import Optional
+from google.adk.agents.callback_context import CallbackContext
+from google.genai import types
+from pydantic import ValidationError
+from .checkpoints import STAGE_OUTPUT_KEYS
+from .profile_models import URLInfo
+
+# Raw stage output key -> key of its distilled result
+STAGE_RESULT_KEYS = {
+    "verification_result": "verification_brief",
+    "online_presence_findings": "online_presence_brief",
+    "publication_findings": "publication_brief",
+}
+
+# Byte budget per stage (VERIFICATION_RESULT_BYTES, ONLINE_PRESENCE_FINDINGS_BYTES, ...)
+DEFAULT_BYTE_BUDGETS = {
+    "verification_result": 4000,
+    "online_presence_findings": 4000,
+    # Above the article tool's own output budget, so its JSON is normally kept whole
+    "publication_findings": 8000,
+}
+STAGE_BYTE_BUDGETS = {
+    key: int(os.getenv(f"{key.upper()}_BYTES", default)) for key, default in DEFAULT_BYTE_BUDGETS.items()
+}
+
+REQUEST_KEY = "profile_request"
+# Sizes are stored per stage (<result key>_size): parallel stages must not write the same key
+SIZE_SUFFIX = "_size"
+TRUNCATED = " [truncated]"
+
+# Grounding links are redirects that expire and must not end up in the profile
+REDIRECT_URL = re.compile(r"https?://(?:[\w.-]*vertexaisearch\.cloud\.google\.com|[^\s)\]]*grounding-api-redirect)[^\s)\]]*")
+REDIRECT_MARKERS = ("grounding-api-redirect", "vertexaisearch.cloud.google.com")
+
+
+def _size(text: str) -> int:
+    return len(text.encode("utf-8"))
+
+
+def truncate_text(text: str, budget: int) -> str:
+    """Cut a text to `budget` UTF-8 bytes, at a paragraph or sentence end when possible."""
+    if _size(text) <= budget:
+        return text
+    cut = text.encode("utf-8")[:max(0, budget - _size(TRUNCATED))].decode("utf-8", errors="ignore")
+    for boundary in ("\n\n", "\n", ". "):
+        position = cut.rfind(boundary)
+        if position > len(cut) // 2:
+            cut = cut[:position + (1 if boundary == ". " else 0)]
+            break
+    return cut.rstrip() + TRUNCATED
+
+
+def _json_value(text: str, opening: str):
+    """The first JSON value starting with `opening` ("[" or "{") in a text, or None."""
+    decoder = json.JSONDecoder()
+    position = text.find(opening)
+    while position != -1:
+        try:
+            return decoder.raw_decode(text, position)[0]
+        except json.JSONDecodeError:
+            position = text.find(opening, position + 1)
+    return None
+
+
+def distill_verification(text: str, budget: int) -> str:
+    """Background text without redirect links, within the budget."""
+    text = REDIRECT_URL.sub("", text)
+    text = re.sub(r"\n{3,}", "\n\n", text).strip()
+    return truncate_text(text, budget)
+
+
+def distill_online_presence(text: str, budget: int) -> str:
+    """JSON list of URLInfo records (direct URLs only, each once), within the budget."""
+    records = _json_value(text, "[")
+    if not isinstance(records, list):
+        return distill_verification(text, budget)
+
+    urls, seen = [], set()
+    for record in records:
+        try:
+            info = URLInfo.model_validate(record)
+        except ValidationError:
+            continue
+        key = info.url.rstrip("/").lower()
+        if not info.url.startswith("http") or key in seen or any(m in info.url for m in REDIRECT_MARKERS):
+            continue
+        seen.add(key)
+        urls.append(info.model_dump())
+
+    # The stage lists the most important URLs first, so the last ones are dropped
+    while urls and _size(json.dumps(urls, ensure_ascii=False)) > budget:
+        urls.pop()
+    return json.dumps(urls, ensure_ascii=False)
+
+
+def distill_publications(text: str, budget: int) -> str:
+    """The article agent's compact JSON, shortened to the budget (or its text if not JSON)."""
+    data = _json_value(text, "{")
+    if not isinstance(data, dict) or "papers" not in data:
+        return truncate_text(text.strip(), budget)
+
+    recent, cited = list(data.get("most_recent") or []), list(data.get("most_cited") or [])
+    omitted = data.get("omitted", 0)
+    while _size(json.dumps(data, ensure_ascii=False)) > budget and (recent or cited):
+        (recent if len(recent) >= len(cited) else cited).pop()
+        omitted += 1
+        referenced = set(recent) | set(cited)
+        data = dict(data, most_recent=recent, most_cited=cited, omitted=omitted,
+                    papers={pid: paper for pid, paper in data["papers"].items() if pid in referenced})
+    return json.dumps(data, ensure_ascii=False)
+
+
+DISTILLERS = {
+    "verification_result": distill_verification,
+    "online_presence_findings": distill_online_presence,
+    "publication_findings": distill_publications,
+}
+
+
+def _store(state, output_key: str):
+    raw = state.get(output_key)
+    if raw is None:
+        return
+    raw = raw if isinstance(raw, str) else json.dumps(raw)
+    result = DISTILLERS[output_key](raw, STAGE_BYTE_BUDGETS[output_key])
+    state[STAGE_RESULT_KEYS[output_key]] = result
+    state[STAGE_RESULT_KEYS[output_key] + SIZE_SUFFIX] = {"raw_bytes": _size(raw), "bytes": _size(result)}
+
+
+def stage_result_sizes(state) -> dict:
+    """Raw and distilled size (bytes) of every stage that has a result."""
+    return {output_key: state[result_key + SIZE_SUFFIX] for output_key, result_key in STAGE_RESULT_KEYS.items()
+            if state.get(result_key + SIZE_SUFFIX) is not None}
+
+
+def store_stage_result(callback_context: CallbackContext) -> Optional[types.Content]:
+    """after_agent_callback: write the stage's distilled result to session state."""
+    output_key = STAGE_OUTPUT_KEYS.get(callback_context.agent_name)
+    if output_key in STAGE_RESULT_KEYS:
+        _store(callback_context.state, output_key)
+    return None
+
+
+def prepare_formatter_inputs(callback_context: CallbackContext) -> Optional[types.Content]:
+    """before_agent_callback of the formatter: store the request and any missing stage results.
+
+    Stages restored from a checkpoint written before stage results existed have no
+    result yet; it is distilled here from their stored output.
+    """
+    state = callback_context.state
+    user_content = callback_context.user_content
+    state[REQUEST_KEY] = user_content.parts[0].text if user_content and user_content.parts else ""
+    for output_key, result_key in STAGE_RESULT_KEYS.items():
+        if state.get(result_key) is None:
+            _store(state, output_key)
+    return None
+
+
+def use_stage_results(callback_context: CallbackContext, llm_request) -> None:
+    """before_model_callback of the formatter: send only the user's request as conversation.
+
+    The stage results are already in the instruction; without this the formatter would
+    also get the last research stage's full output as context.
+    """
+    llm_request.contents = [
+        types.Content(role="user", parts=[types.Part(text=callback_context.state.get(REQUEST_KEY) or "")])
+    ]
+    return None
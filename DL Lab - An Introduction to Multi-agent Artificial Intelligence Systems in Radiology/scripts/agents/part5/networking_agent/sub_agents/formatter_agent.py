@@ -1,37 +1,10 @@
 """Formatter Agent - Compiles all information into a structured networking profile."""
 
-from pydantic import BaseModel
-from typing import Optional, List
 from google.adk.agents import LlmAgent
-
-# Define Pydantic models for structured output
-class Paper(BaseModel):
-    title: str
-    journal: str
-    year: int
-    url: str
-    citations: int
-    authors: str
-
-
-class PublicationSection(BaseModel):
-    most_recent_papers: List[Paper]
-    most_cited_papers: List[Paper]
-
-
-class URLInfo(BaseModel):
-    category: str
-    url: str
-    description: str
-    platform: str
-
-
-class NetworkingProfile(BaseModel):
-    person_name: str
-    background: str
-    online_presence: List[URLInfo]
-    recent_publications: PublicationSection
-    contact_information: Optional[str] = None
+from ..checkpoints import STAGE_OUTPUT_KEYS, restore_checkpoint
+from ..stage_results import prepare_formatter_inputs, use_stage_results
+# Pydantic models for structured output (re-exported for existing imports)
+from ..profile_models import Paper, PublicationSection, URLInfo, NetworkingProfile
 
 
 # Define the formatter agent - Step 3: Compile everything into structured output
@@ -45,8 +18,11 @@ formatter_agent = LlmAgent(
         "You are a profile formatting agent. Your role is to compile all gathered information "
         "into a structured networking profile.\n\n"
         
-        "When given information from previous agents:\n"
-        "1. Review all information provided:\n"
+        "Use only the information gathered by the previous agents below:\n\n"
+        "Background from the verification agent:\n{verification_brief?}\n\n"
+        "URLs from the URL finder agent (a JSON list of URLInfo records when available):\n{online_presence_brief?}\n\n"
+        "Publications from the article agent:\n{publication_brief?}\n\n"
+        "1. Review all information provided above:\n"
         "   - Background information from verification agent\n"
         "   - URLs from URL finder agent (social media, personal web pages, etc.)\n"
         "   - Recent articles from article agent (including Most Recent Papers and Most Cited Papers sections)\n\n"
@@ -58,10 +34,14 @@ formatter_agent = LlmAgent(
         "     * url: The direct URL\n"
         "     * description: Brief description of the page\n"
         "     * platform: Platform or website name (e.g., \"LinkedIn\", \"Twitter\", institution name)\n"
+        "     URLInfo records from the URL finder can be copied unchanged\n"
         "   - recent_publications: PublicationSection with:\n"
         "     * most_recent_papers: List of Paper objects (up to 10)\n"
         "     * most_cited_papers: List of Paper objects (up to 10)\n"
         "     Each Paper should have: title, journal, year (integer), url, citations (integer), authors\n"
+        "     The article agent returns compact JSON: expand every ID in \"most_recent\" and \"most_cited\" "
+        "into a Paper from \"papers\"[ID], mapping the short keys with \"keys\" "
+        "(t=title, j=journal, y=year, u=url, c=citations, a=authors) and copying the values unchanged\n"
         "   - contact_information: Contact info if available from background research (optional)\n\n"
         "3. Structure the response according to the NetworkingProfile schema.\n"
         "4. Ensure all data is accurate and well-organized.\n"
@@ -74,5 +54,12 @@ formatter_agent = LlmAgent(
         "structured networking profile using Pydantic models."
     ),
     tools=[],
+    # The stage results above replace the conversation history (see stage_results.py)
+    include_contents="none",
+    output_key=STAGE_OUTPUT_KEYS["profile_formatter_agent"],
+    before_agent_callback=[
+        restore_checkpoint,  # Skip the stage if it already finished
+        prepare_formatter_inputs,
+    ],
+    before_model_callback=use_stage_results,
 )
-
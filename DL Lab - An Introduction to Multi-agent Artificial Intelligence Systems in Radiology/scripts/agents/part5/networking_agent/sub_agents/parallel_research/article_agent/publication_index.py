@@ -0,0 +1,391 @@
+"""Local index of authors and papers shared between profile runs.
+
+Every author whose full paper list was fetched from Semantic Scholar is stored in a
+small SQLite database together with their papers and the paper-author links. Later
+runs, including profiles of co-authors and of other members of the same team, then
+answer from the database instead of querying the API again:
+
+- "recent" and "most cited" lists come from indexed SQL queries
+- "co-authored with X" and title searches use an FTS5 full-text index (plain LIKE
+  queries when SQLite was built without FTS5)
+- Refreshes are incremental: an author is only re-queried (by their stored author ID,
+  skipping the name search) once their data is older than the maximum age
+- The name an author was requested by is kept as an alias of their author ID, so a
+  spelling that differs from Semantic Scholar's (e.g. without a middle initial) is
+  not resolved again
+
+A paper fetched for one author is shared by all of its authors, but an author only
+counts as indexed once their own paper list has been fetched, so their lists are
+never built from the papers of co-authors alone.
+
+Environment variables:
+    PUBLICATION_INDEX               "off" disables the index
+    PUBLICATION_INDEX_DB            database file (default: publication_index.db next to this file)
+    PUBLICATION_INDEX_MAX_AGE_DAYS  days before an author is refreshed (default: 7)
+
+Query the index from the command line (from the lab directory):
+    python -m scripts.agents.part5.networking_agent.sub_agents.parallel_research.article_agent.publication_index stats
+    python -m scripts.agents.part5.networking_agent.sub_agents.parallel_research.article_agent.publication_index recent "Jane Doe"
+    python -m scripts.agents.part5.networking_agent.sub_agents.parallel_research.article_agent.publication_index coauthored "Jane Doe" "John Smith"
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Optional
+
+DEFAULT_INDEX_DB = Path(__file__).parent / "publication_index.db"
+DEFAULT_MAX_AGE_DAYS = 7
+
+
+def normalize_name(name: str) -> str:
+    """Lower-case a name and drop punctuation (so "Doe, J." style variants compare equal)."""
+    return " ".join("".join(c for c in name.lower() if c.isalnum() or c.isspace()).split())
+
+
+def _phrase(text: str) -> str:
+    """Quote text as an FTS5 phrase."""
+    return '"' + text.replace('"', '""') + '"'
+
+
+class PublicationIndex:
+    """SQLite store of authors, papers and paper-author links with full-text search.
+
+    Papers are returned in the shape of Semantic Scholar API results (paperId, title,
+    venue, year, citationCount, authors), so they can be formatted like fresh ones.
+    The database file is only created when the index is first used.
+    """
+
+    def __init__(self, db_path: Path = None, max_age_days: float = None):
+        """Configure the index.
+
+        Args:
+            db_path: SQLite database file (default: PUBLICATION_INDEX_DB or publication_index.db next to this file)
+            max_age_days: Days before an author's papers are fetched again
+                (default: PUBLICATION_INDEX_MAX_AGE_DAYS or 7)
+        """
+        self.db_path = Path(db_path or os.getenv("PUBLICATION_INDEX_DB") or DEFAULT_INDEX_DB)
+        if max_age_days is None:
+            max_age_days = float(os.getenv("PUBLICATION_INDEX_MAX_AGE_DAYS", DEFAULT_MAX_AGE_DAYS))
+        self.max_age_seconds = max_age_days * 24 * 60 * 60
+        self.stats = {"hits": 0, "stale": 0, "misses": 0, "stored_authors": 0, "stored_papers": 0}
+        self.fts = None
+        self._ready = False
+
+    @contextmanager
+    def _connect(self):
+        """Open a connection that commits on success and is always closed."""
+        if not self._ready:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            with conn:
+                if not self._ready:
+                    self._create_schema(conn)
+                    self._ready = True
+                yield conn
+        finally:
+            conn.close()
+
+    def _create_schema(self, conn: sqlite3.Connection):
+        conn.executescript(
+            "CREATE TABLE IF NOT EXISTS authors ("
+            "  author_id TEXT PRIMARY KEY,"
+            "  name TEXT NOT NULL,"
+            "  normalized_name TEXT NOT NULL,"
+            "  paper_count INTEGER,"
+            "  citation_count INTEGER,"
+            "  refreshed_at REAL NOT NULL"
+            ");"
+            "CREATE INDEX IF NOT EXISTS authors_name ON authors (normalized_name);"
+            "CREATE TABLE IF NOT EXISTS papers ("
+            "  paper_id TEXT PRIMARY KEY,"
+            "  title TEXT,"
+            "  venue TEXT,"
+            "  year INTEGER,"
+            "  citation_count INTEGER,"
+            "  updated_at REAL NOT NULL"
+            ");"
+            "CREATE TABLE IF NOT EXISTS paper_authors ("
+            "  paper_id TEXT NOT NULL,"
+            "  position INTEGER NOT NULL,"
+            "  author_id TEXT,"
+            "  name TEXT NOT NULL,"
+            "  PRIMARY KEY (paper_id, position)"
+            ");"
+            # The paper list of each indexed author, exactly as /author/{id}/papers returned it
+            "CREATE TABLE IF NOT EXISTS author_papers ("
+            "  author_id TEXT NOT NULL,"
+            "  paper_id TEXT NOT NULL,"
+            "  PRIMARY KEY (author_id, paper_id)"
+            ");"
+            # Requested names that resolved to an indexed author
+            "CREATE TABLE IF NOT EXISTS author_aliases ("
+            "  normalized_name TEXT PRIMARY KEY,"
+            "  author_id TEXT NOT NULL"
+            ");"
+        )
+        try:
+            conn.execute("CREATE VIRTUAL TABLE IF NOT EXISTS papers_fts "
+                         "USING fts5(paper_id UNINDEXED, title, authors)")
+            self.fts = True
+        except sqlite3.OperationalError:
+            # SQLite without FTS5: searches fall back to LIKE
+            self.fts = False
+
+    def _fresh(self, refreshed_at: float) -> bool:
+        return time.time() - refreshed_at <= self.max_age_seconds
+
+    def find_author(self, author_name: str) -> Optional[dict]:
+        """Look up an indexed author by name or alias.
+
+        A name recorded as an alias wins; among homonyms, the author with the most papers does.
+
+        Returns:
+            Dictionary with authorId, name, paperCount, citationCount and fresh (False once
+            the author is due for a refresh), or None if nobody with that name is indexed
+        """
+        normalized = normalize_name(author_name)
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT a.author_id, a.name, a.paper_count, a.citation_count, a.refreshed_at FROM authors a "
+                "LEFT JOIN author_aliases al ON al.author_id = a.author_id AND al.normalized_name = ? "
+                "WHERE a.normalized_name = ? OR al.normalized_name IS NOT NULL "
+                "ORDER BY al.normalized_name IS NULL, a.paper_count DESC LIMIT 1",
+                (normalized, normalized)
+            ).fetchone()
+
+        if row is None:
+            self.stats["misses"] += 1
+            return None
+        fresh = self._fresh(row[4])
+        self.stats["hits" if fresh else "stale"] += 1
+        return {"authorId": row[0], "name": row[1], "paperCount": row[2], "citationCount": row[3], "fresh": fresh}
+
+    def store_author_papers(self, author: dict, papers: list, aliases: tuple = ()):
+        """Store an author's complete paper list (replacing their previous one).
+
+        Args:
+            author: Author dictionary from the API (authorId, name, paperCount, citationCount)
+            papers: All of the author's papers, as returned by /author/{id}/papers
+            aliases: Other names the author was requested by (e.g. the name given to the tool)
+        """
+        now = time.time()
+        author_id = str(author["authorId"])
+        papers = [paper for paper in papers if paper.get("paperId")]
+
+        with self._connect() as conn:
+            paper_ids = [paper["paperId"] for paper in papers]
+            conn.executemany(
+                "INSERT OR REPLACE INTO papers (paper_id, title, venue, year, citation_count, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [(paper["paperId"], paper.get("title"), paper.get("venue"), paper.get("year"),
+                  paper.get("citationCount"), now) for paper in papers]
+            )
+            conn.executemany("DELETE FROM paper_authors WHERE paper_id = ?", [(pid,) for pid in paper_ids])
+            conn.executemany(
+                "INSERT INTO paper_authors (paper_id, position, author_id, name) VALUES (?, ?, ?, ?)",
+                [(paper["paperId"], position, a.get("authorId"), a.get("name") or "")
+                 for paper in papers for position, a in enumerate(paper.get("authors") or [])]
+            )
+            # Replaces the previous list, so papers no longer listed (e.g. merged duplicates) drop out
+            conn.execute("DELETE FROM author_papers WHERE author_id = ?", (author_id,))
+            conn.executemany("INSERT OR IGNORE INTO author_papers (author_id, paper_id) VALUES (?, ?)",
+                             [(author_id, pid) for pid in paper_ids])
+            if self.fts:
+                conn.executemany("DELETE FROM papers_fts WHERE paper_id = ?", [(pid,) for pid in paper_ids])
+                conn.executemany(
+                    "INSERT INTO papers_fts (paper_id, title, authors) VALUES (?, ?, ?)",
+                    [(paper["paperId"], paper.get("title") or "",
+                      "; ".join(a.get("name") or "" for a in paper.get("authors") or [])) for paper in papers]
+                )
+            conn.execute(
+                "INSERT OR REPLACE INTO authors "
+                "(author_id, name, normalized_name, paper_count, citation_count, refreshed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (author_id, author.get("name") or "", normalize_name(author.get("name") or ""),
+                 author.get("paperCount", len(papers)), author.get("citationCount"), now)
+            )
+            conn.executemany(
+                "INSERT OR REPLACE INTO author_aliases (normalized_name, author_id) VALUES (?, ?)",
+                [(name, author_id) for name in {normalize_name(alias) for alias in aliases}
+                 if name and name != normalize_name(author.get("name") or "")]
+            )
+        self.stats["stored_authors"] += 1
+        self.stats["stored_papers"] += len(papers)
+
+    def _papers(self, conn: sqlite3.Connection, query: str, args: tuple) -> list:
+        """Run a query selecting paper rows and attach each paper's ordered author list."""
+        rows = conn.execute(query, args).fetchall()
+        authors = {}
+        if rows:
+            for paper_id, author_id, name in conn.execute(
+                "SELECT paper_id, author_id, name FROM paper_authors "
+                "WHERE paper_id IN (SELECT value FROM json_each(?)) ORDER BY paper_id, position",
+                (_json_list([row[0] for row in rows]),)
+            ):
+                authors.setdefault(paper_id, []).append({"authorId": author_id, "name": name})
+        return [{"paperId": row[0], "title": row[1], "venue": row[2], "year": row[3],
+                 "citationCount": row[4], "authors": authors.get(row[0], [])} for row in rows]
+
+    def recent(self, author_id: str, limit: int) -> list:
+        """An author's most recent papers (ties broken by citations)."""
+        with self._connect() as conn:
+            return self._papers(
+                conn,
+                "SELECT p.paper_id, p.title, p.venue, p.year, p.citation_count FROM papers p "
+                "JOIN author_papers ap ON ap.paper_id = p.paper_id "
+                "WHERE ap.author_id = ? AND p.year IS NOT NULL "
+                "ORDER BY p.year DESC, COALESCE(p.citation_count, 0) DESC LIMIT ?",
+                (str(author_id), limit)
+            )
+
+    def most_cited(self, author_id: str, limit: int) -> list:
+        """An author's most cited papers."""
+        with self._connect() as conn:
+            return self._papers(
+                conn,
+                "SELECT p.paper_id, p.title, p.venue, p.year, p.citation_count FROM papers p "
+                "JOIN author_papers ap ON ap.paper_id = p.paper_id "
+                "WHERE ap.author_id = ? AND p.citation_count IS NOT NULL "
+                "ORDER BY p.citation_count DESC LIMIT ?",
+                (str(author_id), limit)
+            )
+
+    def coauthored(self, author_id: str, coauthor_name: str, limit: int = 50) -> list:
+        """An author's papers that also list `coauthor_name`, most recent first."""
+        with self._connect() as conn:
+            if self.fts:
+                match = "SELECT paper_id FROM papers_fts WHERE papers_fts MATCH ?"
+                pattern = f"authors : {_phrase(coauthor_name)}"
+            else:
+                match = "SELECT paper_id FROM paper_authors WHERE name LIKE ?"
+                pattern = f"%{coauthor_name}%"
+            return self._papers(
+                conn,
+                "SELECT p.paper_id, p.title, p.venue, p.year, p.citation_count FROM papers p "
+                "JOIN author_papers ap ON ap.paper_id = p.paper_id "
+                f"WHERE ap.author_id = ? AND p.paper_id IN ({match}) "
+                "ORDER BY p.year DESC, COALESCE(p.citation_count, 0) DESC LIMIT ?",
+                (str(author_id), pattern, limit)
+            )
+
+    def search(self, query: str, limit: int = 20) -> list:
+        """Papers whose title matches a full-text query (best matches first)."""
+        with self._connect() as conn:
+            if self.fts:
+                return self._papers(
+                    conn,
+                    "SELECT p.paper_id, p.title, p.venue, p.year, p.citation_count FROM papers_fts f "
+                    "JOIN papers p ON p.paper_id = f.paper_id "
+                    "WHERE papers_fts MATCH ? ORDER BY f.rank LIMIT ?",
+                    (f"title : {_phrase(query)}", limit)
+                )
+            return self._papers(
+                conn,
+                "SELECT paper_id, title, venue, year, citation_count FROM papers "
+                "WHERE title LIKE ? ORDER BY citation_count DESC LIMIT ?",
+                (f"%{query}%", limit)
+            )
+
+    def stale_authors(self) -> list:
+        """Indexed authors due for a refresh (author ID, name, age in days)."""
+        cutoff = time.time() - self.max_age_seconds
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT author_id, name, refreshed_at FROM authors WHERE refreshed_at < ? ORDER BY refreshed_at",
+                (cutoff,)
+            ).fetchall()
+        return [{"authorId": row[0], "name": row[1], "age_days": round((time.time() - row[2]) / 86400, 1)}
+                for row in rows]
+
+    def summary(self) -> dict:
+        """Number of indexed authors (and stale ones), papers and author-paper links."""
+        with self._connect() as conn:
+            authors, stale = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(refreshed_at < ?), 0) FROM authors",
+                (time.time() - self.max_age_seconds,)
+            ).fetchone()
+            papers = conn.execute("SELECT COUNT(*) FROM papers").fetchone()[0]
+            links = conn.execute("SELECT COUNT(*) FROM author_papers").fetchone()[0]
+        return {"authors": authors, "stale_authors": stale, "papers": papers, "links": links,
+                "full_text_search": self.fts}
+
+    def purge(self):
+        """Delete everything from the index."""
+        with self._connect() as conn:
+            tables = ("authors", "author_aliases", "papers", "paper_authors", "author_papers")
+            for table in tables + (("papers_fts",) if self.fts else ()):
+                conn.execute(f"DELETE FROM {table}")
+
+
+def _json_list(values: list) -> str:
+    """Encode a list of IDs for json_each() (avoids SQLite's bound-parameter limit)."""
+    return json.dumps(values)
+
+
+def open_publication_index() -> Optional[PublicationIndex]:
+    """The index configured by the environment, or None if PUBLICATION_INDEX is "off"."""
+    if os.getenv("PUBLICATION_INDEX", "").lower() in ("off", "0", "false", "no"):
+        return None
+    return PublicationIndex()
+
+
+def _print_papers(papers: list):
+    for paper in papers:
+        names = ", ".join(a["name"] for a in paper["authors"][:3]) + (", et al." if len(paper["authors"]) > 3 else "")
+        print(f"{paper['year'] or '----'}  {paper['citationCount'] or 0:6} cit.  {paper['title']}  ({names})")
+
+
+def main():
+    """Query or purge the publication index."""
+    parser = argparse.ArgumentParser(description="Query or purge the local publication index.")
+    parser.add_argument("--db", type=Path, help="Index database (default: PUBLICATION_INDEX_DB or publication_index.db)")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("stats", help="Indexed authors, papers and links")
+    commands.add_parser("stale", help="Authors due for a refresh")
+    for name, help_text in (("recent", "An author's most recent papers"), ("cited", "An author's most cited papers")):
+        command = commands.add_parser(name, help=help_text)
+        command.add_argument("author")
+        command.add_argument("--limit", type=int, default=10)
+    coauthored_parser = commands.add_parser("coauthored", help="Papers an author wrote with someone")
+    coauthored_parser.add_argument("author")
+    coauthored_parser.add_argument("coauthor")
+    coauthored_parser.add_argument("--limit", type=int, default=50)
+    search_parser = commands.add_parser("search", help="Full-text search of paper titles")
+    search_parser.add_argument("query")
+    search_parser.add_argument("--limit", type=int, default=20)
+    commands.add_parser("purge", help="Delete everything")
+    args = parser.parse_args()
+
+    index = PublicationIndex(args.db)
+    if args.command == "stats":
+        print(f"Publication index: {index.db_path}")
+        for key, value in index.summary().items():
+            print(f"  {key:18} {value}")
+    elif args.command == "stale":
+        for author in index.stale_authors():
+            print(f"{author['authorId']:>12}  {author['age_days']:7} days  {author['name']}")
+    elif args.command == "search":
+        _print_papers(index.search(args.query, args.limit))
+    elif args.command == "purge":
+        index.purge()
+        print(f"Purged {index.db_path}")
+    else:
+        author = index.find_author(args.author)
+        if author is None:
+            parser.exit(1, f"'{args.author}' is not in the publication index\n")
+        if args.command == "recent":
+            _print_papers(index.recent(author["authorId"], args.limit))
+        elif args.command == "cited":
+            _print_papers(index.most_cited(author["authorId"], args.limit))
+        else:
+            _print_papers(index.coauthored(author["authorId"], args.coauthor, args.limit))
+
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,8 @@
 
 from google.adk.agents import LlmAgent
 from . import tools
+from ....checkpoints import STAGE_OUTPUT_KEYS, restore_checkpoint
+from ....stage_results import store_stage_result
 
 # Define the Semantic Scholar agent - Uses Semantic Scholar API only
 semantic_scholar_agent = LlmAgent(
@@ -18,24 +20,14 @@ semantic_scholar_agent = LlmAgent(
         "   - It returns TWO lists:\n"
         "     * Most Recent Papers (up to 10 most recent publications)\n"
         "     * Most Cited Papers (up to 10 papers with highest citation counts)\n\n"
-        "2. The tool will return papers with metadata including:\n"
-        "   - Title\n"
-        "   - Authors\n"
-        "   - Journal/Venue\n"
-        "   - Year\n"
-        "   - URL (Semantic Scholar link)\n"
-        "   - Citation count\n\n"
-        "3. Extract and organize the information from the Semantic Scholar tool results:\n"
-        "   - Separate papers into two lists: most recent papers and most cited papers\n"
-        "   - For each paper, extract:\n"
-        "     * title: The paper title\n"
-        "     * authors: Comma-separated list of authors (limit to first 5, then \"et al.\" if more)\n"
-        "     * journal: Journal or venue name\n"
-        "     * year: Publication year (as an integer)\n"
-        "     * url: Semantic Scholar URL\n"
-        "     * citations: Citation count (as an integer, 0 if not available)\n\n"
-        "4. Return up to 10 papers in each list (most_recent_papers and most_cited_papers).\n"
-        "5. If no papers are found, return empty lists for both categories.\n\n"
+        "2. The tool returns compact JSON that already matches the Paper model:\n"
+        "   - \"papers\": each paper once, keyed by ID, with short field keys "
+        "(t=title, j=journal, y=year, u=url, c=citations, a=authors; see \"keys\")\n"
+        "   - \"most_recent\" and \"most_cited\": lists of paper IDs (a paper can be in both)\n"
+        "   - \"omitted\" (optional): number of lower-ranked papers left out to keep the output short\n\n"
+        "3. Return the tool's JSON exactly as you received it, with no added text. "
+        "Do NOT expand, reorder or reformat it - the formatter agent reads it directly.\n"
+        "4. If the tool returns an error or no papers, say so in one line so the formatter uses empty lists.\n\n"
         "IMPORTANT: Do NOT return the conversation to the user. Pass your findings to the next agent in the workflow. "
         "Your output will be used by the formatter agent to create the final profile."
     ),
@@ -44,5 +36,7 @@ semantic_scholar_agent = LlmAgent(
         "returning both the most recent papers and the most cited papers (up to 10 each)."
     ),
     tools=[tools.get_semantic_scholar_papers],
+    output_key=STAGE_OUTPUT_KEYS["semantic_scholar_agent"],
+    before_agent_callback=restore_checkpoint,  # Skip the stage if it already finished
+    after_agent_callback=store_stage_result,  # Publication JSON for the formatter
 )
-
@@ -0,0 +1,204 @@
+"""Shared HTTP client for the Semantic Scholar Graph API.
+
+One client is shared by every tool call in the process:
+- A keep-alive httpx.AsyncClient pool for calls made on the ADK runner's event loop,
+  so other agents keep running while a request is in flight
+- Bounded retries with jittered exponential backoff on 429 and 5xx responses and on
+  connection errors (Retry-After is honoured when the API sends it)
+- A token-bucket rate limiter sized for the SEMANTIC_SCHOLAR_API_KEY tier, so batch
+  runs queue up instead of failing with 429s
+- An optional on-disk response cache (agents/response_cache.py): fresh responses skip the
+  network and the rate limiter, stale ones are revalidated with If-None-Match /
+  If-Modified-Since when the API sent validators
+
+Settings are read from the environment the first time they are needed:
+    SEMANTIC_SCHOLAR_API_KEY     optional API key (sent as x-api-key)
+    SEMANTIC_SCHOLAR_RATE_LIMIT  requests per second (0 disables the limiter)
+"""
+
+import asyncio
+import json
+import os
+import random
+import threading
+import time
+from typing import TYPE_CHECKING, Optional
+import httpx
+
+if TYPE_CHECKING:
+    from ......response_cache import ResponseCache
+
+# Requests per second and burst size: an API key gets a dedicated 1 request/second,
+# unauthenticated calls share a public pool, so stay well below it
+KEYED_RATE_LIMIT = (1.0, 1)
+PUBLIC_RATE_LIMIT = (0.3, 3)
+
+CACHE_SOURCE = "semantic_scholar"
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+MAX_RETRIES = 3
+BACKOFF_SECONDS = 1.0
+MAX_BACKOFF_SECONDS = 30.0
+TIMEOUT_SECONDS = 10.0
+POOL_SIZE = 20
+
+
+class SemanticScholarError(Exception):
+    """Raised when a request still fails after all retries."""
+
+
+class TokenBucket:
+    """Thread-safe token bucket shared by every caller (and event loop) in the process.
+
+    Each request reserves a token; if none is available the caller is told how
+    long to wait, so the bucket itself never blocks while holding its lock.
+    """
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Take a token and return how many seconds to wait before using it."""
+        if self.rate <= 0:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            return max(0.0, -self._tokens / self.rate)
+
+
+class SemanticScholarClient:
+    """Pooled, rate-limited and retrying client for the Semantic Scholar Graph API."""
+
+    def __init__(self, api_url: str, max_retries: int = MAX_RETRIES, timeout: float = TIMEOUT_SECONDS,
+                 cache: "ResponseCache" = None):
+        self.api_url = api_url.rstrip("/")
+        self.cache = cache
+        self.max_retries = max_retries
+        self.timeout = timeout
+        self.stats = {"requests": 0, "retries": 0, "rate_limited": 0, "throttled_seconds": 0.0}
+        self._bucket = None
+        self._async_client = None
+        self._async_loop = None
+        self._async_closer = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _api_key() -> Optional[str]:
+        # Read at call time: the .env file may be loaded after this module is imported
+        return os.getenv("SEMANTIC_SCHOLAR_API_KEY")
+
+    def _headers(self) -> dict:
+        api_key = self._api_key()
+        return {"x-api-key": api_key} if api_key else {}
+
+    def _reserve(self) -> float:
+        """Reserve a rate-limit token (the bucket is sized on first use)."""
+        with self._lock:
+            if self._bucket is None:
+                rate, capacity = KEYED_RATE_LIMIT if self._api_key() else PUBLIC_RATE_LIMIT
+                if os.getenv("SEMANTIC_SCHOLAR_RATE_LIMIT"):
+                    rate = float(os.environ["SEMANTIC_SCHOLAR_RATE_LIMIT"])
+                self._bucket = TokenBucket(rate, capacity)
+        wait = self._bucket.reserve()
+        self.stats["throttled_seconds"] += wait
+        return wait
+
+    def _backoff(self, attempt: int, retry_after: Optional[str]) -> float:
+        """Seconds to wait before retry number `attempt` (full jitter, Retry-After wins)."""
+        if retry_after:
+            try:
+                return min(float(retry_after), MAX_BACKOFF_SECONDS)
+            except ValueError:
+                pass
+        return random.uniform(0, min(MAX_BACKOFF_SECONDS, BACKOFF_SECONDS * 2 ** attempt))
+
+    def _should_retry(self, attempt: int, status_code: Optional[int]) -> bool:
+        if status_code == 429:
+            self.stats["rate_limited"] += 1
+        if attempt >= self.max_retries:
+            return False
+        if status_code is None or status_code in RETRY_STATUS_CODES:
+            self.stats["retries"] += 1
+            return True
+        return False
+
+    def _cached(self, url: str, params: dict) -> Optional[dict]:
+        return self.cache.get(CACHE_SOURCE, url, params) if self.cache is not None else None
+
+    @staticmethod
+    def _conditional_headers(cached: Optional[dict]) -> dict:
+        """Validators of a stale cache entry, so the server can answer 304 Not Modified."""
+        headers = {}
+        if cached is not None:
+            if cached["etag"]:
+                headers["If-None-Match"] = cached["etag"]
+            if cached["last_modified"]:
+                headers["If-Modified-Since"] = cached["last_modified"]
+        return headers
+
+    def _store(self, url: str, params: dict, body: str, response_headers) -> dict:
+        if self.cache is not None:
+            self.cache.put(CACHE_SOURCE, url, body, params,
+                           etag=response_headers.get("ETag"), last_modified=response_headers.get("Last-Modified"))
+        return json.loads(body)
+
+    @staticmethod
+    async def _close_on_shutdown(client: httpx.AsyncClient):
+        """Wait until the loop shuts down, then close the client's pooled connections."""
+        try:
+            await asyncio.Event().wait()
+        finally:
+            await client.aclose()
+
+    def _get_async_client(self) -> httpx.AsyncClient:
+        # httpx clients are bound to the loop they were first used on; scripts that
+        # call asyncio.run() once per profile get a fresh client for each new loop.
+        # asyncio.run() cancels the closer task before closing its loop, so each
+        # client's connections are closed on the loop that opened them
+        loop = asyncio.get_running_loop()
+        if self._async_client is None or self._async_loop is not loop:
+            self._async_client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=httpx.Limits(max_connections=POOL_SIZE, max_keepalive_connections=POOL_SIZE),
+            )
+            self._async_loop = loop
+            self._async_closer = loop.create_task(self._close_on_shutdown(self._async_client))
+        return self._async_client
+
+    async def aget(self, path: str, params: dict = None) -> dict:
+        """GET an API path (e.g. "/paper/search") on the running event loop and return the JSON body."""
+        url = f"{self.api_url}{path}"
+        cached = self._cached(url, params)
+        if cached is not None and cached["fresh"]:
+            return json.loads(cached["body"])
+        headers = dict(self._headers(), **self._conditional_headers(cached))
+
+        client = self._get_async_client()
+        for attempt in range(self.max_retries + 1):
+            await asyncio.sleep(self._reserve())
+            self.stats["requests"] += 1
+            try:
+                response = await client.get(url, params=params, headers=headers)
+            except httpx.TransportError as e:
+                if not self._should_retry(attempt, None):
+                    raise SemanticScholarError(f"Error accessing Semantic Scholar API: {e}") from e
+                await asyncio.sleep(self._backoff(attempt, None))
+                continue
+
+            if response.status_code == 304 and cached is not None:
+                self.cache.revalidated(CACHE_SOURCE, url, params)
+                return json.loads(cached["body"])
+            if response.status_code < 400:
+                return self._store(url, params, response.text, response.headers)
+            if not self._should_retry(attempt, response.status_code):
+                raise SemanticScholarError(
+                    f"Error accessing Semantic Scholar API: {response.status_code} "
+                    f"{response.reason_phrase} for url: {response.url}"
+                )
+            await asyncio.sleep(self._backoff(attempt, response.headers.get("Retry-After")))
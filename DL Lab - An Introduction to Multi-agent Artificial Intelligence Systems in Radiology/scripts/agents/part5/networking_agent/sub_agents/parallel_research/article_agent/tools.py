@@ -1,14 +1,62 @@
 """Custom tools for the article agent.
 
 This module contains custom function tools for searching Semantic Scholar for papers by author name.
+Requests go through a shared pooled, rate-limited and retrying client (semantic_scholar_client.py).
+Authors whose papers were fetched recently are answered from the local publication index
+(publication_index.py) without any API request.
 """
 
+import asyncio
+import heapq
+import json
 import os
-import requests
+import sys
+from pathlib import Path
+from .publication_index import normalize_name as _normalize_name, open_publication_index
+from .semantic_scholar_client import SemanticScholarClient
 
-# Get API key if available (optional, but recommended for higher rate limits)
-# Environment variables are loaded in main.py
-SEMANTIC_SCHOLAR_API_KEY = os.getenv("SEMANTIC_SCHOLAR_API_KEY")
+try:
+    from ......response_cache import open_response_cache
+except ImportError:
+    # `adk run agents/part5/networking_agent` imports networking_agent as a top-level
+    # package, so the shared module is imported from the agents directory instead
+    sys.path.append(str(Path(__file__).parents[5]))
+    from response_cache import open_response_cache
+
+# Base URL of the Semantic Scholar Graph API (can point at a local stand-in for offline benchmarks)
+SEMANTIC_SCHOLAR_API_URL = os.getenv("SEMANTIC_SCHOLAR_API_URL", "https://api.semanticscholar.org/graph/v1")
+
+# Shared by every tool call in the process (the API key is read when requests are made);
+# responses are cached on disk between runs unless RESPONSE_CACHE=off
+semantic_scholar = SemanticScholarClient(SEMANTIC_SCHOLAR_API_URL, cache=open_response_cache())
+
+# Authors and papers shared between profile runs, unless PUBLICATION_INDEX=off
+publication_index = open_publication_index()
+
+# Only the fields the paper lists use (paper URLs are built from paperId)
+PAPER_FIELDS = "paperId,title,authors,year,venue,citationCount"
+AUTHOR_FIELDS = "name,paperCount,citationCount"
+
+# Largest page the /author/{id}/papers endpoint returns
+AUTHOR_PAPERS_PAGE_SIZE = 1000
+
+# SEMANTIC_SCHOLAR_RETRIEVAL selects how papers are found:
+#   "author" (default): resolve the author ID and fetch all of the author's papers
+#   "search": keyword search for author:"<name>" (one page of at most 100 papers)
+
+# SEMANTIC_SCHOLAR_OUTPUT selects the tool's output format:
+#   "compact" (default): JSON with each paper once, referenced by ID from both lists,
+#                        using the short keys below (they map onto the Paper model)
+#   "markdown": a markdown block per paper in each list
+# SEMANTIC_SCHOLAR_OUTPUT_BUDGET caps the compact output in characters (~4 per token)
+COMPACT_KEYS = {"t": "title", "j": "journal", "y": "year", "u": "url", "c": "citations", "a": "authors"}
+COMPACT_MAX_AUTHORS = 5
+DEFAULT_OUTPUT_BUDGET = 6000
+
+
+def _paper_url(paper: dict) -> str:
+    """Semantic Scholar URL of a paper (built from paperId when the url field was not requested)."""
+    return paper.get('url') or (f"https://www.semanticscholar.org/paper/{paper['paperId']}" if paper.get('paperId') else '')
 
 
 def _format_paper(paper: dict, index: int) -> str:
@@ -16,7 +64,7 @@ def _format_paper(paper: dict, index: int) -> str:
     title = paper.get('title', 'Unknown Title')
     year = paper.get('year', 'Unknown Year')
     venue = paper.get('venue', 'Unknown Venue')
-    url = paper.get('url', '')
+    url = _paper_url(paper)
     citation_count = paper.get('citationCount', 0)
     
     # Format authors
@@ -42,43 +90,194 @@ def _format_paper(paper: dict, index: int) -> str:
     return paper_entry
 
 
-def _fetch_papers_from_semantic_scholar(author_name: str, limit: int = 100) -> list:
-    """Helper function to fetch papers from Semantic Scholar API."""
-    try:
-        # Semantic Scholar API endpoint for paper search
-        base_url = "https://api.semanticscholar.org/graph/v1/paper/search"
-        
-        # Build query - search for papers by author name
-        query = f'author:"{author_name}"'
-        
-        # Prepare headers
-        headers = {}
-        if SEMANTIC_SCHOLAR_API_KEY:
-            headers["x-api-key"] = SEMANTIC_SCHOLAR_API_KEY
-        
-        # Parameters for the API request
-        params = {
-            "query": query,
-            "limit": min(limit, 100),  # API limit is 100
-            "fields": "title,authors,year,venue,url,citationCount,abstract"
-        }
+def _paper_search_params(author_name: str, limit: int) -> dict:
+    """Query parameters for a paper search by author name."""
+    return {
+        "query": f'author:"{author_name}"',
+        "limit": min(limit, 100),  # API limit is 100
+        "fields": PAPER_FIELDS
+    }
+
+
+async def _fetch_papers_from_semantic_scholar_async(author_name: str, limit: int = 100) -> list:
+    """Fetch papers from the Semantic Scholar keyword search (does not block the event loop)."""
+    data = await semantic_scholar.aget("/paper/search", params=_paper_search_params(author_name, limit))
+    return data.get('data', [])
+
+
+async def _resolve_author_async(author_name: str) -> dict:
+    """Find the Semantic Scholar author for a name.
+    
+    Authors whose name matches exactly are preferred, and among homonyms the profile
+    with the most papers wins. Otherwise the best-ranked search result is used.
+    
+    Returns:
+        Author dictionary (authorId, name, paperCount, citationCount), or None
+    """
+    data = await semantic_scholar.aget("/author/search", params={
+        "query": author_name, "fields": AUTHOR_FIELDS, "limit": 10
+    })
+    candidates = data.get('data', [])
+    if not candidates:
+        return None
+    
+    wanted = _normalize_name(author_name)
+    exact = [a for a in candidates if _normalize_name(a.get('name', '')) == wanted]
+    if exact:
+        return max(exact, key=lambda a: a.get('paperCount') or 0)
+    return candidates[0]
+
+
+async def _fetch_author_papers_async(author_id: str, paper_count: int = None) -> list:
+    """Fetch every paper of an author, requesting all pages concurrently.
+    
+    Args:
+        author_id: Semantic Scholar author ID
+        paper_count: The author's paperCount (from author search), used to plan the pages
+    
+    Returns:
+        List of paper dictionaries (deduplicated by paperId)
+    """
+    path = f"/author/{author_id}/papers"
+    
+    def page(offset: int):
+        return semantic_scholar.aget(path, params={
+            "fields": PAPER_FIELDS, "limit": AUTHOR_PAPERS_PAGE_SIZE, "offset": offset
+        })
+    
+    offsets = range(0, max(paper_count or 0, 1), AUTHOR_PAPERS_PAGE_SIZE)
+    pages = list(await asyncio.gather(*(page(offset) for offset in offsets)))
+    
+    # paperCount can lag behind the paper list; follow `next` for anything beyond it
+    while pages[-1].get('next') is not None and pages[-1].get('data'):
+        pages.append(await page(pages[-1]['next']))
+    
+    papers = {}
+    for data in pages:
+        for paper in data.get('data', []):
+            papers.setdefault(paper.get('paperId') or id(paper), paper)
+    return list(papers.values())
+
+
+def _push_top(heap: list, limit: int, entry: tuple):
+    """Keep the `limit` largest entries in a min-heap."""
+    if len(heap) < limit:
+        heapq.heappush(heap, entry)
+    elif entry > heap[0]:
+        heapq.heapreplace(heap, entry)
+
+
+def _select_top_papers(papers: list, recent_limit: int, most_cited_limit: int) -> tuple:
+    """Pick the most recent and the most cited papers in a single pass.
+    
+    Returns:
+        Tuple of (most recent papers, most cited papers), each sorted best first
+    """
+    recent, cited = [], []
+    for i, paper in enumerate(papers):
+        citations = paper.get('citationCount')
+        # -i breaks ties in favour of earlier papers, so dicts are never compared
+        if paper.get('year') and recent_limit > 0:
+            _push_top(recent, recent_limit, (paper['year'], citations or 0, -i, paper))
+        if citations is not None and most_cited_limit > 0:
+            _push_top(cited, most_cited_limit, (citations, -i, paper))
+    
+    return ([entry[-1] for entry in sorted(recent, reverse=True)],
+            [entry[-1] for entry in sorted(cited, reverse=True)])
+
+
+def _markdown_output(author_name: str, source: str, recent_papers: list, most_cited_papers: list,
+                     recent_limit: int, most_cited_limit: int) -> str:
+    """Format both paper lists as markdown sections."""
+    result_parts = []
+    
+    # Most Recent Papers section
+    if recent_papers:
+        result_parts.append(f"## Most Recent Papers (up to {recent_limit})\n")
+        for i, paper in enumerate(recent_papers, 1):
+            result_parts.append(_format_paper(paper, i))
+        result_parts.append("")  # Empty line between sections
+    else:
+        result_parts.append(f"## Most Recent Papers\nNo recent papers found.\n")
+    
+    # Most Cited Papers section
+    if most_cited_papers:
+        result_parts.append(f"## Most Cited Papers (up to {most_cited_limit})\n")
+        for i, paper in enumerate(most_cited_papers, 1):
+            result_parts.append(_format_paper(paper, i))
+    else:
+        result_parts.append(f"## Most Cited Papers\nNo papers with citations found.\n")
+    
+    header = f"Papers by '{author_name}' from {source}:\n\n"
+    return header + '\n'.join(result_parts)
+
+
+def _compact_record(paper: dict, max_authors: int) -> dict:
+    """One paper with the short COMPACT_KEYS (values already typed as in the Paper model)."""
+    names = [author.get('name') for author in paper.get('authors') or [] if author.get('name')]
+    authors = ', '.join(names[:max_authors])
+    if len(names) > max_authors:
+        authors += ', et al.'
+    return {
+        "t": paper.get('title') or 'Unknown Title',
+        "j": paper.get('venue') or '',
+        "y": paper.get('year') or 0,
+        "u": _paper_url(paper),
+        "c": paper.get('citationCount') or 0,
+        "a": authors or 'Unknown Authors',
+    }
+
+
+def _compact_output(author_name: str, source: str, recent_papers: list, most_cited_papers: list,
+                    budget: int = DEFAULT_OUTPUT_BUDGET) -> str:
+    """Format both paper lists as compact JSON within a character budget.
+    
+    Papers in both lists are stored once. If the JSON is over budget, author lists are
+    shortened first, then the lowest-ranked papers of the longer list are dropped (the
+    number dropped is reported as "omitted").
+    """
+    recent, cited = list(recent_papers), list(most_cited_papers)
+    max_authors = COMPACT_MAX_AUTHORS
+    omitted = 0
+    
+    while True:
+        ids, records = {}, {}
         
-        # Make API request
-        response = requests.get(base_url, params=params, headers=headers, timeout=10)
-        response.raise_for_status()
+        def ref(paper: dict) -> int:
+            key = paper.get('paperId') or id(paper)
+            if key not in ids:
+                ids[key] = len(ids) + 1
+                records[str(ids[key])] = _compact_record(paper, max_authors)
+            return ids[key]
         
-        data = response.json()
-        papers = data.get('data', [])
+        most_recent = [ref(paper) for paper in recent]
+        most_cited = [ref(paper) for paper in cited]
+        output = {"author": author_name, "source": source, "keys": COMPACT_KEYS, "papers": records,
+                  "most_recent": most_recent, "most_cited": most_cited}
+        if omitted:
+            output["omitted"] = omitted
+        text = json.dumps(output, ensure_ascii=False, separators=(',', ':'))
         
-        return papers
-    
-    except requests.exceptions.RequestException as e:
-        raise Exception(f"Error accessing Semantic Scholar API: {str(e)}")
-    except Exception as e:
-        raise Exception(f"Error searching Semantic Scholar: {str(e)}")
+        if len(text) <= budget or not (recent or cited):
+            return text
+        if max_authors > 1:
+            max_authors = max(1, max_authors - 2)
+        else:
+            (recent if len(recent) >= len(cited) else cited).pop()
+            omitted += 1
+
 
+def _output(author_name: str, source: str, recent_papers: list, most_cited_papers: list,
+            recent_limit: int, most_cited_limit: int) -> str:
+    """Format both paper lists as selected by SEMANTIC_SCHOLAR_OUTPUT."""
+    if os.getenv("SEMANTIC_SCHOLAR_OUTPUT", "compact") == "markdown":
+        return _markdown_output(author_name, source, recent_papers, most_cited_papers,
+                                recent_limit, most_cited_limit)
+    budget = int(os.getenv("SEMANTIC_SCHOLAR_OUTPUT_BUDGET", DEFAULT_OUTPUT_BUDGET))
+    return _compact_output(author_name, source, recent_papers, most_cited_papers, budget)
 
-def get_semantic_scholar_papers(author_name: str, recent_limit: int, most_cited_limit: int) -> str:
+
+async def get_semantic_scholar_papers(author_name: str, recent_limit: int, most_cited_limit: int) -> str:
     """Get both recent and most cited papers from Semantic Scholar for an author.
     
     This function searches Semantic Scholar's database for papers authored by the given person
@@ -90,11 +289,15 @@ def get_semantic_scholar_papers(author_name: str, recent_limit: int, most_cited_
         most_cited_limit: Maximum number of most cited papers to return (typically 10)
     
     Returns:
-        A formatted string containing two sections:
-        1. Most Recent Papers (up to recent_limit)
-        2. Most Cited Papers (up to most_cited_limit)
+        Compact JSON (default) with the keys:
+        - "keys": legend of the short paper keys (t=title, j=journal, y=year, u=url,
+          c=citations, a=authors)
+        - "papers": each paper once, by ID
+        - "most_recent": IDs of the most recent papers (up to recent_limit)
+        - "most_cited": IDs of the most cited papers (up to most_cited_limit)
         
-        Each paper includes: Title, Authors, Journal/Venue, Year, URL, Citation Count
+        With SEMANTIC_SCHOLAR_OUTPUT=markdown, two markdown sections (Most Recent Papers,
+        Most Cited Papers) with Title, Authors, Journal/Venue, Year, URL, Citation Count.
         
         Returns an error message if there's an error accessing the API.
     
@@ -102,53 +305,37 @@ def get_semantic_scholar_papers(author_name: str, recent_limit: int, most_cited_
         get_semantic_scholar_papers("Pouria Rouzrokh", 10, 10)
     """
     try:
-        # Fetch all papers (we'll need enough to get both recent and most cited)
-        max_papers_needed = max(recent_limit, most_cited_limit) * 2  # Get extra to ensure we have enough
-        papers = _fetch_papers_from_semantic_scholar(author_name, limit=min(max_papers_needed, 100))
+        mode = os.getenv("SEMANTIC_SCHOLAR_RETRIEVAL", "author")
+        indexed = publication_index.find_author(author_name) if mode == "author" and publication_index else None
         
-        if not papers:
-            return f"No papers found for author '{author_name}' in Semantic Scholar database."
-        
-        # Filter papers with year (for recent sorting)
-        papers_with_year = [p for p in papers if p.get('year')]
-        
-        # Get most recent papers (sorted by year, descending)
-        recent_papers = sorted(papers_with_year, key=lambda x: x.get('year', 0) or 0, reverse=True)[:recent_limit]
-        
-        # Get most cited papers (sorted by citation count, descending)
-        # Include papers with citationCount >= 0 (some might be None)
-        papers_with_citations = [p for p in papers if p.get('citationCount', 0) is not None]
-        most_cited_papers = sorted(
-            papers_with_citations, 
-            key=lambda x: x.get('citationCount', 0) or 0, 
-            reverse=True
-        )[:most_cited_limit]
+        if indexed is not None and indexed['fresh']:
+            # Fetched recently (possibly for another profile): answer locally
+            recent_papers = publication_index.recent(indexed['authorId'], recent_limit)
+            most_cited_papers = publication_index.most_cited(indexed['authorId'], most_cited_limit)
+            source = f"local publication index (author ID {indexed['authorId']}, {indexed['paperCount']} papers)"
+            return _output(author_name, source, recent_papers, most_cited_papers, recent_limit, most_cited_limit)
         
-        # Remove duplicates (if a paper is both recent and most cited, include it in both lists)
-        # But we'll keep them separate as requested
+        # A stale indexed author is refreshed by ID, without searching for the name again
+        author = indexed or (await _resolve_author_async(author_name) if mode == "author" else None)
         
-        # Format results
-        result_parts = []
-        
-        # Most Recent Papers section
-        if recent_papers:
-            result_parts.append(f"## Most Recent Papers (up to {recent_limit})\n")
-            for i, paper in enumerate(recent_papers, 1):
-                result_parts.append(_format_paper(paper, i))
-            result_parts.append("")  # Empty line between sections
+        if author is not None:
+            # All of the author's papers, so both lists are exact
+            papers = await _fetch_author_papers_async(author['authorId'], author.get('paperCount'))
+            source = f"Semantic Scholar (author ID {author['authorId']}, {len(papers)} papers)"
+            if publication_index is not None and papers:
+                # Keyed by Semantic Scholar's spelling, with the requested name as an alias
+                publication_index.store_author_papers(author, papers, aliases=(author_name,))
         else:
-            result_parts.append(f"## Most Recent Papers\nNo recent papers found.\n")
+            # Keyword search: one relevance-ranked page of at most 100 papers
+            max_papers_needed = max(recent_limit, most_cited_limit) * 2  # Get extra to ensure we have enough
+            papers = await _fetch_papers_from_semantic_scholar_async(author_name, limit=min(max_papers_needed, 100))
+            source = "Semantic Scholar"
         
-        # Most Cited Papers section
-        if most_cited_papers:
-            result_parts.append(f"## Most Cited Papers (up to {most_cited_limit})\n")
-            for i, paper in enumerate(most_cited_papers, 1):
-                result_parts.append(_format_paper(paper, i))
-        else:
-            result_parts.append(f"## Most Cited Papers\nNo papers with citations found.\n")
+        if not papers:
+            return f"No papers found for author '{author_name}' in Semantic Scholar database."
         
-        header = f"Papers by '{author_name}' from Semantic Scholar:\n\n"
-        return header + '\n'.join(result_parts)
+        recent_papers, most_cited_papers = _select_top_papers(papers, recent_limit, most_cited_limit)
+        return _output(author_name, source, recent_papers, most_cited_papers, recent_limit, most_cited_limit)
     
     except Exception as e:
         return f"Error: {str(e)}"
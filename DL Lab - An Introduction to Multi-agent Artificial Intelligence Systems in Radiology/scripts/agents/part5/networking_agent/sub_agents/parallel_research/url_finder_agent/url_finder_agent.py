@@ -2,6 +2,8 @@
 
 from google.adk.agents import LlmAgent
 from google.adk.tools import google_search
+from ....checkpoints import STAGE_OUTPUT_KEYS, restore_checkpoint
+from ....stage_results import store_stage_result
 
 # Define the URL finder agent - Simple Google Search agent
 url_finder_agent = LlmAgent(
@@ -45,7 +47,10 @@ url_finder_agent = LlmAgent(
         "   - url: The direct URL (must be original, not redirected)\n"
         "   - description: Brief description of what the page is\n"
         "   - platform: The platform or website name (e.g., \"LinkedIn\", \"Twitter\", \"ResearchGate\", institution name)\n\n"
-        "7. Organize URLs by category and prioritize official and verified sources.\n\n"
+        "7. Organize URLs by category and prioritize official and verified sources, most important first.\n\n"
+        "8. Return the URLs as a JSON array of objects with exactly these keys, and no other text:\n"
+        "   [{\"category\": \"Social Media\", \"url\": \"https://www.linkedin.com/in/...\", "
+        "\"description\": \"LinkedIn profile\", \"platform\": \"LinkedIn\"}]\n\n"
         "IMPORTANT: Do NOT return the conversation to the user. Pass your findings to the next agent in the workflow. "
         "Your output will be used by the formatter agent to create the final profile."
     ),
@@ -54,5 +59,7 @@ url_finder_agent = LlmAgent(
         "about radiologists using Google Search."
     ),
     tools=[google_search],
+    output_key=STAGE_OUTPUT_KEYS["url_finder_agent"],
+    before_agent_callback=restore_checkpoint,  # Skip the stage if it already finished
+    after_agent_callback=store_stage_result,  # Deduplicated URL list for the formatter
 )
-
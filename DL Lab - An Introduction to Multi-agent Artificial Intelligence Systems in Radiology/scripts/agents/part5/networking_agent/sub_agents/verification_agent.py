@@ -2,6 +2,8 @@
 
 from google.adk.agents import LlmAgent
 from google.adk.tools import google_search
+from ..checkpoints import STAGE_OUTPUT_KEYS, restore_checkpoint
+from ..stage_results import store_stage_result
 
 # Define the verification agent - Step 1: Verify if person is a radiologist and get background
 verification_agent = LlmAgent(
@@ -37,5 +39,7 @@ verification_agent = LlmAgent(
         "using Google Search."
     ),
     tools=[google_search],
+    output_key=STAGE_OUTPUT_KEYS["radiologist_verification_agent"],
+    before_agent_callback=restore_checkpoint,  # Skip the stage if it already finished
+    after_agent_callback=store_stage_result,  # Bounded background for the formatter
 )
-
@@ -1,2 +1,10 @@
-from . import agent
+# The agent tree is imported on first access to `agent` (ADK looks it up as
+# radiology_researcher.agent), so lightweight modules such as fetch_cache can be
+# imported without building the sub-agents.
 
+
+def __getattr__(name):
+    if name == "agent":
+        from . import agent
+        return agent
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -9,8 +9,18 @@ with MCP tools in a single agent.
 """
 
 from google.adk.agents import SequentialAgent
+from google.adk.agents.callback_context import CallbackContext
+from . import tools
 from .sub_agents import search_agent, processing_agent
 
+
+def warm_up_fetch_pool(callback_context: CallbackContext):
+    """before_agent_callback: start the pooled fetch servers while the search agent runs."""
+    if tools.fetch_pool is not None:
+        tools.fetch_pool.warm_up()
+    return None
+
+
 # Create sequential workflow: Search first, then process
 root_agent = SequentialAgent(
     name="radiology_researcher",
@@ -20,5 +30,6 @@ root_agent = SequentialAgent(
         "Focuses on authoritative radiology guidelines and clinical recommendations."
     ),
     sub_agents=[search_agent, processing_agent],
+    before_agent_callback=warm_up_fetch_pool,
 )
 
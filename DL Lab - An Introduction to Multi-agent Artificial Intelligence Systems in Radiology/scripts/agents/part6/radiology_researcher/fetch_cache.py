@@ -0,0 +1,57 @@
+"""Response cache for the processing agent's MCP `fetch` tool.
+
+The same guideline URLs are fetched on every run. These tool callbacks keep each
+successful `fetch` result in the on-disk response cache shared with part 5
+(agents/response_cache.py), keyed by the URL and the fetch arguments, and answer
+repeat calls from it without starting a request. The MCP server does not expose HTTP
+validators, so entries simply expire after the "fetch" TTL. Set RESPONSE_CACHE=off to disable.
+"""
+
+import json
+import sys
+from pathlib import Path
+from typing import Optional
+
+try:
+    from ...response_cache import open_response_cache
+except ImportError:
+    # `adk run agents/part6/radiology_researcher` imports radiology_researcher as a
+    # top-level package, so the shared module is imported from the agents directory instead
+    sys.path.append(str(Path(__file__).parents[2]))
+    from response_cache import open_response_cache
+
+CACHE_SOURCE = "fetch"
+FETCH_TOOL_NAME = "fetch"
+
+response_cache = open_response_cache()
+
+
+def _fetch_key(args: dict) -> tuple:
+    """URL and the arguments that change the fetched content."""
+    params = {name: args.get(name) for name in ("max_length", "start_index", "raw")}
+    return str(args.get("url", "")), params
+
+
+def use_cached_fetch(tool, args: dict, tool_context) -> Optional[dict]:
+    """before_tool_callback: return a cached fetch result instead of calling the tool."""
+    if response_cache is None or tool.name != FETCH_TOOL_NAME or not args.get("url"):
+        return None
+    url, params = _fetch_key(args)
+    cached = response_cache.get(CACHE_SOURCE, url, params)
+    if cached is None or not cached["fresh"]:
+        return None
+    return json.loads(cached["body"])
+
+
+def store_fetch_result(tool, args: dict, tool_context, tool_response) -> Optional[dict]:
+    """after_tool_callback: cache successful fetch results (errors are never cached)."""
+    if response_cache is None or tool.name != FETCH_TOOL_NAME or not args.get("url"):
+        return None
+    if not isinstance(tool_response, dict):
+        # Plain function tools return their value as is; ADK sends it as {"result": ...}
+        tool_response = {"result": tool_response}
+    if tool_response.get("isError") or "error" in tool_response:
+        return None
+    url, params = _fetch_key(args)
+    response_cache.put(CACHE_SOURCE, url, json.dumps(tool_response), params)
+    return None
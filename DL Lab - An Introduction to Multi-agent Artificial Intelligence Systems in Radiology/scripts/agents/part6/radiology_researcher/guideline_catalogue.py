@@ -0,0 +1,396 @@
+"""Catalogue of guidelines found across runs.
+
+create_guidelines_csv used to overwrite one CSV per call, losing earlier runs and
+repeating guidelines found twice. The catalogue keeps every guideline in a small
+SQLite database instead:
+
+- Guidelines are upserted by canonical URL (scheme, "www.", trailing slashes,
+  fragments and tracking parameters do not create duplicates); new non-empty
+  values update the stored record, empty ones never erase it
+- Input is parsed one object at a time (a JSON array, or objects one after the
+  other as in JSON Lines), from a string or in chunks from a file, so memory per
+  call does not grow with the input
+- Records are stored as JSON, and the column list grows when new keys appear
+  (schema evolution without table migrations)
+- CSV and Parquet exports stream rows from the database; the agent's tool exports
+  only the guidelines of each call, the CLI below the whole catalogue
+
+Environment variables:
+    GUIDELINE_CATALOGUE_DB   database file (default: guideline_catalogue.db next to this file)
+
+Use it from the command line (from the lab directory):
+    python -m scripts.agents.part6.radiology_researcher.guideline_catalogue stats
+    python -m scripts.agents.part6.radiology_researcher.guideline_catalogue add guidelines.json
+    python -m scripts.agents.part6.radiology_researcher.guideline_catalogue export catalogue.parquet --format parquet
+"""
+
+import argparse
+import csv
+import json
+import os
+import sqlite3
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterable, Iterator
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+DEFAULT_CATALOGUE_DB = Path(__file__).parent / "guideline_catalogue.db"
+
+# Export column order: these first, then other keys in the order they first appeared
+PREFERRED_COLUMNS = ["title", "organization", "year", "website", "url", "description"]
+TRACKING_PARAMETERS = ("utm_", "gclid", "fbclid", "mc_cid", "mc_eid", "_ga")
+
+READ_CHUNK_CHARS = 64 * 1024
+EXPORT_BATCH_ROWS = 1000
+# Canonical URLs per "IN (...)" query (below SQLite's limit on query parameters)
+SELECT_BATCH_KEYS = 500
+
+
+def canonical_url(url: str) -> str:
+    """Canonical form of a guideline URL (the catalogue key).
+
+    The scheme is dropped, the host is lower-cased without "www." or default ports,
+    trailing slashes, fragments and tracking parameters are removed and the
+    remaining query parameters are sorted.
+    """
+    parts = urlsplit(url.strip())
+    if not parts.netloc and "://" not in url:
+        parts = urlsplit("//" + url.strip())
+    host = (parts.hostname or "").lower()
+    host = host[4:] if host.startswith("www.") else host
+    if parts.port and parts.port not in (80, 443):
+        host = f"{host}:{parts.port}"
+    query = [(key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+             if not key.lower().startswith(TRACKING_PARAMETERS)]
+    return urlunsplit(("", host, parts.path.rstrip("/"), urlencode(sorted(query)), "")).lstrip("/")
+
+
+def iter_json_objects(chunks: Iterable[str]) -> Iterator:
+    """Parse JSON values one at a time from text chunks.
+
+    Accepts a top-level JSON array (its items are yielded) or values that simply
+    follow each other (JSON Lines). Only the value being parsed is kept in memory.
+
+    Raises:
+        json.JSONDecodeError: If the input is not valid JSON
+    """
+    decoder = json.JSONDecoder()
+    chunks = iter(chunks)
+    buffer, position, exhausted = "", 0, False
+    in_array = None
+
+    def fill() -> bool:
+        nonlocal buffer, position, exhausted
+        chunk = next(chunks, None)
+        if chunk is None:
+            exhausted = True
+            return False
+        buffer = buffer[position:] + chunk
+        position = 0
+        return True
+
+    while True:
+        # Skip whitespace and the array's punctuation
+        while True:
+            while position < len(buffer) and (buffer[position].isspace() or (in_array and buffer[position] == ",")):
+                position += 1
+            if position < len(buffer) or not fill():
+                break
+        if position >= len(buffer):
+            if in_array:
+                raise json.JSONDecodeError("Unterminated array", buffer, position)
+            return
+        if in_array is None:
+            in_array = buffer[position] == "["
+            if in_array:
+                position += 1
+                continue
+        if in_array and buffer[position] == "]":
+            return
+
+        while True:
+            try:
+                value, end = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                # The value may continue in the next chunk
+                if exhausted or not fill():
+                    raise
+                continue
+            # A number or literal may continue in the next chunk ("3." + "14"): it is
+            # complete only once a delimiter follows it
+            if (not isinstance(value, (str, list, dict)) and not exhausted
+                    and (end == len(buffer) or not (buffer[end].isspace() or buffer[end] in ",]}"))
+                    and fill()):
+                continue
+            break
+        position = end
+        yield value
+
+
+def iter_file_chunks(path: Path, size: int = READ_CHUNK_CHARS) -> Iterator[str]:
+    """Read a text file in chunks."""
+    with open(path, encoding="utf-8") as f:
+        while True:
+            chunk = f.read(size)
+            if not chunk:
+                return
+            yield chunk
+
+
+def _cell(value) -> str:
+    """Flatten a value for CSV / Parquet (lists and dicts as JSON, None as "")."""
+    if value is None:
+        return ""
+    if isinstance(value, (list, dict)):
+        return json.dumps(value, ensure_ascii=False)
+    return str(value)
+
+
+class GuidelineCatalogue:
+    """SQLite store of guideline records, keyed by canonical URL.
+
+    The database file is only created when the catalogue is first used.
+    """
+
+    def __init__(self, db_path: Path = None):
+        """Configure the catalogue.
+
+        Args:
+            db_path: SQLite database file (default: GUIDELINE_CATALOGUE_DB or guideline_catalogue.db next to this file)
+        """
+        self.db_path = Path(db_path or os.getenv("GUIDELINE_CATALOGUE_DB") or DEFAULT_CATALOGUE_DB)
+        self._ready = False
+
+    @contextmanager
+    def _connect(self):
+        """Open a connection that commits on success and is always closed."""
+        if not self._ready:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            with conn:
+                if not self._ready:
+                    conn.executescript(
+                        "CREATE TABLE IF NOT EXISTS guidelines ("
+                        "  canonical_url TEXT PRIMARY KEY,"
+                        "  record TEXT NOT NULL,"
+                        "  first_seen REAL NOT NULL,"
+                        "  last_seen REAL NOT NULL,"
+                        "  times_seen INTEGER NOT NULL DEFAULT 1"
+                        ");"
+                        "CREATE TABLE IF NOT EXISTS columns ("
+                        "  name TEXT PRIMARY KEY,"
+                        "  position INTEGER NOT NULL"
+                        ");"
+                    )
+                    self._ready = True
+                yield conn
+        finally:
+            conn.close()
+
+    def upsert(self, records: Iterable) -> dict:
+        """Add or update guideline records.
+
+        Args:
+            records: Guideline dictionaries (any iterable, e.g. from iter_json_objects);
+                records without a url are counted as skipped
+
+        Returns:
+            Counts of added, updated and skipped records
+        """
+        counts = {"added": 0, "updated": 0, "skipped": 0}
+        now = time.time()
+        with self._connect() as conn:
+            known_columns = {row[0] for row in conn.execute("SELECT name FROM columns")}
+            for record in records:
+                if not isinstance(record, dict) or not str(record.get("url") or "").strip():
+                    counts["skipped"] += 1
+                    continue
+                key = canonical_url(str(record["url"]))
+
+                new_columns = [column for column in record if column not in known_columns]
+                if new_columns:
+                    # Schema evolution: new keys become new columns at the end
+                    conn.executemany(
+                        "INSERT OR IGNORE INTO columns (name, position) "
+                        "VALUES (?, (SELECT COALESCE(MAX(position), -1) + 1 FROM columns))",
+                        [(column,) for column in new_columns]
+                    )
+                    known_columns.update(new_columns)
+
+                row = conn.execute("SELECT record FROM guidelines WHERE canonical_url = ?", (key,)).fetchone()
+                if row is None:
+                    conn.execute(
+                        "INSERT INTO guidelines (canonical_url, record, first_seen, last_seen) VALUES (?, ?, ?, ?)",
+                        (key, json.dumps(record, ensure_ascii=False), now, now)
+                    )
+                    counts["added"] += 1
+                else:
+                    merged = json.loads(row[0])
+                    merged.update({k: v for k, v in record.items() if v not in (None, "", [], {})})
+                    conn.execute(
+                        "UPDATE guidelines SET record = ?, last_seen = ?, times_seen = times_seen + 1 "
+                        "WHERE canonical_url = ?",
+                        (json.dumps(merged, ensure_ascii=False), now, key)
+                    )
+                    counts["updated"] += 1
+        return counts
+
+    def columns(self) -> list:
+        """Export columns: the preferred ones that were seen, then the rest in order of appearance."""
+        with self._connect() as conn:
+            seen = [row[0] for row in conn.execute("SELECT name FROM columns ORDER BY position")]
+        return [c for c in PREFERRED_COLUMNS if c in seen] + [c for c in seen if c not in PREFERRED_COLUMNS]
+
+    @staticmethod
+    def _row(record: str, first_seen: float, last_seen: float) -> dict:
+        row = json.loads(record)
+        row["first_seen"] = time.strftime("%Y-%m-%d", time.localtime(first_seen))
+        row["last_seen"] = time.strftime("%Y-%m-%d", time.localtime(last_seen))
+        return row
+
+    def iter_rows(self, urls: Iterable[str] = None) -> Iterator[dict]:
+        """Records (plus first_seen / last_seen dates), read in batches.
+
+        Args:
+            urls: Only the guidelines with these URLs, in this order (default: every
+                guideline, oldest first)
+        """
+        if urls is not None:
+            keys = list(dict.fromkeys(canonical_url(url) for url in urls))
+            for start in range(0, len(keys), SELECT_BATCH_KEYS):
+                batch = keys[start:start + SELECT_BATCH_KEYS]
+                with self._connect() as conn:
+                    found = {row[0]: row[1:] for row in conn.execute(
+                        "SELECT canonical_url, record, first_seen, last_seen FROM guidelines "
+                        f"WHERE canonical_url IN ({', '.join('?' * len(batch))})", batch
+                    )}
+                for key in batch:
+                    if key in found:
+                        yield self._row(*found[key])
+            return
+
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "SELECT record, first_seen, last_seen FROM guidelines ORDER BY first_seen, canonical_url"
+            )
+            while True:
+                rows = cursor.fetchmany(EXPORT_BATCH_ROWS)
+                if not rows:
+                    return
+                for row in rows:
+                    yield self._row(*row)
+
+    def _export_rows(self, urls: Iterable[str] = None) -> tuple:
+        """Columns and rows to export: the whole catalogue (streamed) or the given guidelines."""
+        if urls is None:
+            return self.columns() + ["first_seen", "last_seen"], self.iter_rows()
+        # A selection only gets the columns its own records use
+        rows = list(self.iter_rows(urls))
+        used = set().union(*rows)
+        return [column for column in self.columns() if column in used] + ["first_seen", "last_seen"], rows
+
+    def export_csv(self, path: Path, urls: Iterable[str] = None) -> int:
+        """Write the catalogue (or the guidelines with the given URLs) to a CSV file.
+
+        Returns:
+            The number of rows
+        """
+        columns, rows = self._export_rows(urls)
+        count = 0
+        with open(path, "w", newline="", encoding="utf-8") as csvfile:
+            writer = csv.DictWriter(csvfile, fieldnames=columns, extrasaction="ignore")
+            writer.writeheader()
+            for row in rows:
+                writer.writerow({column: _cell(row.get(column)) for column in columns})
+                count += 1
+        return count
+
+    def export_parquet(self, path: Path, urls: Iterable[str] = None) -> int:
+        """Write the catalogue (or the guidelines with the given URLs) to a Parquet file.
+
+        All columns are strings.
+
+        Returns:
+            The number of rows
+
+        Raises:
+            ImportError: If pyarrow is not installed
+        """
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ImportError("Parquet export needs pyarrow: pip install pyarrow") from e
+
+        columns, rows = self._export_rows(urls)
+        schema = pa.schema([(column, pa.string()) for column in columns])
+        count = 0
+        with pq.ParquetWriter(path, schema) as writer:
+            batch = []
+            for row in rows:
+                batch.append(row)
+                if len(batch) == EXPORT_BATCH_ROWS:
+                    writer.write_table(self._parquet_table(pa, schema, columns, batch))
+                    count += len(batch)
+                    batch = []
+            if batch or count == 0:
+                writer.write_table(self._parquet_table(pa, schema, columns, batch))
+                count += len(batch)
+        return count
+
+    @staticmethod
+    def _parquet_table(pa, schema, columns: list, rows: list):
+        return pa.Table.from_pydict({column: [_cell(row.get(column)) for row in rows] for column in columns},
+                                    schema=schema)
+
+    def export(self, path: Path, format: str = None, urls: Iterable[str] = None) -> int:
+        """Export to CSV or Parquet (chosen by `format`, or by the file extension).
+
+        Args:
+            path: Output file
+            format: "csv" or "parquet" (default: from the file extension)
+            urls: Only export the guidelines with these URLs (default: the whole catalogue)
+        """
+        path = Path(path)
+        format = format or ("parquet" if path.suffix.lower() in (".parquet", ".pq") else "csv")
+        return self.export_parquet(path, urls) if format == "parquet" else self.export_csv(path, urls)
+
+    def summary(self) -> dict:
+        """Number of guidelines, columns and guidelines seen in more than one run."""
+        with self._connect() as conn:
+            guidelines, repeated = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(times_seen > 1), 0) FROM guidelines"
+            ).fetchone()
+        return {"guidelines": guidelines, "seen_more_than_once": repeated, "columns": self.columns()}
+
+
+def main():
+    """Add to, inspect or export the guideline catalogue."""
+    parser = argparse.ArgumentParser(description="Add to, inspect or export the guideline catalogue.")
+    parser.add_argument("--db", type=Path, help="Catalogue database (default: GUIDELINE_CATALOGUE_DB or guideline_catalogue.db)")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("stats", help="Number of guidelines and columns")
+    add_parser = commands.add_parser("add", help="Upsert guidelines from a JSON array or JSON Lines file")
+    add_parser.add_argument("input", type=Path)
+    export_parser = commands.add_parser("export", help="Export to CSV or Parquet")
+    export_parser.add_argument("output", type=Path)
+    export_parser.add_argument("--format", choices=["csv", "parquet"], help="Default: from the file extension")
+    args = parser.parse_args()
+
+    catalogue = GuidelineCatalogue(args.db)
+    if args.command == "stats":
+        print(f"Guideline catalogue: {catalogue.db_path}")
+        for key, value in catalogue.summary().items():
+            print(f"  {key:20} {value}")
+    elif args.command == "add":
+        counts = catalogue.upsert(iter_json_objects(iter_file_chunks(args.input)))
+        print(f"Added {counts['added']}, updated {counts['updated']}, skipped {counts['skipped']}")
+    else:
+        rows = catalogue.export(args.output, args.format)
+        print(f"Exported {rows} guidelines to {args.output.absolute()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,332 @@
+"""Pool of warm MCP stdio servers shared by concurrent agent runs.
+
+`McpToolset` with `StdioConnectionParams` starts a fresh server subprocess (for the
+fetch server: `uvx mcp-server-fetch`, which first resolves the package) for every
+agent session, so each run pays the cold start before its first call. The pool
+starts N servers once per event loop, keeps their sessions open and hands a free
+one to each tool call:
+
+- Servers are started in the background by `warm_up()` (e.g. while the search agent
+  is still running) or on the first call
+- Idle servers are pinged every HEALTH_CHECK_SECONDS; servers that crash, stop
+  answering pings or time out on a call are restarted with exponential backoff,
+  and the failed call is retried once on another server
+- Tool errors reported by the server (e.g. a page that cannot be fetched) are
+  returned as results and do not restart anything
+- `metrics()` reports starts, restarts, health checks, call counts and the
+  latency of server start-up, of waiting for a free server and of the calls
+
+Measure it from the command line (from the lab directory; needs uvx):
+    python -m scripts.agents.part6.radiology_researcher.mcp_pool --size 2 --calls 10
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import sys
+import time
+from collections import deque
+from typing import TextIO
+import anyio
+from mcp import ClientSession, StdioServerParameters
+from mcp.client.stdio import stdio_client
+
+try:
+    from mcp.shared.exceptions import McpError
+except ImportError:  # Renamed in mcp 2.x
+    from mcp.shared.exceptions import MCPError as McpError
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_POOL_SIZE = 2
+STARTUP_TIMEOUT_SECONDS = 60.0
+CALL_TIMEOUT_SECONDS = 60.0
+HEALTH_CHECK_SECONDS = 30.0
+PING_TIMEOUT_SECONDS = 5.0
+MAX_RESTART_BACKOFF_SECONDS = 30.0
+LATENCY_SAMPLES = 1000
+
+# JSON-RPC error code the MCP client raises when the server's connection is gone
+CONNECTION_CLOSED = -32000
+
+
+class McpPoolError(Exception):
+    """Raised when no server could run a tool call."""
+
+
+def _percentiles(values) -> dict:
+    """p50 / p95 / max of a latency sample, in seconds."""
+    if not values:
+        return {"p50": None, "p95": None, "max": None}
+    ordered = sorted(values)
+
+    def pick(pct: float) -> float:
+        return round(ordered[min(len(ordered) - 1, round(pct / 100 * (len(ordered) - 1)))], 3)
+    return {"p50": pick(50), "p95": pick(95), "max": round(ordered[-1], 3)}
+
+
+class _Server:
+    """One slot of the pool; `generation` changes every time its server is replaced."""
+
+    def __init__(self, index: int):
+        self.index = index
+        self.session = None
+        self.generation = 0
+        self.busy = False
+        self.ready = asyncio.Event()
+        self.restart = asyncio.Event()
+
+
+class McpServerPool:
+    """N warm MCP stdio servers, handed out one tool call at a time."""
+
+    def __init__(self, server_params: StdioServerParameters, size: int = DEFAULT_POOL_SIZE,
+                 call_timeout: float = CALL_TIMEOUT_SECONDS, startup_timeout: float = STARTUP_TIMEOUT_SECONDS,
+                 health_check_interval: float = HEALTH_CHECK_SECONDS, errlog: TextIO = sys.stderr):
+        """Configure the pool (no server is started until warm_up(), start() or the first call).
+
+        Args:
+            server_params: Command that starts one server
+            size: Number of servers (and of concurrent tool calls)
+            call_timeout: Seconds before a call counts as hung (its server is restarted)
+            startup_timeout: Seconds a server may take to start, and a call may wait for a free server
+            health_check_interval: Seconds between pings of an idle server
+            errlog: Where the servers' stderr goes
+        """
+        self.server_params = server_params
+        self.size = size
+        self.call_timeout = call_timeout
+        self.startup_timeout = startup_timeout
+        self.health_check_interval = health_check_interval
+        self.errlog = errlog
+        self.stats = {"starts": 0, "restarts": 0, "start_failures": 0, "health_checks": 0,
+                      "health_failures": 0, "calls": 0, "tool_errors": 0, "call_failures": 0,
+                      "cancelled_calls": 0}
+        self.last_error = None
+        self._startup_seconds = deque(maxlen=LATENCY_SAMPLES)
+        self._wait_seconds = deque(maxlen=LATENCY_SAMPLES)
+        self._call_seconds = deque(maxlen=LATENCY_SAMPLES)
+        self._loop = None
+        self._servers = []
+        self._tasks = []
+        self._idle = None
+        self._closing = False
+
+    def _bind(self):
+        """Start the servers for the running event loop (once per loop).
+
+        Sessions cannot be shared between event loops, so scripts that call
+        asyncio.run() repeatedly get a fresh set of servers for each loop.
+        """
+        loop = asyncio.get_running_loop()
+        if self._loop is loop:
+            return
+        self._loop = loop
+        self._closing = False
+        self._idle = asyncio.Queue()
+        self._servers = [_Server(index) for index in range(self.size)]
+        self._tasks = [loop.create_task(self._supervise(server)) for server in self._servers]
+
+    def warm_up(self):
+        """Start the servers in the background without waiting for them (needs a running loop)."""
+        try:
+            self._bind()
+        except RuntimeError:
+            pass  # No running event loop: the first call starts the servers
+
+    async def start(self):
+        """Start the servers and wait until they are ready (or STARTUP_TIMEOUT_SECONDS passed)."""
+        self._bind()
+        try:
+            await asyncio.wait_for(asyncio.gather(*(server.ready.wait() for server in self._servers)),
+                                   self.startup_timeout)
+        except asyncio.TimeoutError:
+            logger.warning("Only %d of %d MCP servers started", self._running(), self.size)
+
+    async def close(self):
+        """Stop all servers."""
+        self._closing = True
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._loop = None
+
+    def _running(self) -> int:
+        return sum(server.session is not None for server in self._servers)
+
+    async def _supervise(self, server: _Server):
+        """Run a server slot: start the server, watch it and restart it when it fails."""
+        failures = 0
+        while not self._closing:
+            started = time.perf_counter()
+            initialized = False
+            try:
+                async with stdio_client(self.server_params, errlog=self.errlog) as transports:
+                    async with ClientSession(*transports[:2]) as session:
+                        # anyio's timeout stays in this task: the client's cancel scopes must be
+                        # exited in the task that entered them (asyncio.wait_for would not)
+                        with anyio.fail_after(self.startup_timeout):
+                            await session.initialize()
+                        initialized = True
+                        self._startup_seconds.append(time.perf_counter() - started)
+                        self.stats["starts"] += 1
+                        failures = 0
+                        server.session = session
+                        server.generation += 1
+                        server.restart.clear()
+                        server.ready.set()
+                        self._idle.put_nowait((server, server.generation))
+                        await self._watch(server)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.last_error = e
+                logger.warning("MCP server %d stopped: %s", server.index, e)
+            finally:
+                server.session = None
+                server.ready.clear()
+
+            if self._closing:
+                break
+            if not initialized:
+                self.stats["start_failures"] += 1
+            self.stats["restarts"] += 1
+            failures += 1
+            await asyncio.sleep(min(MAX_RESTART_BACKOFF_SECONDS, 0.5 * 2 ** (failures - 1)))
+
+    async def _watch(self, server: _Server):
+        """Return when the server must be restarted (a call failed or a ping went unanswered)."""
+        while True:
+            try:
+                await asyncio.wait_for(server.restart.wait(), self.health_check_interval)
+                return
+            except asyncio.TimeoutError:
+                pass
+            if server.busy:
+                continue
+            self.stats["health_checks"] += 1
+            try:
+                await asyncio.wait_for(server.session.send_ping(), PING_TIMEOUT_SECONDS)
+            except Exception as e:
+                self.stats["health_failures"] += 1
+                self.last_error = e
+                return
+
+    async def _acquire(self) -> tuple:
+        """Wait for a free, healthy server."""
+        deadline = time.monotonic() + self.startup_timeout
+        while True:
+            if self.stats["starts"] == 0 and self.stats["start_failures"] >= self.size:
+                raise McpPoolError(f"No MCP server could be started: {self.last_error}")
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise McpPoolError(f"No MCP server became available within {self.startup_timeout:g} s")
+            try:
+                server, generation = await asyncio.wait_for(self._idle.get(), min(1.0, remaining))
+            except asyncio.TimeoutError:
+                continue
+            # Entries of servers that were restarted since they were queued are stale
+            if server.generation == generation and server.session is not None and not server.restart.is_set():
+                server.busy = True
+                return server, generation
+
+    def _release(self, server: _Server, generation: int):
+        server.busy = False
+        if server.generation == generation and server.session is not None and not server.restart.is_set():
+            self._idle.put_nowait((server, generation))
+
+    async def call_tool(self, name: str, arguments: dict) -> dict:
+        """Call a tool on a free server.
+
+        Returns:
+            The MCP CallToolResult as a dictionary (content, isError, ...), like MCPTool
+            returns it; errors reported by the server come back with isError set
+
+        Raises:
+            McpPoolError: If no server is available, or the call failed on two servers
+        """
+        self._bind()
+        last_error = None
+        for _ in range(2):
+            waited = time.perf_counter()
+            server, generation = await self._acquire()
+            started = time.perf_counter()
+            self._wait_seconds.append(started - waited)
+            try:
+                result = await asyncio.wait_for(server.session.call_tool(name, arguments), self.call_timeout)
+            except McpError as e:
+                if getattr(getattr(e, "error", None), "code", None) == CONNECTION_CLOSED:
+                    # The server died during the call: restart it and retry on another one
+                    self.stats["call_failures"] += 1
+                    last_error = e
+                    server.busy = False
+                    server.restart.set()
+                    continue
+                # The server is fine, the tool failed (e.g. the page returned 404)
+                self._call_seconds.append(time.perf_counter() - started)
+                self.stats["tool_errors"] += 1
+                self._release(server, generation)
+                return {"content": [{"type": "text", "text": str(e)}], "isError": True}
+            except asyncio.CancelledError:
+                # The caller went away (client disconnect, an outer timeout). The server
+                # is fine and drops the late response; a hung one fails its next ping
+                self.stats["cancelled_calls"] += 1
+                self._release(server, generation)
+                raise
+            except Exception as e:
+                # Crashed or hung server: restart it and retry on another one
+                self.stats["call_failures"] += 1
+                last_error = e
+                server.busy = False
+                server.restart.set()
+                continue
+            self._call_seconds.append(time.perf_counter() - started)
+            self.stats["calls"] += 1
+            self._release(server, generation)
+            # Aliases keep the 1.x key names (isError, structuredContent) on every mcp version
+            return result.model_dump(mode="json", by_alias=True, exclude_none=True)
+        raise McpPoolError(f"{name} failed on two MCP servers: {type(last_error).__name__}: {last_error}")
+
+    def metrics(self) -> dict:
+        """Counters plus start-up, wait and call latency percentiles (seconds)."""
+        return dict(
+            self.stats,
+            servers=self.size,
+            running=self._running(),
+            idle=sum(server.session is not None and not server.busy for server in self._servers),
+            startup_seconds=_percentiles(self._startup_seconds),
+            wait_seconds=_percentiles(self._wait_seconds),
+            call_seconds=_percentiles(self._call_seconds),
+        )
+
+
+async def _measure(args: argparse.Namespace) -> dict:
+    pool = McpServerPool(StdioServerParameters(command=args.command, args=args.args), size=args.size)
+    started = time.perf_counter()
+    await pool.start()
+    startup = time.perf_counter() - started
+    started = time.perf_counter()
+    await asyncio.gather(*(pool.call_tool("fetch", {"url": args.url, "max_length": 500})
+                           for _ in range(args.calls)))
+    calls = time.perf_counter() - started
+    metrics = pool.metrics()
+    await pool.close()
+    return {"pool_startup_seconds": round(startup, 3), "calls_seconds": round(calls, 3), **metrics}
+
+
+def main():
+    """Start a pool, run some concurrent fetch calls and print the metrics."""
+    parser = argparse.ArgumentParser(description="Measure a pool of MCP fetch servers.")
+    parser.add_argument("--size", type=int, default=DEFAULT_POOL_SIZE, help="Number of servers")
+    parser.add_argument("--calls", type=int, default=10, help="Concurrent fetch calls")
+    parser.add_argument("--url", default="https://example.com", help="URL to fetch")
+    parser.add_argument("--command", default="uvx", help="Server command (default: uvx)")
+    parser.add_argument("args", nargs="*", default=["mcp-server-fetch"], help="Server arguments")
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(_measure(args)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
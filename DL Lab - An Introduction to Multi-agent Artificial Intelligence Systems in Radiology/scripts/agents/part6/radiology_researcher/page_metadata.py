@@ -0,0 +1,203 @@
+"""Local extraction of guideline metadata from fetched pages.
+
+Turns an HTML page into the record create_guidelines_csv expects (title,
+organization, year, website, url, description) without sending the page to the
+model. Standard metadata tags are preferred (citation_*, Dublin Core, Open Graph),
+with the page text and a few well-known radiology publishers as fallbacks.
+"""
+
+import re
+from html.parser import HTMLParser
+from urllib.parse import unquote, urlsplit
+
+DESCRIPTION_CHARS = 300
+
+# Elements whose text is not part of the main content
+SKIPPED_TAGS = {"script", "style", "noscript", "template", "svg", "nav", "header", "footer", "aside", "form"}
+BLOCK_TAGS = {"p", "div", "section", "article", "main", "li", "br", "h1", "h2", "h3", "h4", "h5", "h6", "td", "tr"}
+VOID_TAGS = {"br", "img", "input", "meta", "link", "hr", "area", "base", "col", "embed", "source", "track", "wbr"}
+
+# Metadata tags in order of preference (names are compared lower-cased)
+TITLE_META = ("citation_title", "dc.title", "og:title", "twitter:title")
+ORGANIZATION_META = ("citation_publisher", "dc.publisher", "publisher", "og:site_name", "application-name")
+DATE_META = ("citation_publication_date", "citation_date", "dc.date", "dcterms.issued", "dc.date.issued",
+             "article:published_time", "article:modified_time", "date", "last-modified")
+DESCRIPTION_META = ("description", "og:description", "dc.description", "twitter:description")
+
+# Publishers whose pages rarely name themselves in metadata
+KNOWN_ORGANIZATIONS = {
+    "acr.org": "American College of Radiology",
+    "rsna.org": "Radiological Society of North America",
+    "myesr.org": "European Society of Radiology",
+    "esur.org": "European Society of Urogenital Radiology",
+    "nice.org.uk": "National Institute for Health and Care Excellence",
+    "rcr.ac.uk": "The Royal College of Radiologists",
+    "car.ca": "Canadian Association of Radiologists",
+    "aapm.org": "American Association of Physicists in Medicine",
+    "snmmi.org": "Society of Nuclear Medicine and Molecular Imaging",
+    "fleischner.org": "Fleischner Society",
+    "who.int": "World Health Organization",
+    "cdc.gov": "Centers for Disease Control and Prevention",
+    "fda.gov": "U.S. Food and Drug Administration",
+    "ncbi.nlm.nih.gov": "National Library of Medicine",
+}
+
+# Digits may follow letters, as in "v2022" or "guideline2019.pdf"
+YEAR_PATTERN = re.compile(r"(?<!\d)(19[5-9]\d|20\d\d)(?!\d)")
+# A year next to words that date the document (copyright lines date the website instead)
+DATED_YEAR_PATTERN = re.compile(
+    r"(?:published|updated|revised|reviewed|approved|effective|issued|last review)\D{0,25}\b(19[5-9]\d|20\d\d)\b",
+    re.IGNORECASE,
+)
+
+
+class _PageParser(HTMLParser):
+    """Collects <title>, <meta> tags, the first <h1> and the visible main text."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.meta = {}
+        self.title = ""
+        self.heading = ""
+        self.text = []
+        self._skip_depth = 0
+        self._in_title = False
+        self._in_heading = False
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "meta":
+            attrs = dict(attrs)
+            name = (attrs.get("name") or attrs.get("property") or attrs.get("itemprop") or "").lower()
+            content = (attrs.get("content") or "").strip()
+            if name and content:
+                self.meta.setdefault(name, content)
+            return
+        if tag in VOID_TAGS:
+            if tag == "br":
+                self.text.append("\n")
+            return
+        if tag in SKIPPED_TAGS:
+            self._skip_depth += 1
+        elif tag == "title":
+            self._in_title = True
+        elif tag == "h1" and not self.heading:
+            self._in_heading = True
+        if tag in BLOCK_TAGS:
+            self.text.append("\n")
+
+    def handle_endtag(self, tag):
+        if tag in SKIPPED_TAGS and self._skip_depth:
+            self._skip_depth -= 1
+        elif tag == "title":
+            self._in_title = False
+        elif tag == "h1":
+            self._in_heading = False
+        if tag in BLOCK_TAGS:
+            self.text.append("\n")
+
+    def handle_data(self, data):
+        if self._in_title:
+            self.title += data
+        elif self._skip_depth:
+            return
+        if self._in_heading:
+            self.heading += data
+        if not self._in_title:
+            self.text.append(data)
+
+
+def _clean(text: str) -> str:
+    return " ".join(text.split())
+
+
+def _first_meta(meta: dict, names: tuple) -> str:
+    for name in names:
+        if meta.get(name):
+            return _clean(meta[name])
+    return ""
+
+
+def website_of(url: str) -> str:
+    """Domain of a URL without a leading "www."."""
+    host = (urlsplit(url).hostname or "").lower()
+    return host[4:] if host.startswith("www.") else host
+
+
+def known_organization(website: str) -> str:
+    """Publisher of a well-known radiology website (matched on the domain and its parents)."""
+    parts = website.split(".")
+    for i in range(len(parts) - 1):
+        organization = KNOWN_ORGANIZATIONS.get(".".join(parts[i:]))
+        if organization:
+            return organization
+    return ""
+
+
+def _strip_site_name(title: str, organization: str) -> str:
+    """Drop a trailing " | Site" or " - Site" suffix from a page title."""
+    for separator in (" | ", " - ", " – ", " — ", " :: "):
+        if separator in title:
+            head, tail = title.rsplit(separator, 1)
+            if len(head) > 10 and (not organization or len(tail) <= len(organization) + 10):
+                return head.strip()
+    return title
+
+
+def _description(text: str, limit: int = DESCRIPTION_CHARS) -> str:
+    """First sentences of the main text, cut at a word boundary."""
+    text = _clean(text)
+    if len(text) <= limit:
+        return text
+    cut = text[:limit].rsplit(" ", 1)[0]
+    return cut.rstrip(",;:") + "..."
+
+
+def extract_metadata(url: str, html: str) -> dict:
+    """Extract a guideline record from an HTML page.
+
+    Args:
+        url: Final URL of the page (after redirects)
+        html: Page source
+
+    Returns:
+        Dictionary with title, organization, year (string, "" if unknown), website,
+        url and description
+    """
+    parser = _PageParser()
+    parser.feed(html)
+    parser.close()
+    meta = parser.meta
+    website = website_of(url)
+    text = "".join(parser.text)
+
+    organization = _first_meta(meta, ORGANIZATION_META) or known_organization(website) or website
+    title = (_first_meta(meta, TITLE_META) or _strip_site_name(_clean(parser.title), organization)
+             or _clean(parser.heading) or website)
+
+    match = YEAR_PATTERN.search(_first_meta(meta, DATE_META)) or DATED_YEAR_PATTERN.search(text)
+
+    return {
+        "title": title,
+        "organization": organization,
+        "year": match.group(1) if match else "",
+        "website": website,
+        "url": url,
+        "description": _description(_first_meta(meta, DESCRIPTION_META) or text),
+    }
+
+
+def document_metadata(url: str, content_type: str) -> dict:
+    """Record for a non-HTML document (e.g. a PDF), built from its URL."""
+    website = website_of(url)
+    name = unquote(urlsplit(url).path.rstrip("/").rsplit("/", 1)[-1])
+    stem = re.sub(r"\.[A-Za-z0-9]{2,4}$", "", name)
+    match = YEAR_PATTERN.search(name)
+    kind = "PDF document" if "pdf" in content_type else (content_type.split(";")[0] or "Document")
+    return {
+        "title": _clean(re.sub(r"[-_+]+", " ", stem)) or website,
+        "organization": known_organization(website) or website,
+        "year": match.group(1) if match else "",
+        "website": website,
+        "url": url,
+        "description": kind,
+    }
@@ -1,16 +1,10 @@
 """Processing Agent - Extracts metadata from guideline URLs and generates CSV files."""
 
-import os
-from dotenv import load_dotenv
 from google.adk.agents import LlmAgent
 from google.adk.tools.mcp_tool import McpToolset
 from google.adk.tools.mcp_tool.mcp_session_manager import StdioConnectionParams
-from mcp import StdioServerParameters
 from .. import tools
-
-# Load environment variables from .env file
-env_path = "../../../.env"
-load_dotenv(env_path)
+from ..fetch_cache import use_cached_fetch, store_fetch_result
 
 # Define the processing agent - Step 2: Crawl URLs and generate CSV
 processing_agent = LlmAgent(
@@ -21,30 +15,23 @@ processing_agent = LlmAgent(
         "Your role is to extract metadata from guideline URLs and compile them into a CSV file.\n\n"
         
         "When given guideline URLs (from the previous agent):\n"
-        "1. Use the `fetch` tool to extract content from each guideline URL. "
-        "**CRITICAL: Process URLs ONE AT A TIME to avoid token limits. Always use `max_length` to limit content:**\n\n"
-        "   For each URL, call `fetch` with these parameters:\n"
-        "   - `url`: The guideline URL to fetch (process one URL per call)\n"
-        "   - `max_length`: 3000 (number) - Maximum characters to return (REQUIRED to limit tokens)\n"
-        "   - `raw`: false (boolean) - Get markdown format (default, better for LLM processing)\n"
-        "   - `start_index`: 0 (number, optional) - Start from beginning (default)\n\n"
-        "   Example `fetch` call for a single URL:\n"
+        "1. Call `fetch_guidelines` ONCE with ALL of the guideline URLs (up to 5) as a list:\n"
+        "   {\n"
+        "     \"urls\": [\"https://example.com/guideline-1\", \"https://example.org/guideline-2\"]\n"
+        "   }\n"
+        "   It downloads the pages in parallel and returns a JSON object with:\n"
+        "   - `guidelines`: one record per page with title, organization, year, website, url and description\n"
+        "   - `failed`: the URLs that could not be fetched, with the error\n\n"
+        "2. Only for URLs listed in `failed`, you may retry with the `fetch` tool, one URL per call, "
+        "always with `max_length` set to 3000 or less:\n"
         "   {\n"
         "     \"url\": \"https://example.com/guideline\",\n"
         "     \"max_length\": 3000\n"
-        "   }\n\n"
-        "   **IMPORTANT: Call `fetch` separately for each of the up to 5 URLs. "
-        "Always set `max_length` to 500 or less to prevent token limit errors.**\n\n"
-        "2. Extract key information from each guideline including:\n"
-        "   - Title of the guideline\n"
-        "   - Publishing organization\n"
-        "   - Publication year (if available)\n"
-        "   - Website/domain\n"
-        "   - Full URL\n"
-        "   - Brief description or summary\n\n"
-        
-        "3. Organize all extracted metadata (maximum 5 guidelines) into a JSON array format. "
-        "Each guideline should be represented as a JSON object with fields like:\n"
+        "   }\n"
+        "   and write the record for that page yourself from the fetched content.\n\n"
+        "3. Review the records (maximum 5 guidelines). They already have the fields create_guidelines_csv "
+        "expects; only fill in a missing year or organization if you know it from the page or the search "
+        "results, and do not rewrite fields that are already set:\n"
         "   - title: The title of the guideline\n"
         "   - organization: The publishing organization\n"
         "   - year: Publication year (if available)\n"
@@ -52,18 +39,17 @@ processing_agent = LlmAgent(
         "   - url: The full URL to the guideline\n"
         "   - description: A brief description or summary\n\n"
         
-        "4. Use the create_guidelines_csv function to convert the JSON metadata "
-        "into a well-formatted CSV file. The CSV will be saved next to the agent file.\n\n"
+        "4. Pass the records as a JSON array to the create_guidelines_csv function to create "
+        "a well-formatted CSV file. The records are added to the guideline catalogue (guidelines found in "
+        "earlier runs are kept, repeated URLs are updated) and the CSV, saved next to the agent file, lists "
+        "the whole catalogue.\n\n"
         
         "Important guidelines:\n"
         "- Process up to 5 guidelines maximum.\n"
+        "- **Fetch all URLs with a single `fetch_guidelines` call; do not call `fetch` for URLs it already returned.**\n"
         "- **MANDATORY: Always set `max_length: 3000` (or less) when calling `fetch` to prevent token limit errors.**\n"
-        "- **Process URLs ONE AT A TIME: Call `fetch` separately for each URL to avoid token limits.**\n"
-        "- The `fetch` tool automatically converts HTML to markdown, which is ideal for LLM processing.\n"
-        "- Extract metadata accurately from the fetched content, focusing on the main content.\n"
-        "- If content is truncated, focus on extracting available metadata (title, organization, year, etc.).\n"
         "- Ensure the JSON format is valid before calling create_guidelines_csv.\n"
-        "- If a guideline URL cannot be fetched, note it but continue with other sources.\n"
+        "- If a guideline URL cannot be fetched with either tool, note it but continue with other sources.\n"
         "- Provide clear feedback about the processing results.\n"
         "- Inform the user of the CSV file location after creation.\n\n"
         
@@ -80,16 +66,16 @@ processing_agent = LlmAgent(
         "]"
     ),
     description=(
-        "Extracts metadata from guideline URLs using fetch MCP server and "
-        "compiles results into CSV files."
+        "Extracts metadata from guideline URLs with a concurrent batch fetch (falling back "
+        "to the fetch MCP server) and compiles results into CSV files."
     ),
     tools=[
-        McpToolset(
+        tools.fetch_guidelines,  # Concurrent batch fetch with local metadata extraction
+        # Pooled, pre-warmed fetch servers, or one server per session with MCP_FETCH_POOL_SIZE=0
+        # (either way the tool is `fetch`: the fallback for pages the batch fetch could not read)
+        tools.fetch if tools.fetch_pool is not None else McpToolset(
             connection_params=StdioConnectionParams(
-                server_params=StdioServerParameters(
-                    command="uvx",
-                    args=["mcp-server-fetch"],
-                ),
+                server_params=tools.FETCH_SERVER,
                 timeout=60,  # 60 seconds timeout
             ),
             # Filter to only expose fetch tool
@@ -97,5 +83,7 @@ processing_agent = LlmAgent(
         ),
         tools.create_guidelines_csv,  # Custom CSV generation tool from tools.py
     ],
+    before_tool_callback=use_cached_fetch,  # Answer repeat fetches from the response cache
+    after_tool_callback=store_fetch_result,
 )
 
@@ -1,21 +1,8 @@
 """Search Agent - Finds radiology guidelines using Google Search."""
 
-import os
-from dotenv import load_dotenv
 from google.adk.agents import LlmAgent
 from google.adk.tools import google_search
 
-# Load environment variables from .env file
-env_path = "../../../.env"
-load_dotenv(env_path)
-
-# Ensure API key is loaded
-api_key = os.getenv("GOOGLE_API_KEY") or os.getenv("GOOGLE_GENAI_API_KEY")
-if not api_key:
-    raise ValueError(
-        "Please set GOOGLE_API_KEY or GOOGLE_GENAI_API_KEY in your .env file"
-    )
-
 # Define the search agent - Step 1: Find guidelines using Google Search
 search_agent = LlmAgent(
     name="guideline_search_agent",
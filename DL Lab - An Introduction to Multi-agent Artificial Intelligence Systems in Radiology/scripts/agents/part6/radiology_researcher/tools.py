@@ -3,17 +3,159 @@
 This module contains custom function tools that can be used by the agent.
 """
 
+import asyncio
 import json
-import csv
+import os
+from collections import defaultdict
 from pathlib import Path
+import httpx
+from mcp import StdioServerParameters
+from .fetch_cache import response_cache
+from .guideline_catalogue import GuidelineCatalogue, iter_json_objects
+from .mcp_pool import DEFAULT_POOL_SIZE, McpPoolError, McpServerPool
+from .page_metadata import document_metadata, extract_metadata, website_of
+
+# The MCP fetch server. MCP_FETCH_POOL_SIZE servers are kept warm and shared by all
+# agent runs in the process; 0 starts one server per agent session (McpToolset)
+FETCH_SERVER = StdioServerParameters(command="uvx", args=["mcp-server-fetch"])
+FETCH_POOL_SIZE = int(os.getenv("MCP_FETCH_POOL_SIZE", DEFAULT_POOL_SIZE))
+fetch_pool = McpServerPool(FETCH_SERVER, size=FETCH_POOL_SIZE) if FETCH_POOL_SIZE > 0 else None
+
+# Batch fetch limits: pages are downloaded concurrently, but at most
+# MAX_CONNECTIONS_PER_HOST at a time from one site
+MAX_CONCURRENT_FETCHES = 10
+MAX_CONNECTIONS_PER_HOST = 2
+FETCH_TIMEOUT_SECONDS = 15.0
+MAX_PAGE_BYTES = 2 * 1024 * 1024
+FETCH_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (compatible; RadiologyResearcher/1.0; guideline metadata)",
+    "Accept": "text/html,application/xhtml+xml,application/pdf;q=0.9,*/*;q=0.8",
+}
+
+# Guidelines accumulate across runs in GUIDELINE_CATALOGUE_DB (guideline_catalogue.db next to this file)
+guideline_catalogue = GuidelineCatalogue()
+
+# Extracted records are cached with the "fetch" TTL (the key includes this version)
+CACHE_SOURCE = "fetch"
+CACHE_PARAMS = {"extract": "metadata-v1"}
+
+
+async def _download(client: httpx.AsyncClient, url: str) -> tuple:
+    """Download a page (at most MAX_PAGE_BYTES) and return its final URL, content type and body.
+
+    The body of a non-HTML document (e.g. a PDF) is not read: its record is built from
+    the URL and the content type, so the body is returned empty.
+    """
+    async with client.stream("GET", url) as response:
+        response.raise_for_status()
+        content_type = response.headers.get("content-type", "")
+        if content_type and "html" not in content_type:
+            return str(response.url), content_type, ""
+        body = bytearray()
+        async for chunk in response.aiter_bytes():
+            body.extend(chunk)
+            if len(body) >= MAX_PAGE_BYTES:
+                break
+        text = bytes(body).decode(response.encoding or "utf-8", errors="replace")
+        return str(response.url), content_type, text
+
+
+async def _fetch_record(client: httpx.AsyncClient, url: str, limits: asyncio.Semaphore,
+                        host_limits: dict) -> dict:
+    """Fetch one URL and extract its guideline record (or an error record)."""
+    if response_cache is not None:
+        cached = response_cache.get(CACHE_SOURCE, url, CACHE_PARAMS)
+        if cached is not None and cached["fresh"]:
+            return json.loads(cached["body"])
+
+    try:
+        async with limits, host_limits[website_of(url)]:
+            final_url, content_type, body = await asyncio.wait_for(_download(client, url), FETCH_TIMEOUT_SECONDS)
+    except asyncio.TimeoutError:
+        return {"url": url, "error": f"Timed out after {FETCH_TIMEOUT_SECONDS:g} s"}
+    except httpx.HTTPStatusError as e:
+        return {"url": url, "error": f"HTTP {e.response.status_code}"}
+    except httpx.HTTPError as e:
+        return {"url": url, "error": f"{type(e).__name__}: {e}"}
+
+    if "html" in content_type or (not content_type and body.lstrip()[:1] == "<"):
+        record = extract_metadata(final_url, body)
+    else:
+        record = document_metadata(final_url, content_type)
+    # Keep the URL the search agent found (it is the one users will recognize)
+    record["url"] = url
+    if response_cache is not None:
+        response_cache.put(CACHE_SOURCE, url, json.dumps(record), CACHE_PARAMS)
+    return record
+
+
+async def fetch_guidelines(urls: list[str]) -> str:
+    """Fetch several guideline pages at once and extract their metadata.
+    
+    All URLs are downloaded concurrently (at most 2 connections per website, 15 s per
+    page), and each page's title, organization, year and a short description are
+    extracted locally, so the page content never has to pass through the model.
+    
+    Args:
+        urls: The guideline URLs to fetch (e.g. the up to 5 URLs from the search agent)
+    
+    Returns:
+        A JSON object with two arrays:
+        - "guidelines": one record per fetched page with title, organization, year,
+          website, url and description (ready for create_guidelines_csv)
+        - "failed": {"url", "error"} for pages that could not be fetched
+    
+    Example:
+        fetch_guidelines(["https://acr.org/...", "https://www.rsna.org/..."])
+    """
+    urls = list(dict.fromkeys(url.strip() for url in urls if url and url.strip()))
+    if not urls:
+        return json.dumps({"guidelines": [], "failed": []})
+
+    limits = asyncio.Semaphore(MAX_CONCURRENT_FETCHES)
+    host_limits = defaultdict(lambda: asyncio.Semaphore(MAX_CONNECTIONS_PER_HOST))
+    async with httpx.AsyncClient(headers=FETCH_HEADERS, follow_redirects=True,
+                                 timeout=httpx.Timeout(FETCH_TIMEOUT_SECONDS, connect=5.0)) as client:
+        records = await asyncio.gather(*(_fetch_record(client, url, limits, host_limits) for url in urls))
+
+    return json.dumps({
+        "guidelines": [record for record in records if "error" not in record],
+        "failed": [record for record in records if "error" in record],
+    }, ensure_ascii=False)
+
+
+async def fetch(url: str, max_length: int = 5000, start_index: int = 0, raw: bool = False) -> dict:
+    """Fetches a URL from the internet and optionally extracts its contents as markdown.
+    
+    Runs the MCP fetch server's `fetch` tool on one of the warm, pooled servers.
+    
+    Args:
+        url: URL to fetch
+        max_length: Maximum number of characters to return
+        start_index: Return output starting at this character index (to continue a truncated page)
+        raw: Get the actual HTML content of the requested page, without simplification
+    
+    Returns:
+        The fetch server's result: "content" with the page text, and "isError" if the
+        page could not be fetched
+    """
+    arguments = {"url": url, "max_length": max_length, "start_index": start_index, "raw": raw}
+    try:
+        return await fetch_pool.call_tool("fetch", arguments)
+    except McpPoolError as e:
+        return {"content": [{"type": "text", "text": f"Error: {e}"}], "isError": True}
 
 
 def create_guidelines_csv(metadata_json: str, filename: str = "radiology_guidelines.csv") -> str:
-    """Create a CSV file from JSON metadata about radiology guidelines.
+    """Add guidelines to the catalogue and save them as a CSV file.
     
-    This function takes a JSON string containing metadata about radiology guidelines
-    and creates a well-formatted CSV file. The JSON should be an array of objects,
-    where each object contains metadata fields like title, website, year, organization, etc.
+    This function takes a JSON string containing metadata about radiology guidelines,
+    adds them to the guideline catalogue (guideline_catalogue.py) and writes them to a
+    CSV file. The JSON should be an array of objects, where each object contains
+    metadata fields like title, website, year, organization, etc. Guidelines already in
+    the catalogue (same canonical URL) are updated instead of added again, and the CSV
+    includes details found for them in earlier runs. Only this call's guidelines are
+    written; export the whole catalogue with the guideline_catalogue command line.
     
     Args:
         metadata_json: A JSON string containing an array of guideline metadata objects.
@@ -24,10 +166,12 @@ def create_guidelines_csv(metadata_json: str, filename: str = "radiology_guideli
                       - organization: Publishing organization
                       - url: Full URL to the guideline
                       - description: Optional description or summary
-        filename: Name of the CSV file to create (default: "radiology_guidelines.csv")
+        filename: Name of the CSV file to create (default: "radiology_guidelines.csv");
+                  a .parquet name exports Parquet instead (needs pyarrow)
     
     Returns:
-        A string message indicating success and the file path where the CSV was saved.
+        A string message indicating success, the number of new and updated guidelines
+        and the file path where the CSV was saved.
     
     Example JSON input:
         [
@@ -42,51 +186,28 @@ def create_guidelines_csv(metadata_json: str, filename: str = "radiology_guideli
         ]
     """
     try:
-        # Parse JSON input
-        metadata_list = json.loads(metadata_json)
-        
-        if not isinstance(metadata_list, list):
-            return f"Error: Expected a JSON array, but got {type(metadata_list).__name__}"
-        
-        if len(metadata_list) == 0:
-            return "Warning: No metadata provided. CSV file not created."
-        
+        if not metadata_json.lstrip().startswith("["):
+            metadata = json.loads(metadata_json)
+            return f"Error: Expected a JSON array, but got {type(metadata).__name__}"
+
+        # The tool gets the whole array as one string: parse it, upsert the records and
+        # export only them, so a call costs the same however large the catalogue is
+        records = list(iter_json_objects([metadata_json]))
+        counts = guideline_catalogue.upsert(records)
+        if counts["added"] + counts["updated"] == 0:
+            return "Warning: No guidelines with a url provided. CSV file not created."
+
         # Get the directory where this agent file is located
         agent_dir = Path(__file__).parent
         csv_path = agent_dir / filename
-        
-        # Define CSV columns (extract all unique keys from all objects)
-        all_keys = set()
-        for item in metadata_list:
-            if isinstance(item, dict):
-                all_keys.update(item.keys())
-        
-        # Standardize column order (prefer common fields first)
-        preferred_order = ["title", "organization", "year", "website", "url", "description"]
-        columns = [col for col in preferred_order if col in all_keys]
-        columns.extend(sorted([col for col in all_keys if col not in preferred_order]))
-        
-        # Write CSV file
-        with open(csv_path, 'w', newline='', encoding='utf-8') as csvfile:
-            writer = csv.DictWriter(csvfile, fieldnames=columns, extrasaction='ignore')
-            writer.writeheader()
-            
-            for item in metadata_list:
-                if isinstance(item, dict):
-                    # Clean and format the data
-                    cleaned_item = {}
-                    for key, value in item.items():
-                        # Convert None to empty string, ensure strings are properly encoded
-                        if value is None:
-                            cleaned_item[key] = ""
-                        elif isinstance(value, (list, dict)):
-                            cleaned_item[key] = json.dumps(value)
-                        else:
-                            cleaned_item[key] = str(value)
-                    writer.writerow(cleaned_item)
-        
+        urls = [str(record["url"]) for record in records
+                if isinstance(record, dict) and str(record.get("url") or "").strip()]
+        total = guideline_catalogue.export(csv_path, urls=urls)
+
+        skipped = f", skipped {counts['skipped']} without a url" if counts["skipped"] else ""
         return (
-            f"Successfully created CSV file with {len(metadata_list)} guideline(s). "
+            f"Successfully created CSV file with {total} guideline(s) "
+            f"({counts['added']} new to the catalogue, {counts['updated']} updated{skipped}). "
             f"File saved at: {csv_path.absolute()}"
         )
     
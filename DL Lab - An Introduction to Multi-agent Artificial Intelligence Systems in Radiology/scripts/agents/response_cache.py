@@ -0,0 +1,285 @@
+"""On-disk cache of HTTP responses shared between runs.
+
+Responses are stored in a small SQLite database, keyed by source (e.g.
+"semantic_scholar", "fetch") and the normalized URL with its query parameters, so
+repeat and batch runs read them locally instead of waiting for the network and
+the rate limiter. Part 5 (Semantic Scholar) and part 6 (MCP `fetch`) share one
+database, so the TTLs, the size bound and the CLI below cover both. The module
+lives in the agents directory and imports nothing from the rest of `scripts`, so the
+agents can use it however they are loaded (`adk run`, the notebook's `agents`
+package, or `scripts.agents`).
+
+- Each source has its own time-to-live (DEFAULT_TTLS)
+- Stale entries keep their ETag / Last-Modified, so callers can revalidate them
+  with a conditional request and reuse the body on "304 Not Modified"
+- The database is bounded in size; the least recently used entries are evicted
+
+Environment variables:
+    RESPONSE_CACHE      "off" disables the cache
+    RESPONSE_CACHE_DB   database file (default: response_cache.db in the agents directory)
+
+Inspect or purge the cache from the command line (from the lab directory):
+    python -m scripts.response_cache stats
+    python -m scripts.response_cache list --source semantic_scholar
+    python -m scripts.response_cache purge --expired
+"""
+
+import argparse
+import hashlib
+import os
+import sqlite3
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+DEFAULT_CACHE_DB = Path(__file__).parent / "response_cache.db"
+DEFAULT_MAX_MB = 200
+
+# Time-to-live per source, in seconds (other sources use DEFAULT_TTL_SECONDS)
+DEFAULT_TTLS = {
+    "semantic_scholar": 24 * 60 * 60,
+    "fetch": 7 * 24 * 60 * 60,
+}
+DEFAULT_TTL_SECONDS = 24 * 60 * 60
+
+
+def normalize_url(url: str, params: dict = None) -> str:
+    """Canonical form of a URL plus query parameters (used as the cache key).
+
+    The scheme and host are lower-cased, default ports and fragments are dropped and
+    all query parameters (from the URL and from `params`) are sorted.
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    port = parts.port
+    netloc = host if port is None or (scheme, port) in (("http", 80), ("https", 443)) else f"{host}:{port}"
+
+    query = parse_qsl(parts.query, keep_blank_values=True)
+    if params:
+        query += [(key, str(value)) for key, value in params.items() if value is not None]
+    return urlunsplit((scheme, netloc, parts.path or "/", urlencode(sorted(query)), ""))
+
+
+class ResponseCache:
+    """SQLite-backed response cache with per-source TTLs and LRU eviction.
+
+    Hit, miss, stale, revalidation, store and eviction counts are kept in `stats`.
+    The database file is only created when the cache is first used.
+    """
+
+    def __init__(self, db_path: Path = None, max_mb: float = DEFAULT_MAX_MB, ttls: dict = None):
+        """Configure the cache.
+
+        Args:
+            db_path: SQLite database file (default: RESPONSE_CACHE_DB or response_cache.db next to this file)
+            max_mb: Maximum total size of the cached bodies, in MB
+            ttls: Time-to-live per source in seconds (merged over DEFAULT_TTLS)
+        """
+        self.db_path = Path(db_path or os.getenv("RESPONSE_CACHE_DB") or DEFAULT_CACHE_DB)
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self.ttls = dict(DEFAULT_TTLS, **(ttls or {}))
+        self.stats = {"hits": 0, "misses": 0, "stale": 0, "revalidated": 0, "stores": 0, "evictions": 0}
+        self._ready = False
+
+    @contextmanager
+    def _connect(self):
+        """Open a connection that commits on success and is always closed."""
+        if not self._ready:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            with conn:
+                if not self._ready:
+                    conn.execute(
+                        "CREATE TABLE IF NOT EXISTS responses ("
+                        "  cache_key TEXT PRIMARY KEY,"
+                        "  source TEXT NOT NULL,"
+                        "  url TEXT NOT NULL,"
+                        "  body TEXT NOT NULL,"
+                        "  etag TEXT,"
+                        "  last_modified TEXT,"
+                        "  size INTEGER NOT NULL,"
+                        "  stored_at REAL NOT NULL,"
+                        "  accessed_at REAL NOT NULL"
+                        ")"
+                    )
+                    conn.execute("CREATE INDEX IF NOT EXISTS responses_lru ON responses (accessed_at)")
+                    self._ready = True
+                yield conn
+        finally:
+            conn.close()
+
+    def ttl(self, source: str) -> float:
+        """Time-to-live of a source's entries, in seconds."""
+        return self.ttls.get(source, DEFAULT_TTL_SECONDS)
+
+    @staticmethod
+    def cache_key(source: str, url: str, params: dict = None) -> str:
+        """Key of a request: hash of the source and the normalized URL."""
+        return hashlib.sha256(f"{source}\n{normalize_url(url, params)}".encode("utf-8")).hexdigest()
+
+    def get(self, source: str, url: str, params: dict = None) -> Optional[dict]:
+        """Look up a cached response.
+
+        Args:
+            source: Cache namespace (selects the TTL)
+            url: Request URL
+            params: Query parameters
+
+        Returns:
+            Dictionary with body, etag, last_modified and fresh (False once the TTL
+            has passed; the entry can then be revalidated), or None on a miss
+        """
+        key = self.cache_key(source, url, params)
+        now = time.time()
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT body, etag, last_modified, stored_at FROM responses WHERE cache_key = ?",
+                (key,)
+            ).fetchone()
+            if row is not None:
+                conn.execute("UPDATE responses SET accessed_at = ? WHERE cache_key = ?", (now, key))
+
+        if row is None:
+            self.stats["misses"] += 1
+            return None
+
+        fresh = now - row[3] <= self.ttl(source)
+        self.stats["hits" if fresh else "stale"] += 1
+        return {"body": row[0], "etag": row[1], "last_modified": row[2], "fresh": fresh}
+
+    def put(self, source: str, url: str, body: str, params: dict = None,
+            etag: str = None, last_modified: str = None):
+        """Store (or replace) a response, evicting least recently used entries if needed."""
+        now = time.time()
+        size = len(body.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO responses "
+                "(cache_key, source, url, body, etag, last_modified, size, stored_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (self.cache_key(source, url, params), source, normalize_url(url, params), body,
+                 etag, last_modified, size, now, now)
+            )
+            self._evict(conn)
+        self.stats["stores"] += 1
+
+    def revalidated(self, source: str, url: str, params: dict = None):
+        """Mark a stale entry as fresh again (the server answered 304 Not Modified)."""
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE responses SET stored_at = ?, accessed_at = ? WHERE cache_key = ?",
+                (now, now, self.cache_key(source, url, params))
+            )
+        self.stats["revalidated"] += 1
+
+    def _evict(self, conn: sqlite3.Connection):
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        victims = []
+        for key, size in conn.execute("SELECT cache_key, size FROM responses ORDER BY accessed_at"):
+            victims.append((key,))
+            total -= size
+            if total <= self.max_bytes:
+                break
+        conn.executemany("DELETE FROM responses WHERE cache_key = ?", victims)
+        self.stats["evictions"] += len(victims)
+
+    def purge(self, source: str = None, expired_only: bool = False) -> int:
+        """Delete entries.
+
+        Args:
+            source: Only delete this source's entries (default: all sources)
+            expired_only: Only delete entries older than their source's TTL
+
+        Returns:
+            Number of deleted entries
+        """
+        with self._connect() as conn:
+            sources = [source] if source else [row[0] for row in conn.execute("SELECT DISTINCT source FROM responses")]
+            deleted = 0
+            for name in sources:
+                if expired_only:
+                    cursor = conn.execute("DELETE FROM responses WHERE source = ? AND stored_at < ?",
+                                          (name, time.time() - self.ttl(name)))
+                else:
+                    cursor = conn.execute("DELETE FROM responses WHERE source = ?", (name,))
+                deleted += cursor.rowcount
+        return deleted
+
+    def summary(self) -> dict:
+        """Entries, bytes and expired entries per source."""
+        now = time.time()
+        result = {}
+        with self._connect() as conn:
+            for source, stored_at, size in conn.execute("SELECT source, stored_at, size FROM responses"):
+                stats = result.setdefault(source, {"entries": 0, "bytes": 0, "expired": 0})
+                stats["entries"] += 1
+                stats["bytes"] += size
+                stats["expired"] += now - stored_at > self.ttl(source)
+        return result
+
+    def entries(self, source: str = None, limit: int = 50) -> list:
+        """Most recently used entries (url, source, size, age and whether expired)."""
+        query = "SELECT source, url, size, stored_at FROM responses"
+        args = ()
+        if source:
+            query += " WHERE source = ?"
+            args = (source,)
+        query += " ORDER BY accessed_at DESC LIMIT ?"
+        now = time.time()
+        with self._connect() as conn:
+            rows = conn.execute(query, args + (limit,)).fetchall()
+        return [{"source": row[0], "url": row[1], "bytes": row[2], "age_hours": round((now - row[3]) / 3600, 1),
+                 "expired": now - row[3] > self.ttl(row[0])} for row in rows]
+
+
+def open_response_cache() -> Optional[ResponseCache]:
+    """The cache configured by the environment, or None if RESPONSE_CACHE is "off"."""
+    if os.getenv("RESPONSE_CACHE", "").lower() in ("off", "0", "false", "no"):
+        return None
+    return ResponseCache()
+
+
+def main():
+    """Inspect or purge the response cache."""
+    parser = argparse.ArgumentParser(description="Inspect or purge the HTTP response cache.")
+    parser.add_argument("--db", type=Path, help="Cache database (default: RESPONSE_CACHE_DB or response_cache.db)")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("stats", help="Entries, size and expired entries per source")
+    list_parser = commands.add_parser("list", help="Most recently used entries")
+    list_parser.add_argument("--source", help="Only this source (e.g. semantic_scholar, fetch)")
+    list_parser.add_argument("--limit", type=int, default=50)
+    purge_parser = commands.add_parser("purge", help="Delete entries")
+    purge_parser.add_argument("--source", help="Only this source")
+    purge_parser.add_argument("--expired", action="store_true", help="Only entries older than their TTL")
+    args = parser.parse_args()
+
+    cache = ResponseCache(args.db)
+    if args.command == "stats":
+        summary = cache.summary()
+        print(f"Response cache: {cache.db_path}")
+        if not summary:
+            print("  (empty)")
+        for source, stats in sorted(summary.items()):
+            print(f"  {source:18} {stats['entries']:6} entries  {stats['bytes'] / 1024 / 1024:8.2f} MB  "
+                  f"{stats['expired']:6} expired  (TTL {cache.ttl(source) / 3600:g} h)")
+    elif args.command == "list":
+        for entry in cache.entries(args.source, args.limit):
+            marker = " (expired)" if entry["expired"] else ""
+            print(f"{entry['source']:18} {entry['bytes']:9} B  {entry['age_hours']:7} h  {entry['url']}{marker}")
+    else:
+        deleted = cache.purge(args.source, expired_only=args.expired)
+        print(f"Deleted {deleted} entries from {cache.db_path}")
+
+
+if __name__ == "__main__":
+    main()
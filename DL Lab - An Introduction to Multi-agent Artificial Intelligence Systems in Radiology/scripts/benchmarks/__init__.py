@@ -0,0 +1 @@
+# Offline benchmarks for the agent pipelines (no Gemini, Google Search or Semantic Scholar access needed)
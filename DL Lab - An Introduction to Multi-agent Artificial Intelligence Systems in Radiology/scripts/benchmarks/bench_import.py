@@ -0,0 +1,109 @@
+"""Start-up time benchmark for the networking agent CLI.
+
+Every command runs in a fresh Python process (so nothing is already imported) and is
+timed end to end, the same way a user or a shell loop would start the CLI:
+
+    help          python -m scripts.run_networking_agent --help
+    import        import scripts.run_networking_agent
+    cached        a profile served from the profile cache (no agent tree needed)
+    agent tree    scripts.agents.get("part5.networking_agent")
+    eager import  import scripts.agents.part5.networking_agent.agent (what every
+                  start-up used to pay before the agent tree was loaded lazily)
+
+Usage (from the lab directory):
+    python -m scripts.benchmarks.bench_import
+    python -m scripts.benchmarks.bench_import --repeat 10 --output bench_import.json
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from scripts.pipeline_trace import percentile
+
+CACHED_PROFILE = """
+import asyncio
+from pathlib import Path
+from scripts.profile_cache import ProfileCache
+from scripts.run_networking_agent import run_cached_agent_async
+cache = ProfileCache(Path({db!r}))
+profile, cached = asyncio.run(run_cached_agent_async("Jane Doe", cache=cache))
+assert cached
+"""
+
+SEED_CACHE = """
+from pathlib import Path
+from scripts.agents.part5.networking_agent.profile_models import NetworkingProfile, PublicationSection
+from scripts.profile_cache import ProfileCache
+profile = NetworkingProfile(person_name="Jane Doe", background="Radiologist.", online_presence=[],
+                            recent_publications=PublicationSection(most_recent_papers=[], most_cited_papers=[]))
+ProfileCache(Path({db!r})).put("jane_doe", "Jane Doe", profile.model_dump_json())
+"""
+
+
+def commands(cache_db: Path) -> dict:
+    """Name -> argv of every measured start-up path."""
+    python = [sys.executable, "-W", "ignore"]
+    return {
+        "help": python + ["-m", "scripts.run_networking_agent", "--help"],
+        "import": python + ["-c", "import scripts.run_networking_agent"],
+        "cached": python + ["-c", CACHED_PROFILE.format(db=str(cache_db))],
+        "agent tree": python + ["-c", "from scripts import agents; agents.get('part5.networking_agent')"],
+        "eager import": python + ["-c", "import scripts.agents.part5.networking_agent.agent"],
+    }
+
+
+def time_command(argv: list, repeat: int) -> list:
+    """Run a command `repeat` times and return the wall-clock seconds of each run."""
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run(argv, check=True, stdout=subprocess.DEVNULL)
+        durations.append(time.perf_counter() - start)
+    return durations
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Start-up time benchmark for the networking agent CLI.")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per command (default: 5)")
+    parser.add_argument("--output", type=Path, help="Also write the results as JSON to this file")
+    return parser.parse_args(argv)
+
+
+def main():
+    """Run the benchmark and print a results table."""
+    args = parse_args()
+
+    # Offline: only checked for, never used
+    os.environ.setdefault("GOOGLE_API_KEY", "offline-benchmark")
+    cache_db = Path(tempfile.mkdtemp(prefix="import_bench_")) / "profile_cache.db"
+    subprocess.run([sys.executable, "-c", SEED_CACHE.format(db=str(cache_db))], check=True)
+
+    results = {}
+    for name, argv in commands(cache_db).items():
+        # One untimed run so every command starts with warm .pyc files and OS caches
+        time_command(argv, 1)
+        durations = time_command(argv, args.repeat)
+        results[name] = {"p50_seconds": round(percentile(durations, 50), 3),
+                         "min_seconds": round(min(durations), 3)}
+
+    baseline = results["eager import"]["p50_seconds"]
+    for name, result in results.items():
+        result["fraction_of_eager"] = round(result["p50_seconds"] / baseline, 2) if baseline else None
+        print(f"{name:13} p50={result['p50_seconds']:.3f}s  min={result['min_seconds']:.3f}s  "
+              f"({result['fraction_of_eager']:.0%} of the eager import)")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({"repeat": args.repeat, "results": results}, f, indent=2)
+        print(f"\nResults saved at: {args.output.absolute()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,305 @@
+"""Offline benchmark for the part5 networking agent and part6 radiology researcher pipelines.
+
+Runs the real agent trees, runner code, event parsing and markdown/CSV generation, but
+replaces Gemini with scripted fake models, Semantic Scholar and the guideline websites
+with local HTTP servers and the MCP `fetch` server with a local function, each with a
+configurable latency.
+That leaves only the orchestration overhead of our code and ADK, so regressions show up
+as changes in throughput, latency or memory instead of being lost in network noise.
+
+Usage (from the lab directory):
+    python -m scripts.benchmarks.bench_pipelines
+    python -m scripts.benchmarks.bench_pipelines --pipelines part5 --concurrency 1 10 100 --output bench.json
+    python -m scripts.benchmarks.bench_pipelines --pipelines part6 --fetch-mode sequential
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import re
+import resource
+import sys
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+from scripts.benchmarks.fake_guideline_site import FakeGuidelineSite
+from scripts.benchmarks.fake_llm import (function_responses, install_scripted_models, request_text, text_reply,
+                                         tool_calls)
+from scripts.benchmarks.fake_semantic_scholar import FakeSemanticScholarServer
+from scripts.pipeline_trace import percentile
+
+DEFAULT_CONCURRENCY = [1, 10, 100]
+GUIDELINES_PER_TOPIC = 5
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process so far, in MB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes on Linux
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def _person_name(llm_request) -> str:
+    match = re.search(r"Create a networking profile for (.+)", request_text(llm_request))
+    return match.group(1).strip() if match else "Unknown Person"
+
+
+def _fake_profile(llm_request) -> str:
+    """Formatter reply: a full NetworkingProfile JSON with 10 + 10 papers."""
+    person_name = _person_name(llm_request)
+    papers = [
+        {"title": f"Paper {i} by {person_name}", "journal": "Radiology", "year": 2015 + i % 10,
+         "url": f"https://www.semanticscholar.org/paper/{i}", "citations": 100 - i,
+         "authors": f"{person_name}, A. Coauthor, B. Coauthor"}
+        for i in range(10)
+    ]
+    profile = {
+        "person_name": person_name,
+        "background": f"{person_name} is a radiologist. " * 20,
+        "online_presence": [
+            {"category": category, "url": f"https://example.org/{i}", "description": "Profile page",
+             "platform": platform}
+            for i, (category, platform) in enumerate([("Social Media", "LinkedIn"), ("Social Media", "X"),
+                                                      ("Institutional", "University"),
+                                                      ("Professional Profile", "ResearchGate")])
+        ],
+        "recent_publications": {"most_recent_papers": papers, "most_cited_papers": papers[::-1]},
+        "contact_information": "Department of Radiology",
+    }
+    return json.dumps(profile)
+
+
+NETWORKING_SCRIPTS = {
+    "radiologist_verification_agent": {
+        None: text_reply(lambda r: f"Verification: {_person_name(r)} is a radiologist. " + "Background. " * 100),
+    },
+    "url_finder_agent": {
+        None: text_reply(lambda r: json.dumps([
+            {"category": "Social Media", "url": f"https://example.org/{i}", "description": "Profile page",
+             "platform": "LinkedIn"}
+            for i in range(12)
+        ])),
+    },
+    "semantic_scholar_agent": {
+        None: tool_calls(lambda r: [("get_semantic_scholar_papers",
+                                     {"author_name": _person_name(r), "recent_limit": 10,
+                                      "most_cited_limit": 10})]),
+        "get_semantic_scholar_papers": text_reply(lambda r: "Found the most recent and most cited papers."),
+    },
+    "profile_formatter_agent": {
+        None: text_reply(_fake_profile),
+    },
+}
+
+
+def researcher_scripts(output_dir: Path, site: FakeGuidelineSite, fetch_mode: str) -> dict:
+    """Scripts for the part6 agents (CSV files go to output_dir).
+
+    fetch_mode "batch" fetches every URL with one fetch_guidelines call; "sequential"
+    follows the previous instructions, one MCP `fetch` call per model turn.
+    """
+    urls = [site.page_url(i) for i in range(GUIDELINES_PER_TOPIC)]
+
+    def write_csv(metadata: list) -> list:
+        return [("create_guidelines_csv", {
+            "metadata_json": json.dumps(metadata),
+            # Absolute paths keep benchmark output out of the agent directory
+            "filename": str(output_dir / f"guidelines_{uuid.uuid4().hex}.csv"),
+        })]
+
+    def batch_records(llm_request) -> list:
+        result = function_responses(llm_request, "fetch_guidelines")[-1]["result"]
+        return write_csv(json.loads(result)["guidelines"])
+
+    def next_fetch(llm_request) -> list:
+        fetched = len(function_responses(llm_request, "fetch"))
+        if fetched < len(urls):
+            return [("fetch", {"url": urls[fetched], "max_length": 3000})]
+        return write_csv([
+            {"title": f"Guideline {i}", "organization": "American College of Radiology", "year": "2024",
+             "website": "127.0.0.1", "url": url, "description": "Imaging recommendations"}
+            for i, url in enumerate(urls)
+        ])
+
+    processing_script = {"create_guidelines_csv": text_reply(lambda r: "Created the CSV file.")}
+    if fetch_mode == "batch":
+        processing_script[None] = tool_calls(lambda r: [("fetch_guidelines", {"urls": urls})])
+        processing_script["fetch_guidelines"] = tool_calls(batch_records)
+    else:
+        processing_script[None] = tool_calls(next_fetch)
+        processing_script["fetch"] = tool_calls(next_fetch)
+
+    return {
+        "guideline_search_agent": {
+            None: text_reply(lambda r: "\n".join(urls)),
+        },
+        "guideline_processor_agent": processing_script,
+    }
+
+
+def make_fetch_stub(latency: float):
+    """Local replacement for the MCP fetch server's `fetch` tool."""
+    async def fetch(url: str, max_length: int = 3000, raw: bool = False, start_index: int = 0) -> str:
+        """Fetch a URL and return its content as markdown."""
+        await asyncio.sleep(latency)
+        content = f"# Guideline at {url}\n\nAmerican College of Radiology, 2024.\n\n" + "Recommendation. " * 400
+        return content[start_index:start_index + max_length]
+    return fetch
+
+
+async def run_level(pipeline, person_names: list, concurrency: int) -> dict:
+    """Run one pipeline per name with at most `concurrency` running at once."""
+    semaphore = asyncio.Semaphore(concurrency)
+    durations = []
+    failures = []
+
+    async def run_one(name: str):
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                await pipeline(name)
+                durations.append(time.perf_counter() - start)
+            except Exception as e:
+                failures.append(f"{name}: {e}")
+
+    start = time.perf_counter()
+    await asyncio.gather(*(run_one(name) for name in person_names))
+    elapsed = time.perf_counter() - start
+
+    return {
+        "concurrency": concurrency,
+        "pipelines": len(person_names),
+        "failed": len(failures),
+        "errors": failures[:5],
+        "seconds": round(elapsed, 3),
+        "throughput_per_min": round(len(durations) / elapsed * 60, 1) if elapsed else None,
+        "p50_seconds": round(percentile(durations, 50), 3) if durations else None,
+        "p95_seconds": round(percentile(durations, 95), 3) if durations else None,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def build_networking_pipeline(args):
+    """Return an async pipeline(name) that runs the part5 networking agent end to end."""
+    from scripts import agents, run_networking_agent
+
+    install_scripted_models(agents.get("part5.networking_agent"), NETWORKING_SCRIPTS,
+                            latency=args.llm_latency, jitter=args.llm_jitter)
+    runner = run_networking_agent.create_runner()
+
+    async def pipeline(person_name: str):
+        profile = await run_networking_agent.run_agent_async(person_name, runner=runner)
+        run_networking_agent.profile_to_markdown(profile)
+
+    return pipeline
+
+
+def build_researcher_pipeline(args, output_dir: Path, site: FakeGuidelineSite):
+    """Return an async pipeline(topic) that runs the part6 radiology researcher end to end."""
+    from google.adk import Runner
+    from google.adk.runners import types
+    from google.adk.sessions import InMemorySessionService
+    from google.adk.tools.mcp_tool import McpToolset
+    from scripts import agents
+
+    root_agent = agents.get("part6.radiology_researcher")
+    processing_agent = next(agent for agent in root_agent.sub_agents if agent.name == "guideline_processor_agent")
+
+    install_scripted_models(root_agent, researcher_scripts(output_dir, site, args.fetch_mode),
+                            latency=args.llm_latency, jitter=args.llm_jitter)
+    # Swap the MCP fetch server (a uvx subprocess) for a local stub with the same tool name
+    processing_agent.tools = [make_fetch_stub(args.fetch_latency) if isinstance(tool, McpToolset) else tool
+                              for tool in processing_agent.tools]
+
+    runner = Runner(agent=root_agent, app_name="agents", session_service=InMemorySessionService())
+
+    async def pipeline(topic: str):
+        session = await runner.session_service.create_session(app_name="agents", user_id="user")
+        message = types.Content(role="user", parts=[types.Part(text=f"Find guidelines for {topic}")])
+        csv_written = False
+        async for event in runner.run_async(user_id="user", session_id=session.id, new_message=message):
+            for response in event.get_function_responses():
+                if response.name == "create_guidelines_csv" and "Successfully" in str(response.response):
+                    csv_written = True
+        if not csv_written:
+            raise RuntimeError("create_guidelines_csv did not succeed")
+
+    return pipeline
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Offline benchmark for the agent pipelines.")
+    parser.add_argument("--pipelines", nargs="+", choices=["part5", "part6"], default=["part5", "part6"])
+    parser.add_argument("--concurrency", nargs="+", type=int, default=DEFAULT_CONCURRENCY,
+                        help="Concurrency levels to measure (default: 1 10 100)")
+    parser.add_argument("--rounds", type=int, default=3,
+                        help="Pipelines per level = concurrency x rounds (default: 3)")
+    parser.add_argument("--llm-latency", type=float, default=0.05, help="Seconds per fake model call")
+    parser.add_argument("--llm-jitter", type=float, default=0.0, help="Extra random seconds per model call")
+    parser.add_argument("--s2-latency", type=float, default=0.02, help="Seconds per fake Semantic Scholar request")
+    parser.add_argument("--fetch-latency", type=float, default=0.02,
+                        help="Seconds per fake fetch call or guideline page download")
+    parser.add_argument("--fetch-mode", choices=["batch", "sequential"], default="batch",
+                        help="part6: one fetch_guidelines call, or one MCP fetch call per model turn")
+    parser.add_argument("--output", type=Path, help="Also write the results as JSON to this file")
+    return parser.parse_args(argv)
+
+
+def main():
+    """Run the benchmark and print a results table."""
+    args = parse_args()
+
+    # Offline: the agents only check that a key is set, no request ever reaches Gemini
+    os.environ.setdefault("GOOGLE_API_KEY", "offline-benchmark")
+    s2_server = FakeSemanticScholarServer(latency=args.s2_latency).start()
+    os.environ["SEMANTIC_SCHOLAR_API_URL"] = s2_server.api_url
+    guideline_site = FakeGuidelineSite(latency=args.fetch_latency).start()
+    # The local server has no rate limit, so neither should the client
+    os.environ.setdefault("SEMANTIC_SCHOLAR_RATE_LIMIT", "0")
+    # Measure the pipelines, not the on-disk response cache and publication index
+    # (set RESPONSE_CACHE=on / PUBLICATION_INDEX=on to include them)
+    os.environ.setdefault("RESPONSE_CACHE", "off")
+    os.environ.setdefault("PUBLICATION_INDEX", "off")
+    # The fetch tool is replaced by a local stub, so no MCP fetch servers are needed
+    os.environ.setdefault("MCP_FETCH_POOL_SIZE", "0")
+
+    output_dir = Path(tempfile.mkdtemp(prefix="agent_bench_"))
+    # Benchmark guidelines go to a catalogue of their own, not the agent's
+    os.environ.setdefault("GUIDELINE_CATALOGUE_DB", str(output_dir / "guideline_catalogue.db"))
+    builders = {
+        "part5": lambda: build_networking_pipeline(args),
+        "part6": lambda: build_researcher_pipeline(args, output_dir, guideline_site),
+    }
+
+    results = []
+    try:
+        for name in args.pipelines:
+            pipeline = builders[name]()
+            for concurrency in args.concurrency:
+                inputs = [f"Person {i} Benchmark" if name == "part5" else f"imaging topic {i}"
+                          for i in range(concurrency * args.rounds)]
+                level = asyncio.run(run_level(pipeline, inputs, concurrency))
+                level["pipeline"] = name
+                results.append(level)
+                print(f"{name:6} c={concurrency:<4} n={level['pipelines']:<4} "
+                      f"{level['throughput_per_min']:>9} /min  p50={level['p50_seconds']}s  "
+                      f"p95={level['p95_seconds']}s  peak RSS={level['peak_rss_mb']} MB  "
+                      f"failed={level['failed']}")
+                for error in level["errors"]:
+                    print(f"    ✗ {error}")
+    finally:
+        s2_server.stop()
+        guideline_site.stop()
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({"settings": {k: str(v) for k, v in vars(args).items()}, "results": results}, f, indent=2)
+        print(f"\nResults saved at: {args.output.absolute()}")
+
+
+if __name__ == "__main__":
+    main()
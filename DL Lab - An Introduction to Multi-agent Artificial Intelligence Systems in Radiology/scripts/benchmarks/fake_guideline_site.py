@@ -0,0 +1,74 @@
+"""Local HTTP stand-in for guideline websites used by the offline benchmarks.
+
+Serves a deterministic HTML guideline page (with title, publisher and date metadata)
+for every `GET /topic/{index}` after a configurable latency, so the processing
+agent's batch fetch tool downloads and parses real pages without leaving the machine.
+"""
+
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html><head>
+<title>Guideline {index} | American College of Radiology</title>
+<meta name="description" content="Imaging recommendations for benchmark topic {index}.">
+<meta property="og:site_name" content="American College of Radiology">
+<meta name="citation_publication_date" content="2024/05/01">
+</head><body>
+<nav>Home | Guidelines | About</nav>
+<main><h1>Guideline {index}</h1>
+{paragraphs}
+</main>
+<footer>Copyright 2025 American College of Radiology</footer>
+</body></html>"""
+
+
+class FakeGuidelineSite:
+    """Threaded HTTP server that answers guideline page requests."""
+
+    def __init__(self, latency: float = 0.0, host: str = "127.0.0.1", port: int = 0):
+        self.latency = latency
+        self.request_count = 0
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                server.request_count += 1
+                if server.latency:
+                    time.sleep(server.latency)
+
+                if not self.path.startswith("/topic/"):
+                    self.send_response(404)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                index = self.path.rsplit("/", 1)[-1]
+                paragraphs = "\n".join(f"<p>Recommendation {i}. " + "Imaging is appropriate. " * 20 + "</p>"
+                                       for i in range(30))
+                payload = PAGE_TEMPLATE.format(index=index, paragraphs=paragraphs).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer((host, port), Handler)
+        self.httpd.daemon_threads = True
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    def page_url(self, index: int) -> str:
+        """URL of a guideline page."""
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/topic/{index}"
+
+    def start(self) -> "FakeGuidelineSite":
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
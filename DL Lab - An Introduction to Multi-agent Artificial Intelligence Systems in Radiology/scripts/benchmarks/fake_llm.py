@@ -0,0 +1,109 @@
+"""Scripted stand-in for Gemini used by the offline benchmarks.
+
+`ScriptedLlm` answers every request from a small script instead of calling a model,
+after an optional simulated latency. A script maps the name of the function whose
+response ended the request (or None at the start of an agent's turn) to a function
+that builds the response parts, which is enough to drive tool-calling agents through
+their loops. `install_scripted_models` swaps the model of every LlmAgent in a tree.
+"""
+
+import asyncio
+import random
+from typing import Callable, Dict, Optional
+from google.adk.agents import LlmAgent
+from google.adk.models.base_llm import BaseLlm
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+from google.genai import types
+
+# Gemini model name reported by the fake (built-in tools such as google_search check it)
+FAKE_MODEL_NAME = "gemini-2.5-flash"
+
+
+def text_reply(text_builder: Callable[[LlmRequest], str]) -> Callable[[LlmRequest], list]:
+    """Script step that answers with text."""
+    return lambda llm_request: [types.Part(text=text_builder(llm_request))]
+
+
+def tool_calls(calls_builder: Callable[[LlmRequest], list]) -> Callable[[LlmRequest], list]:
+    """Script step that calls tools; calls_builder returns a list of (name, args) tuples."""
+    def build(llm_request: LlmRequest) -> list:
+        return [
+            types.Part(function_call=types.FunctionCall(name=name, args=args))
+            for name, args in calls_builder(llm_request)
+        ]
+    return build
+
+
+def request_text(llm_request: LlmRequest) -> str:
+    """Concatenate all text in a request (user message and earlier agents' outputs)."""
+    texts = []
+    for content in llm_request.contents or []:
+        for part in content.parts or []:
+            if part.text:
+                texts.append(part.text)
+    return "\n".join(texts)
+
+
+def function_responses(llm_request: LlmRequest, name: str) -> list:
+    """Responses of every call to a tool in a request, oldest first."""
+    responses = []
+    for content in llm_request.contents or []:
+        for part in content.parts or []:
+            if part.function_response and part.function_response.name == name:
+                responses.append(part.function_response.response)
+    return responses
+
+
+def _last_function_response(llm_request: LlmRequest) -> Optional[str]:
+    if not llm_request.contents:
+        return None
+    for part in llm_request.contents[-1].parts or []:
+        if part.function_response:
+            return part.function_response.name
+    return None
+
+
+class ScriptedLlm(BaseLlm):
+    """Fake LLM that replies from a script after a simulated latency."""
+
+    script: Dict[Optional[str], Callable[[LlmRequest], list]]
+    latency: float = 0.0
+    jitter: float = 0.0
+
+    async def generate_content_async(self, llm_request: LlmRequest, stream: bool = False):
+        delay = self.latency + random.uniform(0, self.jitter)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        step = self.script.get(_last_function_response(llm_request), self.script[None])
+        parts = step(llm_request)
+
+        # Rough token accounting so instrumentation has something to report
+        instruction = llm_request.config.system_instruction if llm_request.config else None
+        prompt_tokens = (len(request_text(llm_request)) + len(instruction if isinstance(instruction, str) else "")) // 4
+        output_tokens = sum(len(p.text or "") for p in parts) // 4 + 1
+        yield LlmResponse(
+            content=types.Content(role="model", parts=parts),
+            usage_metadata=types.GenerateContentResponseUsageMetadata(
+                prompt_token_count=prompt_tokens,
+                candidates_token_count=output_tokens,
+                total_token_count=prompt_tokens + output_tokens,
+            ),
+        )
+
+
+def install_scripted_models(agent, scripts: dict, latency: float = 0.0, jitter: float = 0.0):
+    """Replace the model of every LlmAgent in an agent tree with a ScriptedLlm.
+
+    Args:
+        agent: Root of the agent tree
+        scripts: Agent name -> script (agents without a script answer with a short text)
+        latency: Simulated seconds per model call
+        jitter: Extra random seconds (0..jitter) per model call
+    """
+    if isinstance(agent, LlmAgent):
+        script = scripts.get(agent.name) or {None: text_reply(lambda _: f"{agent.name} finished.")}
+        agent.model = ScriptedLlm(model=FAKE_MODEL_NAME, script=script, latency=latency, jitter=jitter)
+    for sub_agent in agent.sub_agents:
+        install_scripted_models(sub_agent, scripts, latency, jitter)
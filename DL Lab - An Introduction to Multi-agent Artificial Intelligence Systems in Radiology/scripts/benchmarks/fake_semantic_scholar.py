@@ -0,0 +1,122 @@
+"""Local HTTP stand-in for the Semantic Scholar Graph API used by the offline benchmarks.
+
+Serves deterministic fake authors and papers for `GET /graph/v1/paper/search`,
+`/author/search` and `/author/{id}/papers` (paginated, honouring `fields`) after a
+configurable latency. Point the article agent's tools at it with the SEMANTIC_SCHOLAR_API_URL
+environment variable (set before the agents are imported).
+"""
+
+import json
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+PAPERS_PER_AUTHOR = 60
+
+
+def fake_papers(author_name: str, count: int = PAPERS_PER_AUTHOR) -> list:
+    """Deterministic fake papers for an author."""
+    seed = zlib.crc32(author_name.encode("utf-8"))
+    papers = []
+    for i in range(count):
+        papers.append({
+            "paperId": f"{seed:08x}{i:04d}",
+            "title": f"Deep learning study {i} on imaging by {author_name}",
+            "year": 2000 + (seed + i * 7) % 26,
+            "venue": ["Radiology", "Radiology: Artificial Intelligence", "AJR", "European Radiology"][i % 4],
+            "url": f"https://www.semanticscholar.org/paper/{seed:08x}{i:04d}",
+            "citationCount": (seed >> (i % 16)) % 500,
+            "authors": [{"authorId": str(seed % 100000 + j), "name": name}
+                        for j, name in enumerate([author_name, "A. Coauthor", "B. Coauthor",
+                                                  "C. Coauthor", "D. Coauthor", "E. Coauthor"])],
+            "abstract": "Lorem ipsum " * 40,
+        })
+    return papers
+
+
+def select_fields(papers: list, params: dict) -> list:
+    """Keep only the requested `fields` (plus paperId), like the real API."""
+    if "fields" not in params:
+        return papers
+    fields = set(params["fields"][0].split(",")) | {"paperId"}
+    return [{key: value for key, value in paper.items() if key in fields} for paper in papers]
+
+
+class FakeSemanticScholarServer:
+    """Threaded HTTP server that answers Semantic Scholar paper searches."""
+
+    def __init__(self, latency: float = 0.0, host: str = "127.0.0.1", port: int = 0):
+        self.latency = latency
+        self.request_count = 0
+        self.bytes_sent = 0
+        self.authors = {}
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                server.request_count += 1
+                if server.latency:
+                    time.sleep(server.latency)
+
+                parsed = urlparse(self.path)
+                params = parse_qs(parsed.query)
+                if parsed.path.endswith("/paper/search"):
+                    query = params.get("query", [""])[0]
+                    author_name = query.removeprefix("author:").strip('"')
+                    limit = int(params.get("limit", ["100"])[0])
+                    body = {"total": PAPERS_PER_AUTHOR, "offset": 0,
+                            "data": select_fields(fake_papers(author_name)[:limit], params)}
+                    self._send(200, body)
+                elif parsed.path.endswith("/author/search"):
+                    author_name = params.get("query", [""])[0]
+                    author_id = str(zlib.crc32(author_name.encode("utf-8")))
+                    server.authors[author_id] = author_name
+                    self._send(200, {"total": 1, "offset": 0, "data": [
+                        {"authorId": author_id, "name": author_name, "paperCount": PAPERS_PER_AUTHOR}
+                    ]})
+                elif parsed.path.endswith("/papers") and "/author/" in parsed.path:
+                    author_id = parsed.path.rsplit("/", 2)[-2]
+                    if author_id not in server.authors:
+                        self._send(404, {"error": "Author not found"})
+                        return
+                    offset = int(params.get("offset", ["0"])[0])
+                    limit = int(params.get("limit", ["100"])[0])
+                    papers = fake_papers(server.authors[author_id])
+                    body = {"offset": offset, "data": select_fields(papers[offset:offset + limit], params)}
+                    if offset + limit < len(papers):
+                        body["next"] = offset + limit
+                    self._send(200, body)
+                else:
+                    self._send(404, {"error": f"Unknown endpoint {parsed.path}"})
+
+            def _send(self, status: int, body: dict):
+                payload = json.dumps(body).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+                server.bytes_sent += len(payload)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer((host, port), Handler)
+        self.httpd.daemon_threads = True
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def api_url(self) -> str:
+        """Base URL to use as SEMANTIC_SCHOLAR_API_URL."""
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/graph/v1"
+
+    def start(self) -> "FakeSemanticScholarServer":
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
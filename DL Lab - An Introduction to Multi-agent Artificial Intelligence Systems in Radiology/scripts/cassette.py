@@ -0,0 +1,261 @@
+"""Record and replay the model and tool traffic of ADK runner pipelines.
+
+`CassettePlugin` is an ADK plugin. In "record" mode it runs the pipeline live and
+writes every model call (Gemini, including its Google Search grounding) and every
+tool call (function tools such as get_semantic_scholar_papers and fetch_guidelines,
+and MCP tools) to a cassette: one JSON line per call, gzip-compressed when the file
+name ends in .gz. In "replay" mode it answers the same calls from the cassette
+without any network access, so parsing, state handling and markdown/CSV generation
+can be measured and regression-tested in isolation:
+
+- Calls are matched by agent and a hash of the request (model calls: instruction
+  and conversation; tool calls: tool name and arguments), so concurrent runs replay
+  correctly; identical calls are replayed in recorded order
+- Replay runs at full speed, or sleeps the recorded latency of each call
+  (`latency_scale=1.0`, or e.g. 0.5 for half of it) to reproduce a slow run
+- Tools with local side effects (LOCAL_TOOLS, e.g. create_guidelines_csv) always run
+- Recorded errors are raised again; a call missing from the cassette raises
+  CassetteMissError (or goes live with `on_miss="live"`)
+
+Usage:
+    cassette = CassettePlugin(Path("jane_doe.jsonl.gz"), mode="record")   # or mode="replay"
+    runner = Runner(agent=root_agent, app_name="agents", session_service=..., plugins=[cassette])
+
+    python -m scripts.run_networking_agent --record jane_doe.jsonl.gz "Jane Doe"
+    python -m scripts.run_networking_agent --replay jane_doe.jsonl.gz --replay-latency 1 "Jane Doe"
+    python -m scripts.cassette info jane_doe.jsonl.gz
+
+Install it first in the runner's plugin list, so that it sees each request before
+other plugins change or answer it.
+"""
+
+import argparse
+import asyncio
+import gzip
+import hashlib
+import json
+import time
+from collections import defaultdict, deque
+from pathlib import Path
+from typing import Optional
+from google.adk.models import LlmResponse
+from google.adk.plugins import BasePlugin
+
+PLUGIN_NAME = "cassette"
+CASSETTE_VERSION = 1
+
+# Tools that only work on local files: they run on replay too
+LOCAL_TOOLS = ("create_guidelines_csv",)
+
+
+class CassetteMissError(Exception):
+    """Raised on replay when a call is not in the cassette."""
+
+
+class ReplayedError(Exception):
+    """A model or tool error that was recorded and is raised again on replay."""
+
+
+def _open(path: Path, mode: str):
+    return gzip.open(path, mode + "t", encoding="utf-8") if path.suffix == ".gz" else open(path, mode, encoding="utf-8")
+
+
+def _hash(value) -> str:
+    return hashlib.sha256(json.dumps(value, sort_keys=True, default=str).encode("utf-8")).hexdigest()[:32]
+
+
+def model_request_key(agent_name: str, llm_request) -> str:
+    """Hash of what the model is asked: model, instruction, conversation and tools.
+
+    Function call IDs are generated per run and are left out.
+    """
+    config = llm_request.config
+    instruction = config.system_instruction if config else None
+    if instruction is not None and not isinstance(instruction, str):
+        instruction = [part.text for part in (instruction.parts or [])]
+    contents = []
+    for content in llm_request.contents or []:
+        for part in content.parts or []:
+            if part.text:
+                contents.append((content.role, "text", part.text))
+            elif part.function_call:
+                contents.append((content.role, "call", part.function_call.name, part.function_call.args))
+            elif part.function_response:
+                contents.append((content.role, "response", part.function_response.name,
+                                 part.function_response.response))
+    tools = sorted(llm_request.tools_dict) if getattr(llm_request, "tools_dict", None) else []
+    return _hash([agent_name, llm_request.model, instruction, contents, tools])
+
+
+def tool_call_key(agent_name: str, tool_name: str, tool_args: dict) -> str:
+    """Hash of a tool call: agent, tool name and arguments."""
+    return _hash([agent_name, tool_name, tool_args])
+
+
+class CassettePlugin(BasePlugin):
+    """ADK plugin that records model and tool calls to a cassette, or replays them."""
+
+    def __init__(self, path: Path, mode: str = "replay", latency_scale: float = 0.0,
+                 on_miss: str = "error", local_tools: tuple = LOCAL_TOOLS, name: str = PLUGIN_NAME):
+        """Open a cassette.
+
+        Args:
+            path: Cassette file (JSON lines; gzip-compressed if the name ends in .gz)
+            mode: "record" (run live and write the cassette) or "replay"
+            latency_scale: On replay, sleep this fraction of each call's recorded latency
+                           (0 = full speed, 1 = as recorded)
+            on_miss: On replay, "error" raises CassetteMissError for unrecorded calls,
+                     "live" runs them for real
+            local_tools: Tools that always run (their effects are local)
+            name: Plugin name
+        """
+        if mode not in ("record", "replay"):
+            raise ValueError(f"Unknown cassette mode: {mode}")
+        super().__init__(name=name)
+        self.path = Path(path)
+        self.mode = mode
+        self.latency_scale = latency_scale
+        self.on_miss = on_miss
+        self.local_tools = set(local_tools)
+        self.stats = {"recorded": 0, "replayed": 0, "misses": 0, "injected_seconds": 0.0}
+        self._started = {}
+        self._entries = defaultdict(deque)
+        self._file = None
+
+        if mode == "record":
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = _open(self.path, "w")
+            self._write({"cassette": CASSETTE_VERSION, "recorded_at": time.strftime("%Y-%m-%dT%H:%M:%S")})
+        else:
+            for entry in read_cassette(self.path):
+                self._entries[(entry["kind"], entry["key"])].append(entry)
+
+    def _write(self, entry: dict):
+        self._file.write(json.dumps(entry, separators=(",", ":"), ensure_ascii=False) + "\n")
+        self._file.flush()
+
+    def _record(self, kind: str, key: str, agent: str, name: str, started: Optional[float], **fields):
+        seconds = round(time.perf_counter() - started, 4) if started is not None else 0.0
+        self._write(dict(kind=kind, key=key, agent=agent, name=name, seconds=seconds, **fields))
+        self.stats["recorded"] += 1
+
+    async def _replay(self, kind: str, key: str, agent: str, name: str) -> Optional[dict]:
+        """The recorded entry for a call (after its latency), or None to run it live."""
+        entries = self._entries.get((kind, key))
+        if not entries:
+            self.stats["misses"] += 1
+            if self.on_miss == "live":
+                return None
+            raise CassetteMissError(f"{kind} call of {agent} ({name}) is not in {self.path}")
+        # Identical calls replay in recorded order; the last one answers any repeats
+        entry = entries.popleft() if len(entries) > 1 else entries[0]
+        self.stats["replayed"] += 1
+        if self.latency_scale > 0 and entry["seconds"]:
+            delay = entry["seconds"] * self.latency_scale
+            self.stats["injected_seconds"] += delay
+            await asyncio.sleep(delay)
+        if "error" in entry:
+            raise ReplayedError(entry["error"])
+        return entry
+
+    async def before_model_callback(self, *, callback_context, llm_request):
+        agent = callback_context.agent_name
+        key = model_request_key(agent, llm_request)
+        if self.mode == "record":
+            self._started[(callback_context.invocation_id, agent)] = (time.perf_counter(), key, llm_request.model)
+            return None
+        entry = await self._replay("model", key, agent, llm_request.model)
+        return LlmResponse.model_validate(entry["response"]) if entry is not None else None
+
+    async def after_model_callback(self, *, callback_context, llm_response):
+        if self.mode != "record" or llm_response.partial:
+            return None
+        pending = self._started.pop((callback_context.invocation_id, callback_context.agent_name), None)
+        if pending is not None:
+            started, key, model = pending
+            self._record("model", key, callback_context.agent_name, model, started,
+                         response=llm_response.model_dump(mode="json", exclude_none=True))
+        return None
+
+    async def on_model_error_callback(self, *, callback_context, llm_request, error):
+        if self.mode != "record":
+            return None
+        pending = self._started.pop((callback_context.invocation_id, callback_context.agent_name), None)
+        if pending is not None:
+            started, key, model = pending
+            self._record("model", key, callback_context.agent_name, model, started,
+                         error=f"{type(error).__name__}: {error}")
+        return None
+
+    async def before_tool_callback(self, *, tool, tool_args, tool_context):
+        if tool.name in self.local_tools:
+            return None
+        key = tool_call_key(tool_context.agent_name, tool.name, tool_args)
+        if self.mode == "record":
+            self._started[tool_context.function_call_id] = time.perf_counter()
+            return None
+        entry = await self._replay("tool", key, tool_context.agent_name, tool.name)
+        return entry["response"] if entry is not None else None
+
+    async def after_tool_callback(self, *, tool, tool_args, tool_context, result):
+        if self.mode == "record" and tool.name not in self.local_tools:
+            self._record("tool", tool_call_key(tool_context.agent_name, tool.name, tool_args),
+                         tool_context.agent_name, tool.name, self._started.pop(tool_context.function_call_id, None),
+                         response=json.loads(json.dumps(result, default=str)))
+        return None
+
+    async def on_tool_error_callback(self, *, tool, tool_args, tool_context, error):
+        if self.mode == "record" and tool.name not in self.local_tools:
+            self._record("tool", tool_call_key(tool_context.agent_name, tool.name, tool_args),
+                         tool_context.agent_name, tool.name, self._started.pop(tool_context.function_call_id, None),
+                         error=f"{type(error).__name__}: {error}")
+        return None
+
+    async def close(self):
+        """Finish writing the cassette."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+def read_cassette(path: Path) -> list:
+    """The recorded calls of a cassette (the header line is skipped).
+
+    Raises:
+        ValueError: If the file is not a cassette of a supported version
+    """
+    with _open(Path(path), "r") as f:
+        header = json.loads(f.readline() or "{}")
+        if header.get("cassette") != CASSETTE_VERSION:
+            raise ValueError(f"{path} is not a version {CASSETTE_VERSION} cassette")
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def cassette_summary(path: Path) -> dict:
+    """Calls, errors and recorded seconds per agent and call (model or tool name)."""
+    calls = {}
+    for entry in read_cassette(path):
+        stats = calls.setdefault(f"{entry['agent']} / {entry['kind']}:{entry['name']}",
+                                 {"calls": 0, "errors": 0, "seconds": 0.0})
+        stats["calls"] += 1
+        stats["errors"] += "error" in entry
+        stats["seconds"] = round(stats["seconds"] + entry["seconds"], 3)
+    return {
+        "calls": sum(stats["calls"] for stats in calls.values()),
+        "recorded_seconds": round(sum(stats["seconds"] for stats in calls.values()), 3),
+        "by_call": calls,
+    }
+
+
+def main():
+    """Summarize a cassette."""
+    parser = argparse.ArgumentParser(description="Inspect a record/replay cassette.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    info_parser = commands.add_parser("info", help="Calls and recorded latency per agent and call")
+    info_parser.add_argument("path", type=Path)
+    args = parser.parse_args()
+    print(json.dumps(cassette_summary(args.path), indent=2))
+
+
+if __name__ == "__main__":
+    main()
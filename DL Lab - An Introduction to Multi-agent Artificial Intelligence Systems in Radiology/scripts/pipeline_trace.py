@@ -0,0 +1,288 @@
+"""Per-agent timing and token instrumentation for ADK runner pipelines.
+
+`PipelineTracer` is an ADK plugin: pass it to the Runner (`plugins=[tracer]`) and it
+records, for every run, the wall-clock span of each agent (including Sequential and
+Parallel agents), each LLM call with its token usage and Google Search queries, and
+each function tool call (e.g. `get_semantic_scholar_papers`).
+
+Google Search is a built-in Gemini tool that runs inside the model call, so its time
+is part of the LLM call spans; the number of search queries is recorded on them.
+
+Usage:
+    tracer = PipelineTracer()
+    runner = Runner(agent=root_agent, app_name="agents", session_service=..., plugins=[tracer])
+
+    with tracer.trace("Jane Doe") as run_trace:
+        profile = await run_agent_async("Jane Doe", runner=runner)
+
+    run_trace.write_chrome_trace(Path("jane_doe_trace.json"))  # open in chrome://tracing or Perfetto
+    print(run_trace.summary())
+
+Concurrent runs on the same runner are kept apart with a context variable, so one
+tracer can be shared by a whole batch. `aggregate_summaries` turns the summaries of a
+batch into percentiles.
+"""
+
+import json
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Optional
+from google.adk.plugins import BasePlugin
+
+# Branches of the networking agent's ParallelAgent whose overlap is reported
+PARALLEL_BRANCHES = ("url_finder_agent", "semantic_scholar_agent")
+
+_current_trace = ContextVar("current_trace", default=None)
+
+
+class RunTrace:
+    """Spans recorded for a single pipeline run."""
+
+    def __init__(self, label: str):
+        self.label = label
+        self.start = time.perf_counter()
+        self.end = None
+        self.spans = []
+        self._open = {}
+
+    def _now(self) -> float:
+        return time.perf_counter() - self.start
+
+    def open_span(self, key: tuple, name: str, category: str, author: str, **args):
+        """Start a span (keys identify the span when it is closed)."""
+        self._open[key] = {"name": name, "cat": category, "author": author,
+                           "start": self._now(), "end": None, "args": args}
+
+    def close_span(self, key: tuple, **args):
+        """Finish a span started with open_span."""
+        span = self._open.pop(key, None)
+        if span is None:
+            return
+        span["end"] = self._now()
+        span["args"].update(args)
+        self.spans.append(span)
+
+    def finish(self):
+        """Stop the run clock and close spans that never finished (e.g. skipped agents)."""
+        self.end = self._now()
+        for key in list(self._open):
+            self.close_span(key, incomplete=True)
+
+    def _spans(self, category: str) -> list:
+        return [span for span in self.spans if span["cat"] == category]
+
+    def summary(self) -> dict:
+        """Summarize the run: agent time, LLM calls and tokens, tool calls and branch overlap.
+
+        Returns:
+            Dictionary with the keys label, wall_seconds, agents, llm, tools and parallel
+        """
+        agents = {}
+        for span in self._spans("agent"):
+            agents[span["author"]] = round(span["end"] - span["start"], 3)
+
+        llm = {}
+        for span in self._spans("llm"):
+            stats = llm.setdefault(span["author"], {
+                "calls": 0, "seconds": 0.0, "prompt_tokens": 0, "output_tokens": 0,
+                "total_tokens": 0, "search_queries": 0,
+            })
+            stats["calls"] += 1
+            stats["seconds"] = round(stats["seconds"] + span["end"] - span["start"], 3)
+            for key in ("prompt_tokens", "output_tokens", "total_tokens", "search_queries"):
+                stats[key] += span["args"].get(key) or 0
+
+        tools = {}
+        for span in self._spans("tool"):
+            stats = tools.setdefault(span["name"], {"calls": 0, "seconds": 0.0})
+            stats["calls"] += 1
+            stats["seconds"] = round(stats["seconds"] + span["end"] - span["start"], 3)
+
+        return {
+            "label": self.label,
+            "wall_seconds": round(self.end if self.end is not None else self._now(), 3),
+            "agents": agents,
+            "llm": llm,
+            "tools": tools,
+            "parallel": self.parallel_overlap(),
+        }
+
+    def parallel_overlap(self, branches: tuple = PARALLEL_BRANCHES) -> Optional[dict]:
+        """Measure how well two parallel branches overlapped in time.
+
+        Returns:
+            Dictionary with each branch's duration, the overlapping seconds and the
+            overlap ratio (overlap / shorter branch; 1.0 means fully parallel), or
+            None if either branch did not run
+        """
+        spans = {span["author"]: span for span in self._spans("agent") if span["author"] in branches}
+        if len(spans) != len(branches):
+            return None
+
+        first, second = (spans[name] for name in branches)
+        overlap = max(0.0, min(first["end"], second["end"]) - max(first["start"], second["start"]))
+        shorter = min(first["end"] - first["start"], second["end"] - second["start"])
+
+        result = {name: round(spans[name]["end"] - spans[name]["start"], 3) for name in branches}
+        result["overlap_seconds"] = round(overlap, 3)
+        result["overlap_ratio"] = round(overlap / shorter, 3) if shorter > 0 else None
+        return result
+
+    def to_chrome_trace(self) -> dict:
+        """Export the spans in Chrome trace event format (one lane per agent)."""
+        lanes = {}
+        events = []
+        for span in sorted(self.spans, key=lambda s: s["start"]):
+            lane = lanes.setdefault(span["author"], len(lanes) + 1)
+            events.append({
+                "name": span["name"],
+                "cat": span["cat"],
+                "ph": "X",
+                "ts": round(span["start"] * 1e6),
+                "dur": round((span["end"] - span["start"]) * 1e6),
+                "pid": 1,
+                "tid": lane,
+                "args": span["args"],
+            })
+        for author, lane in lanes.items():
+            events.append({"name": "thread_name", "ph": "M", "pid": 1, "tid": lane,
+                           "args": {"name": author}})
+        return {"traceEvents": events, "otherData": {"label": self.label}}
+
+    def write_chrome_trace(self, path: Path) -> Path:
+        """Write the Chrome trace JSON file and return its path."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_chrome_trace(), f)
+        return path
+
+
+class PipelineTracer(BasePlugin):
+    """ADK plugin that records agent, LLM and tool spans into the current RunTrace."""
+
+    def __init__(self, name: str = "pipeline_tracer"):
+        super().__init__(name=name)
+
+    @contextmanager
+    def trace(self, label: str):
+        """Record everything the runner does in this context into a new RunTrace."""
+        run_trace = RunTrace(label)
+        token = _current_trace.set(run_trace)
+        try:
+            yield run_trace
+        finally:
+            run_trace.finish()
+            _current_trace.reset(token)
+
+    async def before_agent_callback(self, *, agent, callback_context):
+        run_trace = _current_trace.get()
+        if run_trace is not None:
+            run_trace.open_span(("agent", agent.name), agent.name, "agent", agent.name,
+                                agent_type=type(agent).__name__)
+        return None
+
+    async def after_agent_callback(self, *, agent, callback_context):
+        run_trace = _current_trace.get()
+        if run_trace is not None:
+            run_trace.close_span(("agent", agent.name))
+        return None
+
+    async def before_model_callback(self, *, callback_context, llm_request):
+        run_trace = _current_trace.get()
+        if run_trace is not None:
+            author = callback_context.agent_name
+            run_trace.open_span(("llm", author), f"llm:{author}", "llm", author,
+                                model=llm_request.model)
+        return None
+
+    async def after_model_callback(self, *, callback_context, llm_response):
+        run_trace = _current_trace.get()
+        if run_trace is None or llm_response.partial:
+            return None
+
+        args = {}
+        usage = llm_response.usage_metadata
+        if usage is not None:
+            args["prompt_tokens"] = usage.prompt_token_count
+            args["output_tokens"] = usage.candidates_token_count
+            args["total_tokens"] = usage.total_token_count
+        grounding = llm_response.grounding_metadata
+        if grounding is not None and grounding.web_search_queries:
+            args["search_queries"] = len(grounding.web_search_queries)
+
+        run_trace.close_span(("llm", callback_context.agent_name), **args)
+        return None
+
+    async def before_tool_callback(self, *, tool, tool_args, tool_context):
+        run_trace = _current_trace.get()
+        if run_trace is not None:
+            run_trace.open_span(("tool", tool_context.function_call_id), tool.name, "tool",
+                                tool_context.agent_name)
+        return None
+
+    async def after_tool_callback(self, *, tool, tool_args, tool_context, result):
+        run_trace = _current_trace.get()
+        if run_trace is not None:
+            run_trace.close_span(("tool", tool_context.function_call_id))
+        return None
+
+
+def percentile(values: list, q: float) -> Optional[float]:
+    """Linear-interpolated percentile (q in 0..100) of a list of numbers."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * q / 100
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def _distribution(values: list) -> dict:
+    return {
+        "count": len(values),
+        "p50": round(percentile(values, 50), 3),
+        "p95": round(percentile(values, 95), 3),
+        "max": round(max(values), 3),
+    }
+
+
+def aggregate_summaries(summaries: list) -> dict:
+    """Aggregate RunTrace summaries from a batch into p50/p95/max distributions.
+
+    Args:
+        summaries: Dictionaries returned by RunTrace.summary()
+
+    Returns:
+        Dictionary with distributions of the run wall time, each agent's time, each
+        tool's time, LLM prompt and total tokens per agent and the parallel overlap ratio
+    """
+    collected = {"wall_seconds": [], "agents": {}, "tools": {}, "llm_prompt_tokens": {},
+                 "llm_total_tokens": {}, "parallel_overlap_ratio": []}
+
+    for summary in summaries:
+        collected["wall_seconds"].append(summary["wall_seconds"])
+        for author, seconds in summary["agents"].items():
+            collected["agents"].setdefault(author, []).append(seconds)
+        for tool_name, stats in summary["tools"].items():
+            collected["tools"].setdefault(tool_name, []).append(stats["seconds"])
+        for author, stats in summary["llm"].items():
+            collected["llm_prompt_tokens"].setdefault(author, []).append(stats["prompt_tokens"])
+            collected["llm_total_tokens"].setdefault(author, []).append(stats["total_tokens"])
+        parallel = summary.get("parallel")
+        if parallel and parallel.get("overlap_ratio") is not None:
+            collected["parallel_overlap_ratio"].append(parallel["overlap_ratio"])
+
+    return {
+        "runs": len(summaries),
+        "wall_seconds": _distribution(collected["wall_seconds"]) if summaries else None,
+        "agents": {name: _distribution(v) for name, v in collected["agents"].items()},
+        "tools": {name: _distribution(v) for name, v in collected["tools"].items()},
+        "llm_prompt_tokens": {name: _distribution(v) for name, v in collected["llm_prompt_tokens"].items()},
+        "llm_total_tokens": {name: _distribution(v) for name, v in collected["llm_total_tokens"].items()},
+        "parallel_overlap_ratio": (_distribution(collected["parallel_overlap_ratio"])
+                                   if collected["parallel_overlap_ratio"] else None),
+    }
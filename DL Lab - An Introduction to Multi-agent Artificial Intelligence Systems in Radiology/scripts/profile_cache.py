@@ -0,0 +1,112 @@
+"""Profile cache for the networking agent.
+
+Stores validated NetworkingProfile JSON in a small SQLite database, keyed by the
+normalized person name, so that recently profiled people do not go through the
+whole multi-agent pipeline again.
+"""
+
+import sqlite3
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Optional
+
+# Default location and time-to-live of cached profiles
+DEFAULT_CACHE_DB = Path(__file__).parent / "agents" / "part5" / "networking_agent" / "profile_cache.db"
+DEFAULT_TTL_DAYS = 7
+
+
+class ProfileCache:
+    """SQLite-backed cache of networking profiles with a time-to-live.
+
+    Profiles are stored as JSON strings, so this module does not need to import the
+    agent tree. Hit, miss and store counts are kept in `stats`.
+    """
+
+    def __init__(self, db_path: Path = None, ttl_days: float = DEFAULT_TTL_DAYS):
+        """Open (and create if needed) the cache database.
+
+        Args:
+            db_path: SQLite database file (default: profile_cache.db in the networking_agent directory)
+            ttl_days: How long a cached profile stays valid, in days
+        """
+        self.db_path = Path(db_path or DEFAULT_CACHE_DB)
+        self.ttl_seconds = ttl_days * 24 * 60 * 60
+        self.stats = {"hits": 0, "misses": 0, "stores": 0}
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS profiles ("
+                "  cache_key TEXT PRIMARY KEY,"
+                "  person_name TEXT NOT NULL,"
+                "  profile_json TEXT NOT NULL,"
+                "  created_at REAL NOT NULL"
+                ")"
+            )
+
+    @contextmanager
+    def _connect(self):
+        """Open a connection that commits on success and is always closed."""
+        conn = sqlite3.connect(self.db_path)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def get(self, cache_key: str) -> Optional[str]:
+        """Return the cached profile JSON, or None if missing or expired.
+
+        Args:
+            cache_key: Normalized person name
+
+        Returns:
+            Profile JSON string, or None on a cache miss
+        """
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT profile_json, created_at FROM profiles WHERE cache_key = ?",
+                (cache_key,)
+            ).fetchone()
+
+        if row is None or time.time() - row[1] > self.ttl_seconds:
+            self.stats["misses"] += 1
+            return None
+
+        self.stats["hits"] += 1
+        return row[0]
+
+    def put(self, cache_key: str, person_name: str, profile_json: str):
+        """Store (or replace) a profile.
+
+        Args:
+            cache_key: Normalized person name
+            person_name: The name as requested (kept for inspection)
+            profile_json: Validated NetworkingProfile JSON
+        """
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO profiles (cache_key, person_name, profile_json, created_at) "
+                "VALUES (?, ?, ?, ?)",
+                (cache_key, person_name, profile_json, time.time())
+            )
+        self.stats["stores"] += 1
+
+    def purge_expired(self) -> int:
+        """Delete expired profiles.
+
+        Returns:
+            Number of deleted profiles
+        """
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "DELETE FROM profiles WHERE created_at < ?",
+                (time.time() - self.ttl_seconds,)
+            )
+        return cursor.rowcount
+
+    def hit_rate(self) -> Optional[float]:
+        """Fraction of lookups that were hits (None if there were no lookups)."""
+        lookups = self.stats["hits"] + self.stats["misses"]
+        return self.stats["hits"] / lookups if lookups else None
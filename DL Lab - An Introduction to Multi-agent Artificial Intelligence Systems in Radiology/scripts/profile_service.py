@@ -0,0 +1,222 @@
+"""Long-lived networking profile service.
+
+Instead of starting a new `run_networking_agent` process per name (re-loading the
+environment, re-importing google.adk and rebuilding the agent tree every time), this
+service loads everything once and keeps the agent tree, runner, session service,
+profile cache and HTTP clients warm. Profile jobs are queued behind a concurrency cap
+and their progress is streamed back as newline-delimited JSON.
+
+Start the service (from the lab directory):
+    python -m scripts.profile_service --port 8765 --concurrency 4
+    python -m scripts.profile_service --unix /tmp/profiles.sock
+
+Request a profile (streams progress lines, then the result):
+    curl -N -X POST http://127.0.0.1:8765/profiles -d '{"name": "Jane Doe"}'
+    curl -N -X POST http://127.0.0.1:8765/profiles -d '{"name": "Jane Doe", "format": "json", "refresh": true}'
+    curl --unix-socket /tmp/profiles.sock http://localhost/health
+
+Each streamed line is a JSON object with an "event" field:
+    queued    - the job was accepted ("waiting" / "running" = other jobs queued / running)
+    started   - the pipeline started
+    progress  - a new agent started producing events ("agent")
+    done      - "markdown" or "profile" (JSON), plus "cached" and "seconds"
+    error     - the job failed ("error")
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from pathlib import Path
+from scripts.run_networking_agent import (
+    DEFAULT_CONCURRENCY,
+    create_runner,
+    profile_to_markdown,
+    run_cached_agent_async,
+    search_memo_metrics,
+)
+from scripts.profile_cache import ProfileCache, DEFAULT_TTL_DAYS
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+MAX_BODY_BYTES = 64 * 1024
+
+STATUS_TEXT = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed"}
+
+
+class ProfileService:
+    """Queues profile jobs on one warm runner and streams their progress."""
+
+    def __init__(self, concurrency: int = DEFAULT_CONCURRENCY, cache: ProfileCache = None,
+                 speculative: bool = False):
+        self.runner = create_runner(speculative=speculative)
+        self.cache = cache
+        self.semaphore = asyncio.Semaphore(max(1, concurrency))
+        self.stats = {"queued": 0, "running": 0, "completed": 0, "failed": 0}
+
+    async def run_job(self, person_name: str, output_format: str, refresh: bool, send):
+        """Run one profile job, calling `send(message)` for every progress message."""
+        self.stats["queued"] += 1
+        await send({"event": "queued", "waiting": self.stats["queued"] - 1, "running": self.stats["running"]})
+
+        async with self.semaphore:
+            self.stats["queued"] -= 1
+            self.stats["running"] += 1
+            start = time.perf_counter()
+            await send({"event": "started", "person_name": person_name})
+
+            # Report each agent the first time it produces an event
+            seen_agents = set()
+            progress = asyncio.Queue()
+
+            def on_event(event):
+                author = getattr(event, 'author', None)
+                if author and author != "user" and author not in seen_agents:
+                    seen_agents.add(author)
+                    progress.put_nowait({"event": "progress", "agent": author})
+
+            job = asyncio.create_task(run_cached_agent_async(
+                person_name, runner=self.runner, cache=self.cache, refresh=refresh, on_event=on_event
+            ))
+            try:
+                while not job.done() or not progress.empty():
+                    getter = asyncio.ensure_future(progress.get())
+                    await asyncio.wait({job, getter}, return_when=asyncio.FIRST_COMPLETED)
+                    if getter.done():
+                        await send(getter.result())
+                    else:
+                        getter.cancel()
+
+                profile, cached = job.result()
+                result = {"event": "done", "person_name": person_name, "cached": cached,
+                          "seconds": round(time.perf_counter() - start, 2)}
+                if output_format == "json":
+                    result["profile"] = json.loads(profile.model_dump_json())
+                else:
+                    result["markdown"] = profile_to_markdown(profile)
+                self.stats["completed"] += 1
+                await send(result)
+            except Exception as e:
+                self.stats["failed"] += 1
+                await send({"event": "error", "person_name": person_name, "error": str(e)})
+            finally:
+                if not job.done():
+                    job.cancel()
+                self.stats["running"] -= 1
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Handle one HTTP/1.1 request (the connection is closed afterwards)."""
+        try:
+            request_line = (await reader.readline()).decode("latin-1").strip()
+            if not request_line:
+                return
+            method, path, _ = (request_line.split(" ", 2) + ["", ""])[:3]
+
+            headers = {}
+            while True:
+                line = (await reader.readline()).decode("latin-1").strip()
+                if not line:
+                    break
+                key, _, value = line.partition(":")
+                headers[key.strip().lower()] = value.strip()
+
+            length = min(int(headers.get("content-length", 0) or 0), MAX_BODY_BYTES)
+            body = await reader.readexactly(length) if length else b""
+
+            if path == "/health" and method == "GET":
+                await self._respond(writer, 200, dict(self.stats, status="ok",
+                                                      search_memo=search_memo_metrics(self.runner)))
+            elif path == "/profiles" and method == "POST":
+                await self._handle_profile_request(writer, body)
+            elif path in ("/health", "/profiles"):
+                await self._respond(writer, 405, {"error": f"{method} is not allowed on {path}"})
+            else:
+                await self._respond(writer, 404, {"error": f"Unknown path {path}"})
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def _handle_profile_request(self, writer: asyncio.StreamWriter, body: bytes):
+        try:
+            request = json.loads(body or b"{}")
+            person_name = str(request.get("name", "")).strip()
+        except (ValueError, AttributeError):
+            await self._respond(writer, 400, {"error": "Body must be a JSON object"})
+            return
+
+        output_format = request.get("format", "markdown")
+        if not person_name or output_format not in ("markdown", "json"):
+            await self._respond(writer, 400, {"error": "Expected {\"name\": ..., \"format\": \"markdown\"|\"json\"}"})
+            return
+
+        writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: application/x-ndjson\r\n"
+                     b"Transfer-Encoding: chunked\r\nConnection: close\r\n\r\n")
+
+        async def send(message: dict):
+            line = (json.dumps(message) + "\n").encode("utf-8")
+            writer.write(f"{len(line):X}\r\n".encode("ascii") + line + b"\r\n")
+            await writer.drain()
+
+        await self.run_job(person_name, output_format, bool(request.get("refresh")), send)
+        writer.write(b"0\r\n\r\n")
+        await writer.drain()
+
+    async def _respond(self, writer: asyncio.StreamWriter, status: int, body: dict):
+        payload = json.dumps(body).encode("utf-8")
+        writer.write(
+            f"HTTP/1.1 {status} {STATUS_TEXT[status]}\r\nContent-Type: application/json\r\n"
+            f"Content-Length: {len(payload)}\r\nConnection: close\r\n\r\n".encode("ascii") + payload
+        )
+        await writer.drain()
+
+
+async def serve(args: argparse.Namespace):
+    """Start the service and run until interrupted."""
+    cache = None if args.no_cache else ProfileCache(args.cache_db, ttl_days=args.cache_ttl)
+    service = ProfileService(concurrency=args.concurrency, cache=cache, speculative=args.speculative)
+
+    if args.unix:
+        server = await asyncio.start_unix_server(service.handle_connection, path=str(args.unix))
+        address = f"unix:{args.unix}"
+    else:
+        server = await asyncio.start_server(service.handle_connection, args.host, args.port)
+        address = f"http://{args.host}:{args.port}"
+
+    print(f"Networking profile service listening on {address} "
+          f"(up to {args.concurrency} profiles at a time)")
+    async with server:
+        await server.serve_forever()
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Serve networking profiles from a warm agent process.")
+    parser.add_argument("--host", default=DEFAULT_HOST, help=f"Host to bind (default: {DEFAULT_HOST})")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"Port to bind (default: {DEFAULT_PORT})")
+    parser.add_argument("--unix", type=Path, help="Listen on this Unix socket instead of TCP")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY,
+                        help=f"Maximum number of profiles researched at once (default: {DEFAULT_CONCURRENCY})")
+    parser.add_argument("--no-cache", action="store_true", help="Do not read or write the profile cache")
+    parser.add_argument("--cache-ttl", type=float, default=DEFAULT_TTL_DAYS, metavar="DAYS",
+                        help=f"How long cached profiles stay valid (default: {DEFAULT_TTL_DAYS} days)")
+    parser.add_argument("--cache-db", type=Path, help="Profile cache database")
+    parser.add_argument("--speculative", action="store_true",
+                        help="Start the research while the radiologist verification is still running")
+    return parser.parse_args(argv)
+
+
+def main():
+    """Main function to run the profile service."""
+    try:
+        asyncio.run(serve(parse_args()))
+    except KeyboardInterrupt:
+        print("\nProfile service stopped.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,12 @@
+"""Command line for the shared HTTP response cache (agents/response_cache.py).
+
+Usage (from the lab directory):
+    python -m scripts.response_cache stats
+    python -m scripts.response_cache list --source semantic_scholar
+    python -m scripts.response_cache purge --expired
+"""
+
+from scripts.agents.response_cache import main
+
+if __name__ == "__main__":
+    main()
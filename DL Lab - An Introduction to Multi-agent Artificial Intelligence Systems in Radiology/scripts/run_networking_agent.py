@@ -1,28 +1,36 @@
 """Main script to run the networking agent and generate markdown profile."""
 
+from __future__ import annotations
+
+import os
 import sys
+import csv
 import json
+import time
 import uuid
-import os
+import argparse
+from collections import deque
+from contextlib import aclosing, nullcontext
 from pathlib import Path
-from dotenv import load_dotenv
-from scripts.agents.part5.networking_agent.agent import root_agent
-from scripts.agents.part5.networking_agent.sub_agents.formatter_agent import NetworkingProfile
-from google.adk import Runner
-from google.adk.sessions import InMemorySessionService
-from google.adk.runners import types
+from typing import TYPE_CHECKING, Callable, Optional
+from scripts.agents.part5.networking_agent.profile_models import NetworkingProfile
+from scripts.agents.env import load_environment
+from scripts.profile_cache import ProfileCache, DEFAULT_CACHE_DB, DEFAULT_TTL_DAYS
 import asyncio
 
-# Load environment variables from .env file in the same directory as main.py
-env_path = ".env"
-load_dotenv(env_path)
+# google.adk and the agent tree are imported on first use (see create_runner), so
+# `--help`, argument errors and cached profiles never pay for loading them
+if TYPE_CHECKING:
+    from google.adk import Runner
 
-# Ensure API key is loaded
-api_key = os.getenv("GOOGLE_API_KEY") or os.getenv("GOOGLE_GENAI_API_KEY")
-if not api_key:
-    raise ValueError(
-        "Please set GOOGLE_API_KEY or GOOGLE_GENAI_API_KEY in your .env file"
-    )
+APP_NAME = "agents"
+USER_ID = "user"
+DEFAULT_CONCURRENCY = 4
+FORMATTER_AGENT_NAME = "profile_formatter_agent"
+DEBUG_EVENT_HISTORY = 5
+
+# SQLite session store used by --resume to checkpoint each pipeline stage
+DEFAULT_SESSION_DB = Path(__file__).parent / "agents" / "part5" / "networking_agent" / "networking_sessions.db"
 
 
 def profile_to_markdown(profile: NetworkingProfile) -> str:
@@ -94,36 +102,213 @@ def profile_to_markdown(profile: NetworkingProfile) -> str:
     return "".join(markdown_parts)
 
 
-async def run_agent_async(person_name: str) -> NetworkingProfile:
+class ProfileExtractor:
+    """Incrementally extract the NetworkingProfile from a stream of ADK events.
+    
+    Each event is inspected once as it arrives. Only complete text parts authored by
+    the formatter agent are validated against NetworkingProfile, and only a small
+    ring buffer of recent events is kept for debug output, so memory stays flat no
+    matter how long the event stream is.
+    """
+    
+    def __init__(self, author: str = FORMATTER_AGENT_NAME, history: int = DEBUG_EVENT_HISTORY):
+        self.author = author
+        self.event_count = 0
+        self.recent_events = deque(maxlen=history)
+        self.last_text = None
+    
+    def feed(self, event) -> Optional[NetworkingProfile]:
+        """Process one event.
+        
+        Args:
+            event: Event yielded by Runner.run_async
+        
+        Returns:
+            The NetworkingProfile once the formatter's output validates, otherwise None
+        """
+        self.event_count += 1
+        self.recent_events.append(event)
+        
+        # Skip events from other agents and streamed partial chunks
+        if getattr(event, 'author', None) != self.author or getattr(event, 'partial', False):
+            return None
+        if not event.content or not event.content.parts:
+            return None
+        
+        for part in event.content.parts:
+            if not part.text:
+                continue
+            self.last_text = part.text
+            try:
+                return NetworkingProfile.model_validate_json(part.text)
+            except ValueError:
+                continue
+        
+        return None
+    
+    def print_debug(self):
+        """Print a short summary of the most recent events."""
+        if not self.event_count:
+            return
+        print(f"Debug: Received {self.event_count} events")
+        print(f"Debug: Recent event authors: {[getattr(e, 'author', None) for e in self.recent_events]}")
+        if self.last_text:
+            print(f"Debug: Last {self.author} text (first 500 chars): {self.last_text[:500]}")
+
+
+def normalize_person_name(person_name: str) -> str:
+    """Normalize a person's name for use in filenames and session IDs.
+    
+    Args:
+        person_name: The name of the person
+    
+    Returns:
+        Lower-case name with only letters, digits, '-' and '_' (spaces become '_')
+    """
+    safe_name = "".join(c if c.isalnum() or c in (' ', '-', '_') else '' for c in person_name)
+    return safe_name.replace(' ', '_').lower()
+
+
+def batch_person_keys(person_names: list) -> dict:
+    """Give every person of a batch a distinct key for their files, session and cache entry.
+    
+    Different names can normalize to the same key ("Jane Doe" and "JANE DOE."); later
+    ones get a numeric suffix, so concurrent pipelines neither overwrite each other's
+    files and cached profile nor share a resumable session.
+    
+    Args:
+        person_names: Names of the people in the batch
+    
+    Returns:
+        Dictionary mapping each name to a normalized name that is unique in the batch
+    """
+    person_keys = {}
+    used = set()
+    for person_name in person_names:
+        base = normalize_person_name(person_name)
+        person_key, suffix = base, 2
+        while person_key in used:
+            person_key, suffix = f"{base}_{suffix}", suffix + 1
+        if person_key != base:
+            print(f"Note: '{person_name}' is saved as {person_key} (another name in the batch is also {base})")
+        used.add(person_key)
+        person_keys[person_name] = person_key
+    return person_keys
+
+
+def create_checkpoint_session_service(db_path: Path = None):
+    """Create a persistent session service for resumable runs.
+    
+    Session state (including every stage's output, see networking_agent/checkpoints.py)
+    is stored in SQLite, so a rerun can pick up where a failed or interrupted run stopped.
+    
+    Args:
+        db_path: SQLite database file (default: networking_sessions.db in the networking_agent directory)
+    
+    Returns:
+        SqliteSessionService instance
+    """
+    from google.adk.sessions.sqlite_session_service import SqliteSessionService
+    
+    db_path = Path(db_path or DEFAULT_SESSION_DB)
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    return SqliteSessionService(str(db_path))
+
+
+def create_runner(session_service=None, plugins: list = None, speculative: bool = False,
+                  cassette=None) -> Runner:
+    """Create a Runner for the networking agent.
+    
+    A single runner (and its session service) can be shared by many concurrent
+    `run_agent_async` calls, since every call works in its own session.
+    
+    Args:
+        session_service: Session service to use (default: a new InMemorySessionService)
+        plugins: ADK plugins to install on the runner (e.g. a PipelineTracer); a
+                 SearchMemoPlugin shared by all runs on the runner is installed first
+                 unless SEARCH_MEMO=off
+        speculative: Use the speculative pipeline, which starts the research while the
+                     radiologist verification is still running (see networking_agent/speculative.py)
+        cassette: CassettePlugin that records or replays the model and tool calls (see
+                  scripts/cassette.py); installed first, and without the search memo, so
+                  that every call reaches it unchanged
+    
+    Returns:
+        Runner bound to the networking root agent
+    """
+    from google.adk import Runner
+    from google.adk.sessions import InMemorySessionService
+    from scripts import agents
+    from scripts.search_memo import open_search_memo
+    
+    if session_service is None:
+        session_service = InMemorySessionService()
+    
+    # The memo comes first: a memo hit ends the model call before later plugins see it
+    search_memo = open_search_memo() if cassette is None else None
+    if search_memo is not None:
+        plugins = [search_memo] + list(plugins or [])
+    if cassette is not None:
+        plugins = [cassette] + list(plugins or [])
+    
+    return Runner(
+        agent=agents.get("part5.networking_agent.speculative" if speculative else "part5.networking_agent"),
+        app_name=APP_NAME,
+        session_service=session_service,
+        plugins=plugins
+    )
+
+
+def search_memo_metrics(runner: Runner) -> Optional[dict]:
+    """Hit rates of the runner's Google Search memo (None if it has none)."""
+    from scripts.search_memo import PLUGIN_NAME
+    
+    search_memo = runner.plugin_manager.get_plugin(PLUGIN_NAME)
+    return search_memo.metrics() if search_memo is not None else None
+
+
+async def run_agent_async(person_name: str, runner: Runner = None, resume: bool = False,
+                          on_event: Callable = None, person_key: str = None) -> NetworkingProfile:
     """Run the networking agent with a given person's name (async version).
     
     Args:
         person_name: The name of the person to research
+        runner: Runner to reuse (default: a new runner with an in-memory session service)
+        resume: Reuse this person's checkpointed session so that stages that already
+                finished are skipped (needs a persistent session service on the runner)
+        on_event: Optional callback called with every event as it arrives (e.g. for progress)
+        person_key: Names the resumable session (default: the normalized person name)
     
     Returns:
         NetworkingProfile Pydantic model instance
     """
-    # Create session service
-    session_service = InMemorySessionService()
-    
-    # Create a unique session ID
-    session_id = str(uuid.uuid4())
-    user_id = "user"
-    app_name = "agents"
-    
-    # Create the session explicitly before running (as per ADK documentation)
-    _ = await session_service.create_session(
-        app_name=app_name,
-        user_id=user_id,
-        session_id=session_id
-    )
+    from google.genai import types
     
-    # Create runner with the root agent
-    runner = Runner(
-        agent=root_agent,
-        app_name=app_name,
-        session_service=session_service
-    )
+    if runner is None:
+        runner = create_runner()
+    
+    user_id = USER_ID
+    session = None
+    
+    if resume:
+        # One session per person, so a rerun finds the previous run's checkpoints
+        session_id = f"networking-{person_key or normalize_person_name(person_name)}"
+        session = await runner.session_service.get_session(
+            app_name=runner.app_name,
+            user_id=user_id,
+            session_id=session_id
+        )
+    else:
+        # Create a unique session ID
+        session_id = str(uuid.uuid4())
+    
+    if session is None:
+        # Create the session explicitly before running (as per ADK documentation)
+        _ = await runner.session_service.create_session(
+            app_name=runner.app_name,
+            user_id=user_id,
+            session_id=session_id
+        )
     
     # Create the message content
     message = types.Content(
@@ -131,80 +316,129 @@ async def run_agent_async(person_name: str) -> NetworkingProfile:
         role="user"
     )
     
-    # Run the agent and collect events using run_async
-    events = []
-    final_response_text = None
+    # Run the agent and feed each event to the extractor exactly once
+    extractor = ProfileExtractor()
     
     try:
-        async for event in runner.run_async(
-            user_id=user_id,
-            session_id=session_id,
-            new_message=message
-        ):
-            events.append(event)
-            
-            # Check if this is the final response (as per ADK documentation)
-            if hasattr(event, 'is_final_response') and event.is_final_response():
-                if hasattr(event, 'content') and event.content:
-                    if hasattr(event.content, 'parts') and event.content.parts:
-                        for part in event.content.parts:
-                            if hasattr(part, 'text') and part.text:
-                                final_response_text = part.text
-                                # Try to parse as JSON (structured output)
-                                try:
-                                    data = json.loads(part.text)
-                                    if isinstance(data, dict) and 'person_name' in data:
-                                        return NetworkingProfile(**data)
-                                except (json.JSONDecodeError, TypeError, ValueError):
-                                    pass
-            
-            # Also check event.content for structured output
-            if hasattr(event, 'content') and event.content:
-                if hasattr(event.content, 'parts') and event.content.parts:
-                    for part in event.content.parts:
-                        if hasattr(part, 'text') and part.text:
-                            # Try to parse as JSON (structured output)
-                            try:
-                                data = json.loads(part.text)
-                                if isinstance(data, dict) and 'person_name' in data:
-                                    return NetworkingProfile(**data)
-                            except (json.JSONDecodeError, TypeError, ValueError):
-                                pass
-    except Exception as e:
-        print(f"Error during event processing: {e}")
-        import traceback
-        traceback.print_exc()
-    
-    # If we have a final response text but couldn't parse it, try one more time
-    if final_response_text:
         try:
-            data = json.loads(final_response_text)
-            if isinstance(data, dict) and 'person_name' in data:
-                return NetworkingProfile(**data)
-        except (json.JSONDecodeError, TypeError, ValueError):
-            pass
+            # aclosing() shuts the event stream down cleanly when we return early
+            async with aclosing(runner.run_async(
+                user_id=user_id,
+                session_id=session_id,
+                new_message=message
+            )) as events:
+                async for event in events:
+                    if on_event is not None:
+                        on_event(event)
+                    profile = extractor.feed(event)
+                    if profile is not None:
+                        return profile
+        except Exception as e:
+            print(f"Error during event processing: {e}")
+            import traceback
+            traceback.print_exc()
+    
+        # Debug: Print the most recent events to help diagnose
+        extractor.print_debug()
+    
+        raise ValueError(f"Could not parse NetworkingProfile from agent response. "
+                        f"Received {extractor.event_count} events.")
+    finally:
+        if not resume:
+            # Runners are shared by many profiles (batch runs, the profile service): drop the
+            # one-off session so its event history does not stay in memory
+            await runner.session_service.delete_session(
+                app_name=runner.app_name,
+                user_id=user_id,
+                session_id=session_id
+            )
+
+
+async def run_cached_agent_async(person_name: str, runner: Runner = None, cache: ProfileCache = None,
+                                 refresh: bool = False, resume: bool = False,
+                                 on_event: Callable = None, person_key: str = None) -> tuple:
+    """Return a cached profile if there is a fresh one, otherwise run the networking agent.
+    
+    Profiles are cached under the normalized person name, so "Jane Doe, MD" and
+    "jane doe md" share one entry.
+    
+    Args:
+        person_name: The name of the person to research
+        runner: Runner to reuse (default: a new runner with an in-memory session service)
+        cache: Profile cache to use (None disables caching)
+        refresh: Ignore any cached profile and run the agent again
+        resume: Resume from the checkpoints of a previous run for the same person
+        on_event: Optional callback called with every event of the agent run
+        person_key: Cache key and session name (default: the normalized person name);
+                    batches pass a key that is unique in the batch
+    
+    Returns:
+        Tuple of (NetworkingProfile, True if it came from the cache)
+    """
+    cache_key = person_key or normalize_person_name(person_name)
     
-    # Debug: Print event types to help diagnose
-    if events:
-        print(f"Debug: Received {len(events)} events")
-        print(f"Debug: Event types: {[type(e).__name__ for e in events[-5:]]}")
-        if final_response_text:
-            print(f"Debug: Final response text (first 500 chars): {final_response_text[:500]}")
+    if cache is not None and not refresh:
+        cached_json = cache.get(cache_key)
+        if cached_json is not None:
+            return NetworkingProfile.model_validate_json(cached_json), True
     
-    raise ValueError(f"Could not parse NetworkingProfile from agent response. "
-                    f"Received {len(events)} events.")
+    profile = await run_agent_async(person_name, runner=runner, resume=resume, on_event=on_event,
+                                    person_key=cache_key)
+    
+    if cache is not None:
+        cache.put(cache_key, person_name, profile.model_dump_json())
+    
+    return profile, False
+
+
+def create_tracer():
+    """Create a PipelineTracer (imported here so untraced runs do not load the ADK plugin API)."""
+    from scripts.pipeline_trace import PipelineTracer
+    return PipelineTracer()
 
 
-def run_agent(person_name: str) -> NetworkingProfile:
+def write_trace(run_trace, person_name: str, trace_dir: Path) -> Path:
+    """Save a run's Chrome trace as <name>_trace.json in trace_dir."""
+    return run_trace.write_chrome_trace(Path(trace_dir) / f"{normalize_person_name(person_name)}_trace.json")
+
+
+def run_agent(person_name: str, resume: bool = False, session_db: Path = None,
+              cache: ProfileCache = None, refresh: bool = False,
+              trace_dir: Path = None, speculative: bool = False, cassette=None) -> NetworkingProfile:
     """Run the networking agent (synchronous wrapper for async function).
     
     Args:
         person_name: The name of the person to research
+        resume: Resume from the checkpoints of a previous run for the same person
+        session_db: SQLite session store used when resuming (default: DEFAULT_SESSION_DB)
+        cache: Profile cache to use (None disables caching)
+        refresh: Ignore any cached profile and run the agent again
+        trace_dir: Directory for a per-agent timing trace of the run (None disables tracing)
+        speculative: Start the research while the radiologist verification is still running
+        cassette: CassettePlugin to record the run's model and tool calls to, or replay them from
     
     Returns:
         NetworkingProfile Pydantic model instance
     """
-    return asyncio.run(run_agent_async(person_name))
+    tracer = create_tracer() if trace_dir else None
+    runner = create_runner(
+        create_checkpoint_session_service(session_db) if resume else None,
+        plugins=[tracer] if tracer else None,
+        speculative=speculative,
+        cassette=cassette
+    )
+    
+    with tracer.trace(person_name) if tracer else nullcontext() as run_trace:
+        profile, cached = asyncio.run(
+            run_cached_agent_async(person_name, runner=runner, cache=cache, refresh=refresh, resume=resume)
+        )
+    
+    if run_trace is not None and not cached:
+        trace_path = write_trace(run_trace, person_name, trace_dir)
+        print(f"  Timing trace saved at: {trace_path.absolute()}")
+        print(json.dumps(run_trace.summary(), indent=2))
+    
+    return profile
 
 
 def save_markdown_file(markdown_content: str, person_name: str, output_dir: Path = None) -> Path:
@@ -221,10 +455,11 @@ def save_markdown_file(markdown_content: str, person_name: str, output_dir: Path
     if output_dir is None:
         # Save in the networking_agent directory
         output_dir = Path(__file__).parent / "agents" / "part5" / "networking_agent"
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
     
     # Sanitize person name for filename
-    safe_name = "".join(c if c.isalnum() or c in (' ', '-', '_') else '' for c in person_name)
-    safe_name = safe_name.replace(' ', '_').lower()
+    safe_name = normalize_person_name(person_name)
     filename = f"{safe_name}_networking_profile.md"
     
     file_path = output_dir / filename
@@ -236,11 +471,286 @@ def save_markdown_file(markdown_content: str, person_name: str, output_dir: Path
     return file_path
 
 
+def load_roster(roster_path: Path) -> list:
+    """Load person names from a roster file.
+    
+    Plain text rosters have one name per line (blank lines and lines starting with
+    '#' are skipped). CSV rosters use the "name" column if there is one, otherwise
+    the first column. Duplicate names are only kept once.
+    
+    Args:
+        roster_path: Path to a .txt or .csv roster file
+    
+    Returns:
+        List of person names in roster order
+    """
+    roster_path = Path(roster_path)
+    names = []
+    
+    with open(roster_path, 'r', encoding='utf-8', newline='') as f:
+        if roster_path.suffix.lower() == '.csv':
+            rows = list(csv.reader(f))
+            if rows and any(cell.strip().lower() == 'name' for cell in rows[0]):
+                header = [cell.strip().lower() for cell in rows[0]]
+                column = header.index('name')
+                rows = rows[1:]
+            else:
+                column = 0
+            names = [row[column].strip() for row in rows if len(row) > column]
+        else:
+            names = [line.strip() for line in f if not line.strip().startswith('#')]
+    
+    # Drop empty entries and duplicates while keeping roster order
+    return list(dict.fromkeys(name for name in names if name))
+
+
+async def run_batch_async(person_names: list, concurrency: int = DEFAULT_CONCURRENCY,
+                          output_dir: Path = None, resume: bool = False,
+                          session_db: Path = None, cache: ProfileCache = None,
+                          refresh: bool = False, trace_dir: Path = None,
+                          speculative: bool = False, cassette=None) -> list:
+    """Create networking profiles for many people on a single event loop.
+    
+    All pipelines share one Runner and session service. At most `concurrency`
+    pipelines run at the same time; each profile is written to a markdown file
+    as soon as it is ready. People with a fresh cached profile skip the agent.
+    
+    Args:
+        person_names: Names of the people to research
+        concurrency: Maximum number of pipelines running at once
+        output_dir: Directory for the markdown files (default: networking_agent directory)
+        resume: Resume every pipeline from its checkpoints in the SQLite session store
+        session_db: SQLite session store used when resuming (default: DEFAULT_SESSION_DB)
+        cache: Profile cache to use (None disables caching)
+        refresh: Ignore cached profiles and run the agent for everyone
+        trace_dir: Directory for per-run timing traces (None disables tracing)
+        speculative: Start the research while the radiologist verification is still running
+        cassette: CassettePlugin to record the batch's model and tool calls to, or replay them from
+    
+    Returns:
+        List of result dictionaries (one per name, in input order) with the keys
+        person_name, status ("success" or "failed"), cached, seconds, file and error,
+        plus trace_file and trace (the RunTrace summary) when tracing
+    """
+    tracer = create_tracer() if trace_dir else None
+    runner = create_runner(
+        create_checkpoint_session_service(session_db) if resume else None,
+        plugins=[tracer] if tracer else None,
+        speculative=speculative,
+        cassette=cassette
+    )
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    # Normalized names are unchanged by normalizing them again, so the keys can stand in
+    # for the person's name when naming the markdown and trace files
+    person_keys = batch_person_keys(person_names)
+    
+    async def run_one(person_name: str) -> dict:
+        async with semaphore:
+            start = time.perf_counter()
+            result = {"person_name": person_name, "status": "success", "cached": False,
+                      "file": None, "error": None}
+            try:
+                with tracer.trace(person_name) if tracer else nullcontext() as run_trace:
+                    profile, result["cached"] = await run_cached_agent_async(
+                        person_name, runner=runner, cache=cache, refresh=refresh, resume=resume,
+                        person_key=person_keys[person_name]
+                    )
+                if run_trace is not None and not result["cached"]:
+                    result["trace_file"] = str(write_trace(run_trace, person_keys[person_name], trace_dir))
+                    result["trace"] = run_trace.summary()
+                file_path = save_markdown_file(profile_to_markdown(profile), person_keys[person_name], output_dir)
+                result["file"] = str(file_path)
+            except Exception as e:
+                result["status"] = "failed"
+                result["error"] = str(e)
+            result["seconds"] = round(time.perf_counter() - start, 2)
+            
+            marker = "✓" if result["status"] == "success" else "✗"
+            source = ", cached" if result["cached"] else ""
+            print(f"{marker} {person_name} ({result['seconds']}s{source})")
+            return result
+    
+    results = await asyncio.gather(*(run_one(name) for name in person_names))
+    
+    search_memo = search_memo_metrics(runner)
+    if search_memo is not None and search_memo["grounded_calls"]:
+        print(f"  Search memo: {search_memo['response_hits']}/{search_memo['grounded_calls']} grounded calls "
+              f"answered from the memo, {search_memo['injected_reused']} earlier search results reused, "
+              f"{search_memo['searches']} new searches ({search_memo['repeated_searches']} repeated)")
+    return results
+
+
+def write_batch_summary(results: list, total_seconds: float, output_dir: Path,
+                        cache: ProfileCache = None) -> Path:
+    """Write a JSON summary of a batch run.
+    
+    Args:
+        results: Result dictionaries returned by run_batch_async
+        total_seconds: Wall-clock duration of the whole batch
+        output_dir: Directory to save the summary in
+        cache: Profile cache used by the batch (its hit/miss stats are included)
+    
+    Returns:
+        Path to the saved summary file
+    """
+    from scripts.pipeline_trace import aggregate_summaries
+    
+    durations = sorted(r["seconds"] for r in results)
+    succeeded = [r for r in results if r["status"] == "success"]
+    
+    summary = {
+        "total": len(results),
+        "succeeded": len(succeeded),
+        "failed": len(results) - len(succeeded),
+        "total_seconds": round(total_seconds, 2),
+        "mean_seconds": round(sum(durations) / len(durations), 2) if durations else None,
+        "max_seconds": durations[-1] if durations else None,
+        "cache": dict(cache.stats, hit_rate=cache.hit_rate()) if cache is not None else None,
+        "timings": aggregate_summaries([r["trace"] for r in results if "trace" in r]),
+        "results": results,
+    }
+    
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    summary_path = output_dir / "batch_summary.json"
+    with open(summary_path, 'w', encoding='utf-8') as f:
+        json.dump(summary, f, indent=2)
+    
+    return summary_path
+
+
+def run_batch(roster_path: Path, concurrency: int, output_dir: Path = None,
+              resume: bool = False, session_db: Path = None,
+              cache: ProfileCache = None, refresh: bool = False, trace_dir: Path = None,
+              speculative: bool = False, cassette=None):
+    """Run the networking agent for every name in a roster file."""
+    person_names = load_roster(roster_path)
+    if not person_names:
+        print(f"Error: No names found in {roster_path}.")
+        sys.exit(1)
+    
+    if output_dir is None:
+        output_dir = Path(__file__).parent / "agents" / "part5" / "networking_agent"
+    
+    print(f"Researching {len(person_names)} networking profiles "
+          f"(up to {concurrency} at a time)...\n")
+    
+    start = time.perf_counter()
+    results = asyncio.run(
+        run_batch_async(person_names, concurrency, output_dir, resume=resume, session_db=session_db,
+                        cache=cache, refresh=refresh, trace_dir=trace_dir, speculative=speculative,
+                        cassette=cassette)
+    )
+    summary_path = write_batch_summary(results, time.perf_counter() - start, output_dir, cache)
+    
+    failed = [r for r in results if r["status"] != "success"]
+    print(f"\n{len(results) - len(failed)}/{len(results)} profiles created.")
+    if cache is not None:
+        print(f"  Profile cache: {cache.stats['hits']} hits, {cache.stats['misses']} misses")
+    for r in failed:
+        print(f"  ✗ {r['person_name']}: {r['error']}")
+    print(f"  Summary saved at: {summary_path.absolute()}")
+    
+    if failed:
+        sys.exit(1)
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Create networking profiles for radiologists."
+    )
+    parser.add_argument("name", nargs="*",
+                        help="Name of the radiologist to research")
+    parser.add_argument("--batch", type=Path, metavar="ROSTER",
+                        help="Roster file with one name per line, or a CSV with a 'name' column")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY,
+                        help=f"Maximum number of profiles researched at once in batch mode "
+                             f"(default: {DEFAULT_CONCURRENCY})")
+    parser.add_argument("--output-dir", type=Path,
+                        help="Directory for the markdown files (default: networking_agent directory)")
+    parser.add_argument("--resume", action="store_true",
+                        help="Checkpoint every stage in a SQLite session store and skip the stages "
+                             "that already finished in a previous run for the same person")
+    parser.add_argument("--session-db", type=Path,
+                        help=f"SQLite session store used with --resume (default: {DEFAULT_SESSION_DB.name} "
+                             f"in the networking_agent directory)")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Do not read or write the profile cache")
+    parser.add_argument("--refresh", action="store_true",
+                        help="Ignore cached profiles and research everyone again (the cache is still updated)")
+    parser.add_argument("--cache-ttl", type=float, default=DEFAULT_TTL_DAYS, metavar="DAYS",
+                        help=f"How long cached profiles stay valid (default: {DEFAULT_TTL_DAYS} days)")
+    parser.add_argument("--cache-db", type=Path,
+                        help=f"Profile cache database (default: {DEFAULT_CACHE_DB.name} "
+                             f"in the networking_agent directory)")
+    parser.add_argument("--trace-dir", type=Path,
+                        help="Record per-agent timings, tool calls and token usage and save a "
+                             "Chrome trace (<name>_trace.json) per profile in this directory")
+    parser.add_argument("--speculative", action="store_true",
+                        help="Start the URL and article research while the radiologist verification is "
+                             "still running (research is discarded for non-radiologists)")
+    cassette = parser.add_mutually_exclusive_group()
+    cassette.add_argument("--record", type=Path, metavar="CASSETTE",
+                          help="Save every model and tool call of the run to a cassette "
+                               "(JSON lines, gzip-compressed if the name ends in .gz)")
+    cassette.add_argument("--replay", type=Path, metavar="CASSETTE",
+                          help="Answer the model and tool calls from a recorded cassette instead of "
+                               "the live services (bypasses the profile cache)")
+    parser.add_argument("--replay-latency", type=float, default=0.0, metavar="SCALE",
+                        help="With --replay, wait this fraction of each call's recorded latency "
+                             "(default: 0, full speed; 1 reproduces the recorded run)")
+    return parser.parse_args(argv)
+
+
+def open_cassette(args: argparse.Namespace):
+    """The CassettePlugin for --record or --replay (None when neither is given)."""
+    if not (args.record or args.replay):
+        return None
+    from scripts.cassette import CassettePlugin
+    
+    if args.record:
+        return CassettePlugin(args.record, mode="record")
+    return CassettePlugin(args.replay, mode="replay", latency_scale=args.replay_latency)
+
+
+def close_cassette(cassette):
+    """Finish the cassette file and report what was recorded or replayed."""
+    if cassette is None:
+        return
+    asyncio.run(cassette.close())
+    stats = cassette.stats
+    if cassette.mode == "record":
+        print(f"  Cassette: {stats['recorded']} calls recorded to {cassette.path.absolute()}")
+    else:
+        print(f"  Cassette: {stats['replayed']} calls replayed from {cassette.path}, "
+              f"{stats['misses']} not recorded, {stats['injected_seconds']:.1f}s of recorded latency injected")
+
+
 def main():
     """Main function to run the networking agent."""
+    args = parse_args()
+    load_environment(require_api_key=not args.replay)
+    if args.replay:
+        # Replayed runs never reach Gemini; the agent registry only checks that a key is set
+        os.environ.setdefault("GOOGLE_API_KEY", "offline-replay")
+    cassette = open_cassette(args)
+    # A cached profile would skip the calls that are to be recorded or replayed
+    cache = None if args.no_cache or cassette else ProfileCache(args.cache_db, ttl_days=args.cache_ttl)
+    
+    if args.batch:
+        try:
+            run_batch(args.batch, args.concurrency, args.output_dir,
+                      resume=args.resume, session_db=args.session_db,
+                      cache=cache, refresh=args.refresh, trace_dir=args.trace_dir,
+                      speculative=args.speculative, cassette=cassette)
+        finally:
+            close_cassette(cassette)
+        return
+    
     # Get person name from command line argument or prompt
-    if len(sys.argv) > 1:
-        person_name = " ".join(sys.argv[1:])
+    if args.name:
+        person_name = " ".join(args.name)
     else:
         person_name = input("Enter the name of the radiologist to research: ").strip()
     
@@ -253,15 +763,18 @@ def main():
     
     try:
         # Run the agent
-        profile = run_agent(person_name)
+        profile = run_agent(person_name, resume=args.resume, session_db=args.session_db,
+                            cache=cache, refresh=args.refresh, trace_dir=args.trace_dir,
+                            speculative=args.speculative, cassette=cassette)
         
         # Convert to markdown
         markdown_content = profile_to_markdown(profile)
         
         # Save to file
-        file_path = save_markdown_file(markdown_content, person_name)
-        
+        file_path = save_markdown_file(markdown_content, person_name, args.output_dir)
         print(f"\n✓ Successfully created networking profile!")
+        if cache is not None and cache.stats["hits"]:
+            print("  (Loaded from the profile cache; use --refresh to research again.)")
         print(f"  File saved at: {file_path.absolute()}")
         
     except Exception as e:
@@ -269,6 +782,8 @@ def main():
         import traceback
         traceback.print_exc()
         sys.exit(1)
+    finally:
+        close_cassette(cassette)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,378 @@
+"""Google Search memoization shared by all agents on a runner.
+
+`google_search` is a built-in Gemini tool: the model decides on its queries and runs
+them inside the model call, so ADK never sees a search call it could answer from a
+cache. `SearchMemoPlugin` works at the two points where the framework does allow it:
+
+- Grounded responses: a model call with google_search whose request (model,
+  instruction and conversation) was already answered is served from the memo,
+  grounding metadata included, without calling the model
+- Grounding results: every query the model searched is stored under its normalized
+  form (case, accents, punctuation and word order ignored) with the sources and the
+  grounded statements of that response. Before a grounded call, the results of
+  earlier queries whose words all appear in the request (e.g. "jane doe radiologist"
+  from the verification agent, for the URL finder researching Jane Doe) are added
+  to the instruction, so the model only searches for what they do not cover
+
+Both memos are shared by every agent and pipeline on the runner (all profiles of a
+batch), and optionally persisted across runs in SQLite. Entries expire after
+SEARCH_MEMO_TTL_HOURS in memory too, and the least recently used ones are evicted
+beyond MAX_MEMO_RESPONSES / MAX_MEMO_QUERIES, so a long-lived runner (the profile
+service) neither replays stale results nor grows without bound. `metrics()` reports
+hit rates: grounded calls answered from the memo, and injected results the model did
+not search again.
+
+Environment variables:
+    SEARCH_MEMO=off            disable the plugin
+    SEARCH_MEMO_DB             persist the memo in this SQLite file (default: this run only)
+    SEARCH_MEMO_TTL_HOURS      how long results stay valid (default: 24)
+
+Usage:
+    memo = open_search_memo()
+    runner = Runner(agent=root_agent, app_name="agents", session_service=..., plugins=[memo])
+    ...
+    print(memo.metrics())
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import sqlite3
+import time
+import unicodedata
+from collections import OrderedDict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Optional
+from google.adk.models import LlmResponse
+from google.adk.plugins import BasePlugin
+
+logger = logging.getLogger(__name__)
+
+PLUGIN_NAME = "search_memo"
+DEFAULT_TTL_HOURS = 24
+
+# Grounding results added to one request: the most specific (longest) queries first
+MAX_INJECTED_QUERIES = 8
+MAX_INJECTED_CHARS = 4000
+MAX_FINDINGS_CHARS = 600
+MAX_SOURCES = 5
+# Queries of one word match almost any request
+MIN_QUERY_WORDS = 2
+# Entries loaded from the database at start-up
+MAX_LOADED_QUERIES = 5000
+# Entries kept in memory (grounded responses are large: full candidates and metadata)
+MAX_MEMO_RESPONSES = 500
+MAX_MEMO_QUERIES = MAX_LOADED_QUERIES
+
+# Grounding links are redirects that expire; the URL finder must not return them
+REDIRECT_MARKERS = ("grounding-api-redirect", "vertexaisearch.cloud.google.com")
+
+_WORD = re.compile(r"\w+")
+
+
+def _words(text: str) -> list:
+    """Lower-cased words of a text, without accents."""
+    text = unicodedata.normalize("NFKD", text.casefold())
+    text = "".join(c for c in text if not unicodedata.combining(c))
+    return _WORD.findall(text)
+
+
+def normalize_query(query: str) -> str:
+    """Memo key of a search query: its distinct words, sorted.
+
+    '"Jane Doe" Radiologist' and 'radiologist jane doe' share a key.
+    """
+    return " ".join(sorted(set(_words(query))))
+
+
+def _is_grounded(llm_request) -> bool:
+    """Whether the request lets the model use Google Search."""
+    config = llm_request.config
+    return bool(config and config.tools and any(
+        getattr(tool, "google_search", None) or getattr(tool, "google_search_retrieval", None)
+        for tool in config.tools
+    ))
+
+
+def _request_text(llm_request) -> str:
+    """Instruction and conversation of a request (the text the model answers)."""
+    config = llm_request.config
+    instruction = config.system_instruction if config else None
+    if instruction is not None and not isinstance(instruction, str):
+        instruction = " ".join(part.text or "" for part in (instruction.parts or []))
+    texts = [instruction or ""]
+    for content in llm_request.contents or []:
+        texts.append(f"{content.role}: " + " ".join(part.text or "" for part in (content.parts or [])))
+    return "\n".join(" ".join(text.split()) for text in texts)
+
+
+def _grounding_record(llm_response) -> Optional[tuple]:
+    """Queries, sources and grounded statements of a response (None without a search)."""
+    grounding = llm_response.grounding_metadata
+    if grounding is None or not grounding.web_search_queries:
+        return None
+
+    sources = []
+    for chunk in grounding.grounding_chunks or []:
+        if chunk.web is None:
+            continue
+        uri = chunk.web.uri or ""
+        if any(marker in uri for marker in REDIRECT_MARKERS):
+            uri = ""
+        sources.append({"title": chunk.web.title or chunk.web.domain or "", "uri": uri})
+
+    findings, seen = [], set()
+    for support in grounding.grounding_supports or []:
+        text = " ".join((support.segment.text or "").split()) if support.segment else ""
+        if text and text not in seen:
+            seen.add(text)
+            findings.append(text)
+    findings = " ".join(findings)
+    if len(findings) > MAX_FINDINGS_CHARS:
+        findings = findings[:MAX_FINDINGS_CHARS].rsplit(" ", 1)[0] + "..."
+
+    return list(grounding.web_search_queries), {"sources": sources[:MAX_SOURCES], "findings": findings}
+
+
+class SearchMemoStore:
+    """SQLite persistence for the memo (grounded responses and search results)."""
+
+    def __init__(self, db_path: Path, ttl_hours: float = DEFAULT_TTL_HOURS):
+        """Configure the store (the database is created on first use).
+
+        Args:
+            db_path: SQLite database file
+            ttl_hours: How long stored entries stay valid, in hours
+        """
+        self.db_path = Path(db_path)
+        self.ttl_seconds = ttl_hours * 60 * 60
+        self._ready = False
+
+    @contextmanager
+    def _connect(self):
+        """Open a connection that commits on success and is always closed."""
+        if not self._ready:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            with conn:
+                if not self._ready:
+                    conn.executescript(
+                        "CREATE TABLE IF NOT EXISTS responses ("
+                        "  request_key TEXT PRIMARY KEY, response_json TEXT NOT NULL, created_at REAL NOT NULL);"
+                        "CREATE TABLE IF NOT EXISTS queries ("
+                        "  query_key TEXT PRIMARY KEY, query TEXT NOT NULL, result_json TEXT NOT NULL,"
+                        "  created_at REAL NOT NULL);"
+                    )
+                    self._ready = True
+                yield conn
+        finally:
+            conn.close()
+
+    def get_response(self, request_key: str) -> Optional[tuple]:
+        """Unexpired response as (response_json, created_at), or None."""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT response_json, created_at FROM responses WHERE request_key = ? AND created_at >= ?",
+                (request_key, time.time() - self.ttl_seconds)
+            ).fetchone()
+        return tuple(row) if row else None
+
+    def put_response(self, request_key: str, response_json: str):
+        with self._connect() as conn:
+            conn.execute("INSERT OR REPLACE INTO responses VALUES (?, ?, ?)",
+                         (request_key, response_json, time.time()))
+
+    def load_queries(self, limit: int = MAX_LOADED_QUERIES) -> list:
+        """Unexpired search results, newest first: (query_key, query, result, created_at) tuples."""
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT query_key, query, result_json, created_at FROM queries WHERE created_at >= ? "
+                "ORDER BY created_at DESC LIMIT ?",
+                (time.time() - self.ttl_seconds, limit)
+            ).fetchall()
+        return [(key, query, json.loads(result), created_at) for key, query, result, created_at in rows]
+
+    def put_queries(self, entries: list):
+        """Store (query_key, query, result) tuples."""
+        now = time.time()
+        with self._connect() as conn:
+            conn.executemany("INSERT OR REPLACE INTO queries VALUES (?, ?, ?, ?)",
+                             [(key, query, json.dumps(result), now) for key, query, result in entries])
+
+    def purge_expired(self) -> int:
+        """Delete expired entries and return how many were deleted."""
+        cutoff = time.time() - self.ttl_seconds
+        with self._connect() as conn:
+            deleted = conn.execute("DELETE FROM responses WHERE created_at < ?", (cutoff,)).rowcount
+            deleted += conn.execute("DELETE FROM queries WHERE created_at < ?", (cutoff,)).rowcount
+        return deleted
+
+
+class SearchMemoPlugin(BasePlugin):
+    """ADK plugin that memoizes Google Search grounding across agents and runs.
+
+    Install it first in the runner's plugin list: a memo hit ends the model call, so
+    plugins after it do not see that call.
+    """
+
+    def __init__(self, store: SearchMemoStore = None, name: str = PLUGIN_NAME,
+                 ttl_hours: float = DEFAULT_TTL_HOURS, max_responses: int = MAX_MEMO_RESPONSES,
+                 max_queries: int = MAX_MEMO_QUERIES):
+        """Create the memo.
+
+        Args:
+            store: Optional persistence across runs (default: memoize for this process only)
+            name: Plugin name
+            ttl_hours: How long memoized entries stay valid, in hours (the store's TTL
+                       is used when a store is given)
+            max_responses: Grounded responses kept in memory
+            max_queries: Search results kept in memory
+        """
+        super().__init__(name=name)
+        self.store = store
+        self.ttl_seconds = store.ttl_seconds if store is not None else ttl_hours * 60 * 60
+        self.max_responses = max_responses
+        self.max_queries = max_queries
+        self.stats = {"grounded_calls": 0, "response_hits": 0, "searches": 0, "repeated_searches": 0,
+                      "injected_results": 0, "injected_reused": 0}
+        # key -> (created_at, value), least recently used first
+        self._responses = OrderedDict()
+        self._queries = OrderedDict()
+        self._pending = {}
+        if store is not None:
+            try:
+                for key, query, result, created_at in reversed(store.load_queries(max_queries)):
+                    self._queries[key] = (created_at, dict(result, query=query))
+            except sqlite3.Error as e:
+                logger.warning("Search memo database unavailable (%s); memoizing this run only", e)
+                self.store = None
+
+    @staticmethod
+    def _remember(memo: OrderedDict, key: str, created_at: float, value, limit: int):
+        """Add an entry as the most recently used one and evict the least recently used."""
+        memo[key] = (created_at, value)
+        memo.move_to_end(key)
+        while len(memo) > limit:
+            memo.popitem(last=False)
+
+    def _cached_response(self, request_key: str) -> Optional[str]:
+        entry = self._responses.get(request_key)
+        if entry is not None:
+            if entry[0] >= time.time() - self.ttl_seconds:
+                self._responses.move_to_end(request_key)
+                return entry[1]
+            del self._responses[request_key]
+        if self.store is not None:
+            row = self.store.get_response(request_key)
+            if row is not None:
+                response_json, created_at = row
+                self._remember(self._responses, request_key, created_at, response_json, self.max_responses)
+                return response_json
+        return None
+
+    def _matching_queries(self, request_words: set) -> list:
+        """Unexpired memoized queries whose words all appear in the request, most specific first."""
+        cutoff = time.time() - self.ttl_seconds
+        for key in [key for key, (created_at, _) in self._queries.items() if created_at < cutoff]:
+            del self._queries[key]
+        matches = [key for key in self._queries
+                   if len(key.split()) >= MIN_QUERY_WORDS and request_words.issuperset(key.split())]
+        matches = sorted(matches, key=lambda key: len(key.split()), reverse=True)[:MAX_INJECTED_QUERIES]
+        for key in matches:
+            self._queries.move_to_end(key)
+        return matches
+
+    def _injection(self, keys: list) -> tuple:
+        """Instruction text with the results of the given queries (and the keys that fit)."""
+        lines, used, size = [], [], 0
+        for key in keys:
+            entry = self._queries[key][1]
+            sources = "; ".join(f"{s['title']} ({s['uri']})" if s["uri"] else s["title"]
+                                for s in entry["sources"] if s["title"] or s["uri"])
+            block = f"- Query: {entry['query']}\n  Sources: {sources or 'none'}\n  Findings: {entry['findings'] or 'none'}"
+            if size + len(block) > MAX_INJECTED_CHARS:
+                break
+            lines.append(block)
+            used.append(key)
+            size += len(block)
+        if not lines:
+            return "", []
+        return ("Google Search results already retrieved for this research (reuse them and search only "
+                "for what they do not cover; do not repeat these queries):\n" + "\n".join(lines)), used
+
+    async def before_model_callback(self, *, callback_context, llm_request):
+        if not _is_grounded(llm_request):
+            return None
+        self.stats["grounded_calls"] += 1
+        text = _request_text(llm_request)
+        request_key = hashlib.sha256(f"{llm_request.model}\n{text}".encode("utf-8")).hexdigest()
+
+        response_json = self._cached_response(request_key)
+        if response_json is not None:
+            self.stats["response_hits"] += 1
+            response = LlmResponse.model_validate_json(response_json)
+            response.custom_metadata = dict(response.custom_metadata or {}, search_memo="hit")
+            return response
+
+        instruction, injected = self._injection(self._matching_queries(set(_words(text))))
+        if injected:
+            llm_request.append_instructions([instruction])
+            self.stats["injected_results"] += len(injected)
+        self._pending[(callback_context.invocation_id, callback_context.agent_name)] = (request_key, injected)
+        return None
+
+    async def after_model_callback(self, *, callback_context, llm_response):
+        if llm_response.partial:
+            return None
+        pending = self._pending.pop((callback_context.invocation_id, callback_context.agent_name), None)
+        if pending is None:
+            return None
+        request_key, injected = pending
+
+        record = _grounding_record(llm_response)
+        queries = record[0] if record else []
+        keys = {normalize_query(query): query for query in queries}
+        self.stats["searches"] += len(keys)
+        self.stats["repeated_searches"] += sum(key in self._queries for key in keys)
+        self.stats["injected_reused"] += sum(key not in keys for key in injected)
+        if record is None or llm_response.error_code or not llm_response.content:
+            return None
+
+        now = time.time()
+        entries = [(key, query, record[1]) for key, query in keys.items() if key]
+        for key, query, result in entries:
+            self._remember(self._queries, key, now, dict(result, query=query), self.max_queries)
+        response_json = llm_response.model_dump_json(exclude_none=True)
+        self._remember(self._responses, request_key, now, response_json, self.max_responses)
+        if self.store is not None:
+            try:
+                self.store.put_queries(entries)
+                self.store.put_response(request_key, response_json)
+            except sqlite3.Error as e:
+                logger.warning("Could not persist search results: %s", e)
+        return None
+
+    def metrics(self) -> dict:
+        """Counters plus the response hit rate and the search result reuse rate."""
+        calls = self.stats["grounded_calls"]
+        reused = self.stats["injected_reused"]
+        return dict(
+            self.stats,
+            memoized_queries=len(self._queries),
+            response_hit_rate=round(self.stats["response_hits"] / calls, 3) if calls else None,
+            query_hit_rate=(round(reused / (reused + self.stats["searches"]), 3)
+                            if reused + self.stats["searches"] else None),
+        )
+
+
+def open_search_memo() -> Optional[SearchMemoPlugin]:
+    """The memo configured by the environment, or None if SEARCH_MEMO is "off"."""
+    if os.getenv("SEARCH_MEMO", "").lower() in ("off", "0", "false", "no"):
+        return None
+    db_path = os.getenv("SEARCH_MEMO_DB")
+    ttl_hours = float(os.getenv("SEARCH_MEMO_TTL_HOURS", DEFAULT_TTL_HOURS))
+    return SearchMemoPlugin(SearchMemoStore(db_path, ttl_hours) if db_path else None, ttl_hours=ttl_hours)